@@ -10,10 +10,11 @@ from pathlib import Path
 from typing import List, Optional
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Query, Request, Security
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Security, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.security import APIKeyHeader
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 
 import sys
@@ -22,10 +23,15 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from automation.scheduler import SmartScheduler
 
 from core.app_context import get_app_context
-from core.database import ScanStatus, FindingStatus, Severity, Scan
+from core.async_project import AsyncProjectManager
+from core.database import ScanStatus, FindingStatus, Severity, session_scope
 from core.enterprise import AuditAction
+from core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from core.integrations import IntegrationManager
+from core.project import ProjectManager
+from core.scan_runner import ScanRunner
 from core.version import __version__
+from api.websocket import emit_scan_update, emit_workflow_output, websocket_endpoint
 
 
 # ==================== Pydantic Models ====================
@@ -109,7 +115,22 @@ async def lifespan(app: FastAPI):
     app.state.scheduler = ctx.scheduler
     app.state.workflow = ctx.workflow
     app.state.audit = ctx.audit
+    app.state.scan_runner = ctx.scan_runner
+
+    # Scan progress and workflow output come from other threads; hop onto the loop to broadcast
+    loop = asyncio.get_running_loop()
+    ctx.scan_runner.on_update = lambda scan_id, status, progress: asyncio.run_coroutine_threadsafe(
+        emit_scan_update(scan_id, status, progress), loop
+    )
+    ctx.workflow.register_callback('step_output', lambda data: asyncio.run_coroutine_threadsafe(
+        emit_workflow_output(data['step'], data['line']), loop
+    ))
+    if _load_api_key():
+        # Without a key the API is open, so nothing it queued may be executed
+        ctx.scan_runner.start()
     yield
+    # Shutdown
+    ctx.scan_runner.stop(wait=False)
 
 
 app = FastAPI(
@@ -150,11 +171,23 @@ async def api_key_middleware(request: Request, call_next):
     return await call_next(request)
 
 
+@app.middleware("http")
+async def db_session_middleware(request: Request, call_next):
+    """Give each request its own database session, closed when it finishes."""
+    with session_scope():
+        return await call_next(request)
+
+
 def get_pm() -> ProjectManager:
     """Dependency to get ProjectManager."""
     return app.state.pm
 
 
+def get_apm(pm: ProjectManager = Depends(get_pm)) -> AsyncProjectManager:
+    """Dependency to get the async ProjectManager facade."""
+    return AsyncProjectManager(pm)
+
+
 def get_integrations() -> IntegrationManager:
     """Dependency to get IntegrationManager."""
     return app.state.integrations
@@ -165,6 +198,33 @@ def get_scheduler() -> SmartScheduler:
     return app.state.scheduler
 
 
+def get_scan_runner() -> ScanRunner:
+    """Dependency to get the scan runner."""
+    return app.state.scan_runner
+
+
+class PageParams:
+    """Common keyset pagination query parameters."""
+
+    def __init__(
+        self,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        cursor: Optional[str] = None,
+        order: str = Query("desc", pattern="^(asc|desc)$")
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.descending = order == "desc"
+
+
+async def _page(fetch, **kwargs) -> dict:
+    """Run a paginated query, mapping bad input to 400."""
+    try:
+        return await fetch(**kwargs)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 # ==================== Health & Info ====================
 
 @app.get("/")
@@ -184,28 +244,22 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.websocket("/ws/{channel}")
+async def ws_updates(websocket: WebSocket, channel: str = "global"):
+    """Real-time scan and project updates."""
+    expected = _load_api_key()
+    if expected:
+        provided = websocket.headers.get("X-API-Key") or websocket.query_params.get("api_key", "")
+        if provided != expected:
+            await websocket.close(code=1008)
+            return
+    await websocket_endpoint(websocket, channel)
+
+
 @app.get("/api/stats")
-async def get_stats(pm: ProjectManager = Depends(get_pm)):
+async def get_stats(apm: AsyncProjectManager = Depends(get_apm)):
     """Get overall statistics."""
-    projects = pm.list_projects()
-    
-    total_targets = 0
-    total_scans = 0
-    total_findings = 0
-    
-    for project in projects:
-        total_targets += len(pm.get_targets(project.id))
-        scans = pm.get_scans(project.id)
-        total_scans += len(scans)
-        for scan in scans:
-            total_findings += len(pm.get_findings(scan_id=scan.id))
-    
-    return {
-        "total_projects": len(projects),
-        "total_targets": total_targets,
-        "total_scans": total_scans,
-        "total_findings": total_findings
-    }
+    return await apm.get_workspace_stats()
 
 
 # ==================== Projects ====================
@@ -213,51 +267,49 @@ async def get_stats(pm: ProjectManager = Depends(get_pm)):
 @app.get("/api/projects")
 async def list_projects(
     status: Optional[str] = None,
-    pm: ProjectManager = Depends(get_pm)
+    apm: AsyncProjectManager = Depends(get_apm)
 ):
     """List all projects."""
-    projects = pm.list_projects(status=status)
-    return [p.to_dict() for p in projects]
+    return await apm.list_projects(status=status)
 
 
 @app.post("/api/projects", status_code=201)
 async def create_project(
     project: ProjectCreate,
-    pm: ProjectManager = Depends(get_pm)
+    apm: AsyncProjectManager = Depends(get_apm)
 ):
     """Create a new project."""
-    existing = pm.get_project_by_name(project.name)
+    existing = await apm.get_project_by_name(project.name)
     if existing:
         raise HTTPException(status_code=409, detail="Project already exists")
     
-    new_project = pm.create_project(
+    return await apm.create_project(
         name=project.name,
         description=project.description,
         scope_type=project.scope_type
     )
-    return new_project.to_dict()
 
 
 @app.get("/api/projects/{project_id}")
 async def get_project(
     project_id: int,
-    pm: ProjectManager = Depends(get_pm)
+    apm: AsyncProjectManager = Depends(get_apm)
 ):
     """Get project by ID."""
-    project = pm.get_project(project_id)
+    project = await apm.get_project(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    return project.to_dict()
+    return project
 
 
 @app.put("/api/projects/{project_id}")
 async def update_project(
     project_id: int,
     update: ProjectUpdate,
-    pm: ProjectManager = Depends(get_pm)
+    apm: AsyncProjectManager = Depends(get_apm)
 ):
     """Update a project."""
-    project = pm.update_project(
+    project = await apm.update_project(
         project_id,
         name=update.name,
         description=update.description,
@@ -265,16 +317,16 @@ async def update_project(
     )
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    return project.to_dict()
+    return project
 
 
 @app.delete("/api/projects/{project_id}")
 async def delete_project(
     project_id: int,
-    pm: ProjectManager = Depends(get_pm)
+    apm: AsyncProjectManager = Depends(get_apm)
 ):
     """Delete a project."""
-    success = pm.delete_project(project_id)
+    success = await apm.delete_project(project_id)
     if not success:
         raise HTTPException(status_code=404, detail="Project not found")
     return {"deleted": True}
@@ -283,13 +335,13 @@ async def delete_project(
 @app.post("/api/projects/{project_id}/archive")
 async def archive_project(
     project_id: int,
-    pm: ProjectManager = Depends(get_pm)
+    apm: AsyncProjectManager = Depends(get_apm)
 ):
     """Archive a project."""
-    project = pm.archive_project(project_id)
+    project = await apm.archive_project(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    return project.to_dict()
+    return project
 
 
 # ==================== Targets ====================
@@ -298,28 +350,34 @@ async def archive_project(
 async def list_targets(
     project_id: int,
     in_scope: Optional[bool] = None,
-    pm: ProjectManager = Depends(get_pm)
+    status: Optional[str] = None,
+    type: Optional[str] = None,
+    sort: str = "id",
+    page: PageParams = Depends(),
+    apm: AsyncProjectManager = Depends(get_apm)
 ):
-    """List targets for a project."""
-    targets = pm.get_targets(project_id, in_scope=in_scope)
-    return [t.to_dict() for t in targets]
+    """List targets for a project, one page at a time."""
+    return await _page(
+        apm.page_targets, project_id=project_id, in_scope=in_scope, status=status,
+        target_type=type, sort=sort, descending=page.descending,
+        limit=page.limit, cursor=page.cursor
+    )
 
 
 @app.post("/api/projects/{project_id}/targets", status_code=201)
 async def add_target(
     project_id: int,
     target: TargetCreate,
-    pm: ProjectManager = Depends(get_pm)
+    apm: AsyncProjectManager = Depends(get_apm)
 ):
     """Add a target to a project."""
     try:
-        new_target = pm.add_target(
+        return await apm.add_target(
             project_id=project_id,
             value=target.value,
             tags=target.tags,
             notes=target.notes
         )
-        return new_target.to_dict()
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -327,10 +385,10 @@ async def add_target(
 @app.delete("/api/targets/{target_id}")
 async def delete_target(
     target_id: int,
-    pm: ProjectManager = Depends(get_pm)
+    apm: AsyncProjectManager = Depends(get_apm)
 ):
     """Delete a target."""
-    success = pm.delete_target(target_id)
+    success = await apm.delete_target(target_id)
     if not success:
         raise HTTPException(status_code=404, detail="Target not found")
     return {"deleted": True}
@@ -342,54 +400,68 @@ async def delete_target(
 async def list_scans(
     project_id: int,
     tool: Optional[str] = None,
-    pm: ProjectManager = Depends(get_pm)
+    status: Optional[ScanStatus] = None,
+    page: PageParams = Depends(),
+    apm: AsyncProjectManager = Depends(get_apm)
 ):
-    """List scans for a project."""
-    scans = pm.get_scans(project_id, tool=tool)
-    return [s.to_dict() for s in scans]
+    """List scans for a project, newest first, one page at a time."""
+    return await _page(
+        apm.page_scans, project_id=project_id, tool=tool, status=status,
+        descending=page.descending, limit=page.limit, cursor=page.cursor
+    )
 
 
 @app.post("/api/projects/{project_id}/scans", status_code=201)
 async def create_scan(
     project_id: int,
     scan: ScanCreate,
-    background_tasks: BackgroundTasks,
-    pm: ProjectManager = Depends(get_pm)
+    apm: AsyncProjectManager = Depends(get_apm),
+    runner: ScanRunner = Depends(get_scan_runner)
 ):
-    """Create a new scan."""
-    new_scan = pm.create_scan(
+    """Queue a new scan; the scan runner executes it in the background."""
+    if not _load_api_key():
+        raise HTTPException(status_code=403, detail="Scan execution requires a configured API key")
+    try:
+        runner.build_command(scan.tool, scan.command)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    new_scan = await apm.create_scan(
         project_id=project_id,
         tool=scan.tool,
         command=scan.command,
-        target_id=scan.target_id
+        target_id=scan.target_id,
+        queue=True
     )
+    runner.notify()
+    await emit_scan_update(new_scan["id"], new_scan["status"])
     
-    # TODO: Start scan in background
-    # background_tasks.add_task(run_scan, new_scan.id)
     ctx.audit.log(
         AuditAction.SCAN_START,
+        user_id="api",
+        username="api",
         resource_type="scan",
-        resource_id=str(new_scan.id),
+        resource_id=str(new_scan["id"]),
         details={
             "project": project_id,
-            "tool": new_scan.tool,
-            "target_id": new_scan.target_id
+            "tool": new_scan["tool"],
+            "target_id": new_scan["target_id"]
         }
     )
     
-    return new_scan.to_dict()
+    return new_scan
 
 
 @app.get("/api/scans/{scan_id}")
 async def get_scan(
     scan_id: int,
-    pm: ProjectManager = Depends(get_pm)
+    apm: AsyncProjectManager = Depends(get_apm)
 ):
     """Get scan details."""
-    scan = pm.db.session.query(Scan).filter(Scan.id == scan_id).first()
+    scan = await apm.get_scan(scan_id)
     if not scan:
         raise HTTPException(status_code=404, detail="Scan not found")
-    return scan.to_dict()
+    return scan
 
 
 # ==================== Findings ====================
@@ -397,39 +469,71 @@ async def get_scan(
 @app.get("/api/projects/{project_id}/findings")
 async def list_findings(
     project_id: int,
-    severity: Optional[str] = None,
-    status: Optional[str] = None,
-    pm: ProjectManager = Depends(get_pm)
+    severity: Optional[Severity] = None,
+    status: Optional[FindingStatus] = None,
+    scan_id: Optional[int] = None,
+    type: Optional[str] = None,
+    q: Optional[str] = None,
+    sort: str = "id",
+    page: PageParams = Depends(),
+    apm: AsyncProjectManager = Depends(get_apm)
 ):
-    """List findings for a project."""
-    sev = Severity(severity) if severity else None
-    stat = FindingStatus(status) if status else None
-    
-    findings = pm.get_findings(project_id=project_id, severity=sev, status=stat)
-    return [f.to_dict() for f in findings]
+    """List findings for a project, one page at a time."""
+    return await _page(
+        apm.page_findings, project_id=project_id, scan_id=scan_id,
+        severity=severity, status=status, finding_type=type, search=q,
+        sort=sort, descending=page.descending, limit=page.limit, cursor=page.cursor
+    )
 
 
 @app.get("/api/projects/{project_id}/findings/stats")
 async def get_finding_stats(
     project_id: int,
-    pm: ProjectManager = Depends(get_pm)
+    apm: AsyncProjectManager = Depends(get_apm)
 ):
     """Get finding statistics for a project."""
-    return pm.get_finding_stats(project_id)
+    return await apm.get_finding_stats(project_id)
+
+
+@app.get("/api/projects/{project_id}/findings/export")
+async def export_findings(
+    project_id: int,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    severity: Optional[Severity] = None,
+    status: Optional[FindingStatus] = None,
+    apm: AsyncProjectManager = Depends(get_apm)
+):
+    """Stream every finding of a project as NDJSON or CSV."""
+    from core.reports import EXPORT_FORMATS, ReportGenerator
+    
+    try:
+        chunks = await apm.run(
+            ReportGenerator(apm.pm).stream_findings,
+            project_id, format=format, severity=severity, status=status
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    # Starlette iterates synchronous iterators in its threadpool
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="project_{project_id}_findings.{format}"'}
+    )
 
 
 @app.put("/api/findings/{finding_id}/status")
 async def update_finding_status(
     finding_id: int,
     update: FindingUpdate,
-    pm: ProjectManager = Depends(get_pm)
+    apm: AsyncProjectManager = Depends(get_apm)
 ):
     """Update finding status."""
     status = FindingStatus(update.status)
-    finding = pm.update_finding_status(finding_id, status)
+    finding = await apm.update_finding_status(finding_id, status)
     if not finding:
         raise HTTPException(status_code=404, detail="Finding not found")
-    return finding.to_dict()
+    return finding
 
 
 # ==================== Notes ====================
@@ -438,27 +542,30 @@ async def update_finding_status(
 async def list_notes(
     project_id: int,
     category: Optional[str] = None,
-    pm: ProjectManager = Depends(get_pm)
+    sort: str = "updated_at",
+    page: PageParams = Depends(),
+    apm: AsyncProjectManager = Depends(get_apm)
 ):
-    """List notes for a project."""
-    notes = pm.get_notes(project_id, category=category)
-    return [n.to_dict() for n in notes]
+    """List notes for a project, one page at a time."""
+    return await _page(
+        apm.page_notes, project_id=project_id, category=category, sort=sort,
+        descending=page.descending, limit=page.limit, cursor=page.cursor
+    )
 
 
 @app.post("/api/projects/{project_id}/notes", status_code=201)
 async def add_note(
     project_id: int,
     note: NoteCreate,
-    pm: ProjectManager = Depends(get_pm)
+    apm: AsyncProjectManager = Depends(get_apm)
 ):
     """Add a note to a project."""
-    new_note = pm.add_note(
+    return await apm.add_note(
         project_id=project_id,
         title=note.title,
         content=note.content,
         category=note.category
     )
-    return new_note.to_dict()
 
 
 # ==================== Integrations ====================
@@ -469,8 +576,7 @@ async def enrich_ip(
     integrations: IntegrationManager = Depends(get_integrations)
 ):
     """Enrich IP with external intelligence."""
-    result = integrations.enrich_ip(request.ip)
-    return result
+    return await run_in_threadpool(integrations.enrich_ip, request.ip)
 
 
 @app.post("/api/lookup/cve")
@@ -479,8 +585,7 @@ async def lookup_cve(
     integrations: IntegrationManager = Depends(get_integrations)
 ):
     """Lookup CVE details."""
-    result = integrations.lookup_cve(request.cve_id)
-    return result
+    return await run_in_threadpool(integrations.lookup_cve, request.cve_id)
 
 
 # ==================== Reports ====================
@@ -489,21 +594,21 @@ async def lookup_cve(
 async def generate_report(
     project_id: int,
     format: str = Query("json", pattern="^(json|html|markdown)$"),
-    pm: ProjectManager = Depends(get_pm)
+    apm: AsyncProjectManager = Depends(get_apm)
 ):
     """Generate project report."""
     from core.reports import ReportGenerator
     
-    rg = ReportGenerator(pm)
+    def build() -> str:
+        rg = ReportGenerator(apm.pm)
+        if format == "html":
+            return rg.generate_html_report(project_id)
+        if format == "markdown":
+            return rg.generate_markdown_report(project_id)
+        return rg.generate_json_report(project_id)
     
     try:
-        if format == "html":
-            path = rg.generate_html_report(project_id)
-        elif format == "markdown":
-            path = rg.generate_markdown_report(project_id)
-        else:
-            path = rg.generate_json_report(project_id)
-        
+        path = await apm.run(build)
         return {"path": path, "format": format}
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -512,27 +617,26 @@ async def generate_report(
 # ==================== Session ====================
 
 @app.get("/api/session")
-async def get_session(pm: ProjectManager = Depends(get_pm)):
+async def get_session(apm: AsyncProjectManager = Depends(get_apm)):
     """Get current session state."""
-    session = pm.load_session()
+    session = await apm.load_session()
     if session:
-        return session.to_dict()
+        return session
     return {"name": "default", "state": {}}
 
 
 @app.post("/api/session")
 async def save_session(
     data: dict,
-    pm: ProjectManager = Depends(get_pm)
+    apm: AsyncProjectManager = Depends(get_apm)
 ):
     """Save session state."""
-    session = pm.save_session(
+    return await apm.save_session(
         name=data.get("name", "default"),
         project_id=data.get("project_id"),
         target=data.get("target", ""),
         state=data.get("state", {})
     )
-    return session.to_dict()
 
 
 @app.get("/api/scheduler/jobs")
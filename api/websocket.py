@@ -303,6 +303,18 @@ async def emit_project_update(project_id: int, action: str = "updated"):
     })
 
 
+async def emit_workflow_output(step: str, line: str):
+    """Emit one line of live output from a running workflow step."""
+    await manager.broadcast({
+        "type": "workflow_output",
+        "data": {
+            "step": step,
+            "line": line
+        },
+        "timestamp": datetime.now().isoformat()
+    }, channel="workflows")
+
+
 # ==================== WebSocket Routes (to add to main.py) ====================
 
 async def websocket_endpoint(websocket: WebSocket, channel: str = "global"):
@@ -0,0 +1,202 @@
+"""
+Admission control for scheduled scans.
+Caps how many jobs run at once overall, per tool, per target network and
+per project, and holds back new starts while the host is overloaded.
+"""
+
+import ipaddress
+import os
+import random
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# Seconds between the start slots handed to deferred jobs
+DEFAULT_SPACING = 15.0
+
+# Prefix lengths that group addresses into one target network
+IPV4_GROUP_PREFIX = 24
+IPV6_GROUP_PREFIX = 64
+
+
+def target_key(target: str) -> str:
+    """
+    Group a target by the network it hits.
+
+    Addresses and small ranges map to their enclosing /24 (/64 for IPv6),
+    so jobs against 10.0.0.5 and 10.0.0.0/28 share a limit; hostnames map
+    to themselves.
+    """
+    target = target.strip().lower()
+    try:
+        network = ipaddress.ip_network(target, strict=False)
+    except ValueError:
+        return target
+    group = IPV4_GROUP_PREFIX if network.version == 4 else IPV6_GROUP_PREFIX
+    if network.prefixlen > group:
+        network = network.supernet(new_prefix=group)
+    return str(network)
+
+
+def memory_used_percent() -> Optional[float]:
+    """Share of host memory in use, from /proc/meminfo (Linux only)."""
+    try:
+        fields = {}
+        for line in Path("/proc/meminfo").read_text().splitlines():
+            name, value = line.split(":", 1)
+            fields[name] = int(value.split()[0])
+        return 100.0 * (1 - fields["MemAvailable"] / fields["MemTotal"])
+    except (OSError, KeyError, ValueError, ZeroDivisionError):
+        return None
+
+
+def load_per_cpu() -> Optional[float]:
+    """One-minute load average divided by the CPU count."""
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (OSError, AttributeError):
+        return None
+
+
+class AdmissionController:
+    """
+    Counting semaphores over global, per-tool, per-target and per-project slots.
+
+    A job is admitted only if every slot it needs is free, and then takes
+    all of them at once, so a job never holds one limit while waiting on
+    another. Jobs that are turned away get evenly spaced, jittered start
+    slots instead of all retrying on the same tick.
+
+    Example:
+        admission = AdmissionController(max_global=4, per_tool={"nuclei": 2}, per_target=1)
+        if admission.try_acquire(job.id, ["nuclei"], job.target, job.project_id):
+            try:
+                ...  # run the job
+            finally:
+                admission.release(job.id)
+        else:
+            job.next_run = admission.defer()
+    """
+
+    def __init__(
+        self,
+        max_global: int = 4,
+        per_tool: Optional[Dict[str, int]] = None,
+        per_target: int = 1,
+        per_project: int = 0,
+        max_load: float = 0.0,
+        max_memory_percent: float = 0.0,
+        spacing: float = DEFAULT_SPACING,
+        load_probe: Callable[[], Optional[float]] = load_per_cpu,
+        memory_probe: Callable[[], Optional[float]] = memory_used_percent
+    ):
+        """
+        Initialize AdmissionController.
+
+        Args:
+            max_global: Jobs running at once; 0 for no limit
+            per_tool: Per-tool caps, e.g. {"nuclei": 2}
+            per_target: Jobs at once against one target network; 0 for no limit
+            per_project: Jobs at once per project; 0 for no limit
+            max_load: Load average per CPU above which starts are held; 0 disables
+            max_memory_percent: Host memory use above which starts are held; 0 disables
+            spacing: Seconds between deferred start slots
+            load_probe: Returns the current load per CPU
+            memory_probe: Returns the current memory use in percent
+        """
+        self.max_global = max_global
+        self.per_tool = dict(per_tool or {})
+        self.per_target = per_target
+        self.per_project = per_project
+        self.max_load = max_load
+        self.max_memory_percent = max_memory_percent
+        self.spacing = spacing
+        self.load_probe = load_probe
+        self.memory_probe = memory_probe
+
+        self._lock = threading.Lock()
+        self._counts: Dict[Tuple[str, str], int] = {}
+        self._leases: Dict[str, List[Tuple[str, str]]] = {}  # job id -> slots held
+        self._next_slot: Optional[datetime] = None
+        self._random = random.Random()
+
+    def _limit(self, slot: Tuple[str, str]) -> int:
+        kind, name = slot
+        if kind == 'global':
+            return self.max_global
+        if kind == 'tool':
+            return self.per_tool.get(name, 0)
+        if kind == 'target':
+            return self.per_target
+        return self.per_project
+
+    def host_overloaded(self) -> bool:
+        """Whether load or memory use is above its threshold."""
+        if self.max_load:
+            load = self.load_probe()
+            if load is not None and load > self.max_load:
+                return True
+        if self.max_memory_percent:
+            used = self.memory_probe()
+            if used is not None and used > self.max_memory_percent:
+                return True
+        return False
+
+    def try_acquire(self, job_id: str, tools: List[str], target: str, project_id: Optional[int]) -> bool:
+        """
+        Take every slot a job needs, or none of them.
+
+        Returns:
+            True if the job may start now
+        """
+        slots = [('global', '')]
+        slots += [('tool', tool) for tool in dict.fromkeys(tools)]
+        slots.append(('target', target_key(target)))
+        if project_id is not None:
+            slots.append(('project', str(project_id)))
+
+        if self.host_overloaded():
+            return False
+        with self._lock:
+            if job_id in self._leases:
+                return False
+            for slot in slots:
+                limit = self._limit(slot)
+                if limit and self._counts.get(slot, 0) >= limit:
+                    return False
+            for slot in slots:
+                self._counts[slot] = self._counts.get(slot, 0) + 1
+            self._leases[job_id] = slots
+        return True
+
+    def release(self, job_id: str):
+        """Give back the slots held by a job."""
+        with self._lock:
+            for slot in self._leases.pop(job_id, []):
+                self._counts[slot] -= 1
+                if not self._counts[slot]:
+                    del self._counts[slot]
+
+    def defer(self, now: Optional[datetime] = None) -> datetime:
+        """
+        Start slot for a job that was turned away.
+
+        Slots are handed out `spacing` seconds apart, each with up to one
+        spacing of jitter, so deferred jobs trickle back in rather than
+        retrying together.
+        """
+        now = now or datetime.now()
+        with self._lock:
+            slot = now + timedelta(seconds=self.spacing)
+            if self._next_slot and self._next_slot > slot:
+                slot = self._next_slot
+            self._next_slot = slot + timedelta(seconds=self.spacing)
+            return slot + timedelta(seconds=self._random.uniform(0, self.spacing))
+
+    @property
+    def running(self) -> int:
+        """Jobs currently holding slots."""
+        with self._lock:
+            return len(self._leases)
@@ -0,0 +1,316 @@
+"""
+Cron expressions for scheduled jobs.
+Each field is parsed once into a bitset, and the next fire time is found
+by jumping between set bits field by field instead of stepping through
+every minute.
+"""
+
+import calendar
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+
+# Years searched for a match before an expression is treated as never firing
+# (e.g. "0 0 30 2 *"); covers the 29 February of a leap year
+MAX_YEARS_AHEAD = 8
+
+MACROS = {
+    '@yearly': '0 0 1 1 *',
+    '@annually': '0 0 1 1 *',
+    '@monthly': '0 0 1 * *',
+    '@weekly': '0 0 * * 0',
+    '@daily': '0 0 * * *',
+    '@midnight': '0 0 * * *',
+    '@hourly': '0 * * * *',
+}
+
+_MONTH_NAMES = {name.lower(): i for i, name in enumerate(calendar.month_abbr) if name}
+# One bit per week; multiplying a 7-bit pattern by it repeats the pattern
+_WEEKS = sum(1 << (7 * week) for week in range(5))
+
+_DAY_NAMES = {'sun': 0, 'mon': 1, 'tue': 2, 'wed': 3, 'thu': 4, 'fri': 5, 'sat': 6}
+
+
+@lru_cache(maxsize=None)
+def _bits(lo: int, hi: int, step: int = 1) -> int:
+    mask = 0
+    for value in range(lo, hi + 1, step):
+        mask |= 1 << value
+    return mask
+
+
+def _rotate(weekdays: int, offset: int) -> int:
+    """Rotate a 7-bit weekday set so that bit 0 is weekday `offset`."""
+    return ((weekdays >> offset) | (weekdays << (7 - offset))) & 0x7F
+
+
+def _next_bit(mask: int, start: int) -> Optional[int]:
+    """Lowest set bit at or above start, or None."""
+    rest = mask >> start
+    if not rest:
+        return None
+    return start + (rest & -rest).bit_length() - 1
+
+
+def _parse_value(text: str, names: Dict[str, int]) -> int:
+    value = names.get(text.lower())
+    if value is not None:
+        return value
+    if not text.isdigit():
+        raise ValueError(f"Invalid value '{text}'")
+    return int(text)
+
+
+def _parse_field(
+    text: str,
+    lo: int,
+    hi: int,
+    names: Optional[Dict[str, int]] = None,
+    open_hi: Optional[int] = None
+) -> int:
+    """
+    Parse one field (lists of values, ranges and steps) into a bitset.
+
+    Args:
+        open_hi: Where * and open-ended steps stop, if not at hi
+
+    Raises:
+        ValueError: On syntax errors or values outside lo..hi
+    """
+    names = names or {}
+    open_hi = hi if open_hi is None else open_hi
+    mask = 0
+    for part in text.split(','):
+        step = 1
+        stepped = '/' in part
+        if stepped:
+            part, step_text = part.split('/', 1)
+            if not step_text.isdigit() or int(step_text) == 0:
+                raise ValueError(f"Invalid step '{step_text}'")
+            step = int(step_text)
+
+        if part in ('*', '?'):
+            start, end = lo, open_hi
+        elif '-' in part:
+            start_text, end_text = part.split('-', 1)
+            start, end = _parse_value(start_text, names), _parse_value(end_text, names)
+        else:
+            start = _parse_value(part, names)
+            end = open_hi if stepped else start
+
+        if not lo <= start <= hi or not lo <= end <= hi:
+            raise ValueError(f"'{part}' is outside {lo}-{hi}")
+        if start > end:
+            raise ValueError(f"Range '{part}' is reversed")
+        mask |= _bits(start, end, step)
+    return mask
+
+
+class CronExpression:
+    """
+    A parsed cron expression.
+
+    Five fields (minute hour day-of-month month day-of-week) or six with a
+    leading seconds field. Fields accept *, values, names (JAN, MON),
+    ranges, steps and lists; day-of-month also accepts L (last day), nW
+    (weekday nearest day n) and LW, and day-of-week accepts nL (last such
+    weekday of the month). As in Vixie cron, when both day fields are
+    restricted a day matching either one fires.
+
+    Example:
+        cron = CronExpression("*/15 9-17 * * MON-FRI")
+        cron.next_after(datetime.now())
+    """
+
+    def __init__(self, expression: str):
+        """
+        Parse an expression.
+
+        Raises:
+            ValueError: If the expression is invalid
+        """
+        self.expression = expression
+        fields = MACROS.get(expression.strip().lower(), expression).split()
+        if len(fields) == 5:
+            fields.insert(0, '0')
+        elif len(fields) != 6:
+            raise ValueError(f"Cron expression needs 5 or 6 fields: '{expression}'")
+        second, minute, hour, dom, month, dow = fields
+
+        try:
+            self.seconds = _parse_field(second, 0, 59)
+            self.minutes = _parse_field(minute, 0, 59)
+            self.hours = _parse_field(hour, 0, 23)
+            self.months = _parse_field(month, 1, 12, _MONTH_NAMES)
+            self._parse_days(dom)
+            self._parse_weekdays(dow)
+        except ValueError as e:
+            raise ValueError(f"Invalid cron expression '{expression}': {e}")
+
+        self._day_masks: Dict[Tuple[int, int], int] = {}
+
+    def _parse_days(self, text: str):
+        self.dom_any = text in ('*', '?')
+        self.last_day = False
+        self.last_weekday = False
+        self.nearest_weekdays = 0  # days whose nearest weekday fires
+        plain = []
+        for part in text.split(','):
+            if part == 'L':
+                self.last_day = True
+            elif part == 'LW':
+                self.last_weekday = True
+            elif part.endswith('W'):
+                day = _parse_value(part[:-1], {})
+                if not 1 <= day <= 31:
+                    raise ValueError(f"'{part}' is outside 1-31")
+                self.nearest_weekdays |= 1 << day
+            else:
+                plain.append(part)
+        self.days = _parse_field(','.join(plain), 1, 31) if plain else 0
+
+    def _parse_weekdays(self, text: str):
+        self.dow_any = text in ('*', '?')
+        self.last_weekdays = 0  # weekdays whose last occurrence in the month fires
+        plain = []
+        for part in text.split(','):
+            if part.endswith('L') and len(part) > 1:
+                day = _parse_value(part[:-1], _DAY_NAMES) % 7
+                self.last_weekdays |= 1 << day
+            else:
+                plain.append(part)
+        mask = _parse_field(','.join(plain), 0, 7, _DAY_NAMES, open_hi=6) if plain else 0
+        # 7 is another name for Sunday
+        self.weekdays = (mask | (mask >> 7)) & 0x7F
+
+    def day_mask(self, year: int, month: int) -> int:
+        """Bitset of the days (1-31) of a month on which the expression fires."""
+        key = (year, month)
+        mask = self._day_masks.get(key)
+        if mask is not None:
+            return mask
+
+        first, length = calendar.monthrange(year, month)
+        in_month = _bits(1, length)
+
+        dom = self.days & in_month
+        if self.last_day:
+            dom |= 1 << length
+        if self.last_weekday:
+            last = length - max(0, (first + length - 1) % 7 - 4)
+            dom |= 1 << last
+        if self.nearest_weekdays:
+            for day in range(1, length + 1):  # nW past the end of the month never fires
+                if self.nearest_weekdays >> day & 1:
+                    dom |= 1 << self._nearest_weekday(day, first, length)
+
+        # Rotate the weekday bitset so bit 0 is the weekday of the 1st, then
+        # repeat it across the month's weeks
+        offset = (first + 1) % 7  # cron weekday of the 1st: 0 = Sunday
+        dow = (_rotate(self.weekdays, offset) << 1) * _WEEKS & in_month
+        if self.last_weekdays:
+            final_week = in_month & ~_bits(0, length - 7)
+            dow |= (_rotate(self.last_weekdays, offset) << 1) * _WEEKS & final_week
+
+        if self.dom_any and self.dow_any:
+            mask = in_month
+        elif self.dom_any:
+            mask = dow
+        elif self.dow_any:
+            mask = dom
+        else:
+            mask = dom | dow
+
+        if len(self._day_masks) > 64:
+            self._day_masks.clear()
+        self._day_masks[key] = mask
+        return mask
+
+    @staticmethod
+    def _nearest_weekday(day: int, first: int, length: int) -> int:
+        """Weekday (Mon-Fri) nearest to a day, without leaving the month."""
+        weekday = (first + day - 1) % 7  # 0 = Monday
+        if weekday == 5:  # Saturday
+            return day - 1 if day > 1 else day + 2
+        if weekday == 6:  # Sunday
+            return day + 1 if day < length else day - 2
+        return day
+
+    def matches(self, moment: datetime) -> bool:
+        """Whether the expression fires at this second."""
+        return bool(
+            self.seconds >> moment.second & 1
+            and self.minutes >> moment.minute & 1
+            and self.hours >> moment.hour & 1
+            and self.months >> moment.month & 1
+            and self.day_mask(moment.year, moment.month) >> moment.day & 1
+        )
+
+    def next_after(self, after: datetime) -> Optional[datetime]:
+        """
+        First fire time strictly after a moment.
+
+        Works on naive local times. Each field jumps straight to its next
+        set bit and only carries into the field above when it runs out, so
+        a call costs a handful of bit operations per month searched.
+
+        Returns:
+            The next fire time, or None if it never fires again
+        """
+        start = after.replace(microsecond=0) + timedelta(seconds=1)
+        year, month, day = start.year, start.month, start.day
+        hour, minute, second = start.hour, start.minute, start.second
+
+        # A field that runs out (month 13, hour 24, ...) finds no bit, which
+        # carries into the field above on the next pass
+        while year <= after.year + MAX_YEARS_AHEAD:
+            next_month = _next_bit(self.months, month)
+            if next_month is None:
+                year, month, day, hour, minute, second = year + 1, 1, 1, 0, 0, 0
+                continue
+            if next_month != month:
+                month, day, hour, minute, second = next_month, 1, 0, 0, 0
+
+            next_day = _next_bit(self.day_mask(year, month), day)
+            if next_day is None:
+                month, day, hour, minute, second = month + 1, 1, 0, 0, 0
+                continue
+            if next_day != day:
+                day, hour, minute, second = next_day, 0, 0, 0
+
+            next_hour = _next_bit(self.hours, hour)
+            if next_hour is None:
+                day, hour, minute, second = day + 1, 0, 0, 0
+                continue
+            if next_hour != hour:
+                hour, minute, second = next_hour, 0, 0
+
+            next_minute = _next_bit(self.minutes, minute)
+            if next_minute is None:
+                hour, minute, second = hour + 1, 0, 0
+                continue
+            if next_minute != minute:
+                minute, second = next_minute, 0
+
+            next_second = _next_bit(self.seconds, second)
+            if next_second is None:
+                minute, second = minute + 1, 0
+                continue
+
+            return datetime(year, month, day, hour, minute, next_second)
+        return None
+
+    def __repr__(self) -> str:
+        return f"CronExpression({self.expression!r})"
+
+
+@lru_cache(maxsize=1024)
+def parse_cron(expression: str) -> CronExpression:
+    """
+    Parse a cron expression, sharing the result between jobs that use it.
+
+    Raises:
+        ValueError: If the expression is invalid
+    """
+    return CronExpression(expression)
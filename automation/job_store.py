@@ -0,0 +1,211 @@
+"""
+Durable storage for scheduled jobs.
+The scheduler keeps jobs in memory and writes each change through a
+JobStore: SQLite (one row per job, updated in place) by default, or the
+original JSON file.
+"""
+
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from sqlalchemy import (
+    JSON, Boolean, Column, Integer, MetaData, String, Table, Text, create_engine, delete, event, select
+)
+from sqlalchemy.dialects.sqlite import insert
+
+
+# Columns stored as-is; everything in ScheduledJob.to_dict() is a column
+JOB_FIELDS = (
+    "id", "name", "project_id", "workflow_name", "target", "schedule_type", "schedule_config",
+    "enabled", "created_at", "last_run", "next_run", "run_count", "status", "metadata"
+)
+
+_metadata = MetaData()
+
+scheduled_jobs = Table(
+    "scheduled_jobs",
+    _metadata,
+    Column("id", String(64), primary_key=True),
+    Column("name", String(255), nullable=False),
+    Column("project_id", Integer),
+    Column("workflow_name", String(255), nullable=False),
+    Column("target", Text, default=""),
+    Column("schedule_type", String(32), nullable=False),
+    Column("schedule_config", JSON, default=dict),
+    Column("enabled", Boolean, default=True),
+    # ISO-8601 text, so ordering by next_run is chronological
+    Column("created_at", String(32)),
+    Column("last_run", String(32)),
+    Column("next_run", String(32), index=True),
+    Column("run_count", Integer, default=0),
+    Column("status", String(32)),
+    Column("metadata", JSON, default=dict),
+)
+
+
+class JobStore(ABC):
+    """Interface for scheduled job storage. Jobs are passed as ScheduledJob.to_dict() dicts."""
+
+    @abstractmethod
+    def load(self) -> List[dict]:
+        """All stored jobs, soonest next_run first."""
+
+    @abstractmethod
+    def save(self, job: dict):
+        """Insert or replace one job."""
+
+    def save_many(self, jobs: Iterable[dict]):
+        """Insert or replace several jobs in one write."""
+        for job in jobs:
+            self.save(job)
+
+    @abstractmethod
+    def delete(self, job_id: str):
+        """Remove a job; unknown ids are ignored."""
+
+    def close(self):
+        """Release the store's resources."""
+
+
+class JSONJobStore(JobStore):
+    """
+    Jobs in a single JSON file, as the scheduler always stored them.
+
+    Every change rewrites the whole file, so this suits small schedules.
+    Writes go to a temporary file that replaces the original, so a crash
+    leaves either the old or the new file, never a torn one.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, dict] = {job["id"]: job for job in self._read()}
+
+    def _read(self) -> List[dict]:
+        if not self.path.exists():
+            return []
+        with open(self.path, 'r') as f:
+            return json.load(f).get("jobs", [])
+
+    def _write(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, 'w') as f:
+            json.dump({"jobs": list(self._jobs.values())}, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def load(self) -> List[dict]:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return sorted(jobs, key=lambda job: (job.get("next_run") is None, job.get("next_run") or ""))
+
+    def save(self, job: dict):
+        self.save_many([job])
+
+    def save_many(self, jobs: Iterable[dict]):
+        with self._lock:
+            for job in jobs:
+                self._jobs[job["id"]] = dict(job)
+            self._write()
+
+    def delete(self, job_id: str):
+        with self._lock:
+            if self._jobs.pop(job_id, None) is not None:
+                self._write()
+
+
+class SQLiteJobStore(JobStore):
+    """
+    Jobs as rows of a SQLite table in WAL mode.
+
+    Each change is a single-row upsert or delete in its own transaction,
+    so the cost of a change does not grow with the number of jobs and a
+    crash never loses committed schedules. next_run is indexed.
+    """
+
+    def __init__(self, path: Union[str, Path], busy_timeout_ms: int = 5000):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.engine = create_engine(f"sqlite:///{self.path}", connect_args={"check_same_thread": False})
+        event.listen(self.engine, "connect", self._sqlite_pragmas(busy_timeout_ms))
+        _metadata.create_all(self.engine)
+
+    @staticmethod
+    def _sqlite_pragmas(busy_timeout_ms: int):
+        def on_connect(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+            cursor.close()
+        return on_connect
+
+    def load(self) -> List[dict]:
+        query = select(scheduled_jobs).order_by(scheduled_jobs.c.next_run.is_(None), scheduled_jobs.c.next_run)
+        with self.engine.connect() as conn:
+            return [dict(row._mapping) for row in conn.execute(query)]
+
+    def save(self, job: dict):
+        self.save_many([job])
+
+    def save_many(self, jobs: Iterable[dict]):
+        rows = [{name: job.get(name) for name in JOB_FIELDS} for job in jobs]
+        if not rows:
+            return
+        statement = insert(scheduled_jobs)
+        statement = statement.on_conflict_do_update(
+            index_elements=[scheduled_jobs.c.id],
+            set_={name: statement.excluded[name] for name in JOB_FIELDS if name != "id"}
+        )
+        with self.engine.begin() as conn:
+            conn.execute(statement, rows)
+
+    def delete(self, job_id: str):
+        with self.engine.begin() as conn:
+            conn.execute(delete(scheduled_jobs).where(scheduled_jobs.c.id == job_id))
+
+    def close(self):
+        self.engine.dispose()
+
+
+def migrate_json_store(json_path: Union[str, Path], store: JobStore) -> int:
+    """
+    Import jobs from a JSON schedule file into another store.
+
+    The import is a single write, and the file is renamed to
+    `<name>.migrated` afterwards so it is not imported twice.
+
+    Returns:
+        Number of jobs imported
+    """
+    json_path = Path(json_path)
+    if not json_path.exists():
+        return 0
+    jobs = JSONJobStore(json_path).load()
+    store.save_many(jobs)
+    os.replace(json_path, json_path.with_name(json_path.name + ".migrated"))
+    return len(jobs)
+
+
+def open_job_store(path: Optional[Union[str, Path]] = None) -> JobStore:
+    """
+    Open the store at a path: a .json path gives a JSONJobStore, anything
+    else a SQLiteJobStore.
+
+    With no path, the default SQLite store in config/ is used, and an
+    existing config/schedules.json is imported into it on first use.
+    """
+    if path is not None:
+        path = Path(path)
+        return JSONJobStore(path) if path.suffix == ".json" else SQLiteJobStore(path)
+
+    config_dir = Path(__file__).parent.parent / "config"
+    store = SQLiteJobStore(config_dir / "schedules.db")
+    migrate_json_store(config_dir / "schedules.json", store)
+    return store
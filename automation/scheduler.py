@@ -3,17 +3,31 @@ Scheduled scan engine for CyberToolkit.
 Enables automated, recurring security scans with smart scheduling.
 """
 
-import asyncio
+import calendar
+import heapq
+import itertools
 import threading
-import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
-import json
 from pathlib import Path
 import uuid
 
+from core.workflow import get_workflow
+
+from .admission import AdmissionController
+from .cron import parse_cron
+from .job_store import JobStore, open_job_store
+
+
+# Longest the scheduler sleeps without re-reading the wall clock
+MAX_SLEEP_SECONDS = 60.0
+
+# Delay before retrying a job whose run left it still due (e.g. no executor registered)
+RETRY_DELAY_SECONDS = 10.0
+
 
 class ScheduleType(Enum):
     """Types of schedules."""
@@ -105,13 +119,19 @@ class ScheduledJob:
             hour = self.schedule_config.get("hour", 0)
             minute = self.schedule_config.get("minute", 0)
             
-            next_month = now.replace(day=day, hour=hour, minute=minute, second=0, microsecond=0)
-            if next_month <= now:
-                if now.month == 12:
-                    next_month = next_month.replace(year=now.year + 1, month=1)
-                else:
-                    next_month = next_month.replace(month=now.month + 1)
+            # Days past the end of a shorter month run on its last day
+            year, month = now.year, now.month
+            while True:
+                last_day = calendar.monthrange(year, month)[1]
+                next_month = datetime(year, month, min(day, last_day), hour, minute)
+                if next_month > now:
+                    break
+                year, month = (year + 1, 1) if month == 12 else (year, month + 1)
             self.next_run = next_month
+        
+        elif self.schedule_type == ScheduleType.CRON:
+            expression = self.schedule_config.get("expression", "")
+            self.next_run = parse_cron(expression).next_after(now)
     
     def update_after_run(self, success: bool):
         """Update job after execution."""
@@ -121,6 +141,8 @@ class ScheduledJob:
         
         if self.schedule_type != ScheduleType.ONCE:
             self._calculate_next_run()
+        else:
+            self.next_run = None
     
     def to_dict(self) -> dict:
         """Convert to dictionary."""
@@ -143,52 +165,86 @@ class ScheduledJob:
 
 
 class ScanScheduler:
-    """Manages scheduled security scans."""
+    """
+    Manages scheduled security scans.
     
-    def __init__(self, storage_path: Optional[Path] = None):
+    Pending runs are kept in a min-heap of (next_run, job id), and the
+    scheduler thread sleeps on a condition variable until the earliest one is
+    due or the heap changes. Due jobs run on a bounded worker pool, outside
+    the lock, so a long scan never delays other jobs or add_job/remove_job.
+    Heap entries for removed, paused or rescheduled jobs are discarded when
+    they surface rather than searched for.
+    """
+    
+    def __init__(
+        self,
+        storage_path: Optional[Path] = None,
+        max_workers: int = 4,
+        store: Optional[JobStore] = None
+    ):
+        """
+        Initialize ScanScheduler.
+        
+        Args:
+            storage_path: Job store file; .json for the JSON store, anything
+                else for SQLite. Defaults to config/schedules.db.
+            max_workers: Jobs running at once
+            store: Job store to use instead of opening storage_path
+        """
         self.jobs: Dict[str, ScheduledJob] = {}
         self.callbacks: Dict[str, Callable] = {}
+        self.max_workers = max_workers
         self._running = False
         self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
         self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._heap: List[Tuple[datetime, int, str]] = []
+        self._sequence = itertools.count()  # tie-breaker for equal run times
+        self._active: Set[str] = set()  # ids of jobs dispatched or running
         
-        self.storage_path = storage_path or Path(__file__).parent.parent / "config" / "schedules.json"
+        self.store = store or open_job_store(storage_path)
         self._load_jobs()
+        with self._lock:
+            for job in self.jobs.values():
+                self._schedule(job)
     
     def _load_jobs(self):
-        """Load jobs from storage."""
-        if self.storage_path.exists():
+        """Load jobs from the store, skipping records that cannot be read."""
+        for job_data in self.store.load():
             try:
-                with open(self.storage_path, 'r') as f:
-                    data = json.load(f)
-                    for job_data in data.get("jobs", []):
-                        job = ScheduledJob(
-                            id=job_data["id"],
-                            name=job_data["name"],
-                            project_id=job_data["project_id"],
-                            workflow_name=job_data["workflow_name"],
-                            target=job_data["target"],
-                            schedule_type=ScheduleType(job_data["schedule_type"]),
-                            schedule_config=job_data.get("schedule_config", {}),
-                            enabled=job_data.get("enabled", True),
-                            run_count=job_data.get("run_count", 0),
-                            metadata=job_data.get("metadata", {})
-                        )
-                        if job_data.get("last_run"):
-                            job.last_run = datetime.fromisoformat(job_data["last_run"])
-                        self.jobs[job.id] = job
-            except Exception:
-                pass
-    
-    def _save_jobs(self):
-        """Save jobs to storage."""
-        try:
-            self.storage_path.parent.mkdir(parents=True, exist_ok=True)
-            data = {"jobs": [job.to_dict() for job in self.jobs.values()]}
-            with open(self.storage_path, 'w') as f:
-                json.dump(data, f, indent=2)
-        except Exception:
-            pass
+                job = ScheduledJob(
+                    id=job_data["id"],
+                    name=job_data["name"],
+                    project_id=job_data["project_id"],
+                    workflow_name=job_data["workflow_name"],
+                    target=job_data["target"],
+                    schedule_type=ScheduleType(job_data["schedule_type"]),
+                    schedule_config=job_data.get("schedule_config") or {},
+                    enabled=job_data.get("enabled", True),
+                    run_count=job_data.get("run_count", 0),
+                    metadata=job_data.get("metadata") or {}
+                )
+                if job_data.get("created_at"):
+                    job.created_at = datetime.fromisoformat(job_data["created_at"])
+                if job_data.get("last_run"):
+                    job.last_run = datetime.fromisoformat(job_data["last_run"])
+                    if job.schedule_type == ScheduleType.ONCE:
+                        job.next_run = None
+            except (KeyError, TypeError, ValueError):
+                continue
+            if not job.enabled:
+                job.status = JobStatus.PAUSED
+            self.jobs[job.id] = job
+    
+    def _save_job(self, job: ScheduledJob):
+        """Write one job's current state to the store."""
+        self.store.save(job.to_dict())
+    
+    def close(self):
+        """Stop the scheduler and close the job store."""
+        self.stop()
+        self.store.close()
     
     def add_job(
         self,
@@ -212,20 +268,20 @@ class ScanScheduler:
             metadata=metadata or {}
         )
         
+        self._save_job(job)
         with self._lock:
             self.jobs[job.id] = job
-            self._save_jobs()
+            self._schedule(job)
         
         return job
     
     def remove_job(self, job_id: str) -> bool:
-        """Remove a scheduled job."""
+        """Remove a scheduled job; its heap entry is dropped when it comes due."""
         with self._lock:
-            if job_id in self.jobs:
-                del self.jobs[job_id]
-                self._save_jobs()
-                return True
-        return False
+            if self.jobs.pop(job_id, None) is None:
+                return False
+        self.store.delete(job_id)
+        return True
     
     def get_job(self, job_id: str) -> Optional[ScheduledJob]:
         """Get job by ID."""
@@ -240,24 +296,27 @@ class ScanScheduler:
     
     def pause_job(self, job_id: str) -> bool:
         """Pause a job."""
-        job = self.jobs.get(job_id)
-        if job:
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if not job:
+                return False
             job.enabled = False
             job.status = JobStatus.PAUSED
-            self._save_jobs()
-            return True
-        return False
+        self._save_job(job)
+        return True
     
     def resume_job(self, job_id: str) -> bool:
         """Resume a paused job."""
-        job = self.jobs.get(job_id)
-        if job:
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if not job:
+                return False
             job.enabled = True
             job.status = JobStatus.PENDING
             job._calculate_next_run()
-            self._save_jobs()
-            return True
-        return False
+            self._schedule(job)
+        self._save_job(job)
+        return True
     
     def register_executor(self, callback: Callable[[ScheduledJob], bool]):
         """Register job executor callback."""
@@ -282,30 +341,96 @@ class ScanScheduler:
             on_complete = self.callbacks.get("on_complete")
             if on_complete:
                 on_complete(job, success)
-            
-            self._save_jobs()
-            return success
         except Exception as e:
-            job.status = JobStatus.FAILED
+            # Move on to the next occurrence rather than retrying immediately
+            job.update_after_run(False)
             job.metadata["last_error"] = str(e)
-            self._save_jobs()
-            return False
+            success = False
+        
+        with self._lock:
+            removed = self.jobs.get(job.id) is not job
+        if not removed:
+            self._save_job(job)
+        return success
     
-    def _scheduler_loop(self):
-        """Background scheduler loop."""
-        while self._running:
-            now = datetime.now()
-            
+    def _schedule(self, job: ScheduledJob):
+        """Push a job's next run onto the heap. Caller holds the lock."""
+        if not job.enabled or job.next_run is None:
+            return
+        entry = (job.next_run, next(self._sequence), job.id)
+        heapq.heappush(self._heap, entry)
+        
+        # Drop stale entries once they outnumber live ones
+        if len(self._heap) > 2 * len(self.jobs) + 64:
+            self._heap = [item for item in self._heap if self._is_current(item)]
+            heapq.heapify(self._heap)
+        
+        # Only a new earliest deadline changes how long the loop should sleep
+        if self._heap[0][0] == entry[0]:
+            self._wake.notify()
+    
+    def _is_current(self, entry: Tuple[datetime, int, str]) -> bool:
+        """Whether a heap entry still matches its job's next run."""
+        job = self.jobs.get(entry[2])
+        return bool(job and job.enabled and job.next_run == entry[0])
+    
+    def _pop_due(self, now: datetime) -> List[ScheduledJob]:
+        """Pop every job due at `now` and mark it active. Caller holds the lock."""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            job_id = entry[2]
+            if not self._is_current(entry) or job_id in self._active:
+                continue  # removed, paused, rescheduled or already running
+            self._active.add(job_id)
+            due.append(self.jobs[job_id])
+        return due
+    
+    def _admit(self, job: ScheduledJob, now: datetime) -> Optional[datetime]:
+        """
+        Decide whether a due job may start. Called with the lock held.
+        
+        Returns:
+            None to start the job now, or when to try it again
+        """
+        return None
+    
+    def _release(self, job: ScheduledJob):
+        """Called when a job admitted by _admit has finished."""
+    
+    def _run_job(self, job: ScheduledJob) -> bool:
+        """Run a dispatched job on a worker, then queue its next run."""
+        try:
+            return self._execute_job(job)
+        finally:
+            self._release(job)
             with self._lock:
-                for job in self.jobs.values():
-                    if not job.enabled:
+                self._active.discard(job.id)
+                now = datetime.now()
+                if job.next_run is not None and job.next_run <= now:
+                    # Re-queueing a past deadline would dispatch it again at once
+                    job.next_run = now + timedelta(seconds=RETRY_DELAY_SECONDS)
+                if self.jobs.get(job.id) is job:
+                    self._schedule(job)
+    
+    def _scheduler_loop(self):
+        """Background scheduler loop: sleep until the next deadline, then dispatch."""
+        with self._wake:
+            while self._running:
+                now = datetime.now()
+                for job in self._pop_due(now):
+                    retry = self._admit(job, now)
+                    if retry is not None:
+                        self._active.discard(job.id)
+                        job.next_run = retry
+                        self._schedule(job)
                         continue
-                    
-                    if job.next_run and job.next_run <= now:
-                        if job.status != JobStatus.RUNNING:
-                            self._execute_job(job)
-            
-            time.sleep(10)  # Check every 10 seconds
+                    self._executor.submit(self._run_job, job)
+                
+                timeout = MAX_SLEEP_SECONDS
+                if self._heap:
+                    timeout = min(timeout, max(0.0, (self._heap[0][0] - now).total_seconds()))
+                self._wake.wait(timeout)
     
     def start(self):
         """Start the scheduler."""
@@ -313,22 +438,32 @@ class ScanScheduler:
             return
         
         self._running = True
-        self._thread = threading.Thread(target=self._scheduler_loop, daemon=True)
+        self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="schedule-worker")
+        self._thread = threading.Thread(target=self._scheduler_loop, name="scheduler", daemon=True)
         self._thread.start()
     
-    def stop(self):
-        """Stop the scheduler."""
-        self._running = False
+    def stop(self, wait: bool = True):
+        """Stop the scheduler; optionally wait for running jobs to finish."""
+        with self._lock:
+            self._running = False
+            self._wake.notify()
         if self._thread:
             self._thread.join(timeout=5)
             self._thread = None
+        if self._executor:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
     
     def run_now(self, job_id: str) -> bool:
-        """Run a job immediately."""
-        job = self.jobs.get(job_id)
-        if job:
-            return self._execute_job(job)
-        return False
+        """Run a job immediately, unless it is already running or not admitted."""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if not job or job_id in self._active:
+                return False
+            if self._admit(job, datetime.now()) is not None:
+                return False
+            self._active.add(job_id)
+        return self._run_job(job)
     
     def get_upcoming_jobs(self, hours: int = 24) -> List[ScheduledJob]:
         """Get jobs scheduled to run in the next N hours."""
@@ -340,12 +475,43 @@ class ScanScheduler:
 
 
 class SmartScheduler(ScanScheduler):
-    """Enhanced scheduler with intelligent features."""
+    """
+    Enhanced scheduler with intelligent features.
+    
+    Due jobs pass through an AdmissionController: a job starts only while
+    the global, per-tool, per-target and per-project limits have room and
+    the host is not overloaded, and is otherwise given a spread-out later
+    start slot.
+    """
     
-    def __init__(self, storage_path: Optional[Path] = None):
-        super().__init__(storage_path)
+    def __init__(
+        self,
+        storage_path: Optional[Path] = None,
+        max_workers: int = 4,
+        admission: Optional[AdmissionController] = None,
+        store: Optional[JobStore] = None
+    ):
+        self.admission = admission or AdmissionController(max_global=max_workers)
+        super().__init__(storage_path, max_workers, store)
         self.target_history: Dict[str, List[datetime]] = {}
     
+    def job_tools(self, job: ScheduledJob) -> List[str]:
+        """Tools a job runs: metadata['tools'] if set, else its workflow's steps."""
+        tools = job.metadata.get("tools")
+        if tools:
+            return list(tools)
+        workflow = get_workflow(job.workflow_name)
+        return [step.tool for step in workflow.steps] if workflow else []
+    
+    def _admit(self, job: ScheduledJob, now: datetime) -> Optional[datetime]:
+        if self.admission.try_acquire(job.id, self.job_tools(job), job.target, job.project_id):
+            return None
+        job.metadata["deferred"] = job.metadata.get("deferred", 0) + 1
+        return self.admission.defer(now)
+    
+    def _release(self, job: ScheduledJob):
+        self.admission.release(job.id)
+    
     def suggest_schedule(self, target: str, workflow_name: str) -> dict:
         """
         Suggest optimal schedule based on target characteristics.
@@ -388,15 +554,16 @@ class SmartScheduler(ScanScheduler):
         """
         jobs = []
         
-        # Weekly recon for all targets
-        for i, target in enumerate(targets[:5]):  # Limit to 5 targets
+        # Weekly recon for all targets, staggered across the hour
+        recon_targets = targets[:5]  # Limit to 5 targets
+        for i, target in enumerate(recon_targets):
             job = self.add_job(
                 name=f"Weekly Recon - {target}",
                 project_id=project_id,
                 workflow_name="web_recon",
                 target=target,
                 schedule_type=ScheduleType.WEEKLY,
-                schedule_config={"day_of_week": i % 7, "hour": 2, "minute": 0},
+                schedule_config={"day_of_week": i % 7, "hour": 2, "minute": i * 60 // len(recon_targets)},
                 metadata={"auto_created": True}
             )
             jobs.append(job)
@@ -0,0 +1,107 @@
+"""
+Scan archive benchmark.
+
+Compares saving and loading a ScanResult as plain JSON (ScanResult.save)
+against the binary archive, and times a single-host lookup, which only the
+archive can answer without decoding the whole file.
+
+Usage:
+    python benchmarks/bench_archive.py [--findings 50000] [--hosts 20000] [--repeat 3]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from parsers.archive import ScanArchive
+from parsers.base import Finding, FindingType, Host, ScanResult, Severity
+
+
+def build_result(findings: int, hosts: int) -> ScanResult:
+    """Build a ScanResult with nuclei-like findings and nmap-like hosts."""
+    severities = [Severity.CRITICAL, Severity.HIGH, Severity.MEDIUM, Severity.LOW, Severity.INFO]
+    return ScanResult(
+        tool="nuclei",
+        target="10.0.0.0/16",
+        findings=[
+            Finding(
+                type=FindingType.VULNERABILITY,
+                severity=severities[i % len(severities)],
+                title=f"template-{i % 500}",
+                description="Benchmark finding",
+                evidence=f"URL: https://host{i}.bench.example.com/",
+                references=["https://example.com/advisory"],
+                tags=["cve", "bench"],
+                metadata={"template_id": f"template-{i % 500}", "host": f"host{i}.bench.example.com"}
+            )
+            for i in range(findings)
+        ],
+        hosts=[
+            Host(
+                address=f"10.0.{i // 256}.{i % 256}",
+                hostname=f"host{i}.bench.example.com",
+                status="up",
+                ports=[{"number": 22, "protocol": "tcp", "state": "open"},
+                       {"number": 443, "protocol": "tcp", "state": "open"}],
+                services=[{"port": 443, "name": "https", "product": "nginx"}]
+            )
+            for i in range(hosts)
+        ]
+    )
+
+
+def best_of(repeat: int, func) -> float:
+    """Fastest of `repeat` timed calls, in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run(findings: int, hosts: int, repeat: int):
+    result = build_result(findings, hosts)
+    address = result.hosts[-1].address
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        json_path = Path(tmpdir) / "scan.json"
+        archive_path = Path(tmpdir) / "scan.ctsr"
+
+        json_save = best_of(repeat, lambda: result.save(json_path))
+        archive_save = best_of(repeat, lambda: result.save(archive_path, binary=True))
+        json_load = best_of(repeat, lambda: ScanResult.load(json_path))
+        archive_load = best_of(repeat, lambda: ScanResult.load(archive_path))
+
+        def json_lookup():
+            return next(h for h in ScanResult.load(json_path).hosts if h.address == address)
+
+        def archive_lookup():
+            with ScanArchive(archive_path) as archive:
+                return archive.get_host(address)
+
+        json_host = best_of(repeat, json_lookup)
+        archive_host = best_of(repeat, archive_lookup)
+
+        json_size = json_path.stat().st_size
+        archive_size = archive_path.stat().st_size
+
+    print(f"records:      {findings} findings, {hosts} hosts")
+    print(f"size:         json {json_size / 1e6:.1f} MB, archive {archive_size / 1e6:.1f} MB")
+    print(f"save:         json {json_save:.3f}s, archive {archive_save:.3f}s ({json_save / archive_save:.1f}x)")
+    print(f"load:         json {json_load:.3f}s, archive {archive_load:.3f}s ({json_load / archive_load:.1f}x)")
+    print(f"host lookup:  json {json_host:.3f}s, archive {archive_host * 1000:.1f}ms "
+          f"({json_host / archive_host:.0f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--findings", type=int, default=50000)
+    parser.add_argument("--hosts", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.findings, args.hosts, args.repeat)
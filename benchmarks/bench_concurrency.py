@@ -0,0 +1,69 @@
+"""
+Concurrent read benchmark.
+
+Runs the same SQL-heavy finding queries from 1..N threads, each in its own
+session_scope(), and reports throughput so pool and WAL settings can be
+compared.
+
+Usage:
+    python benchmarks/bench_concurrency.py [--findings 100000] [--threads 1,2,4,8]
+"""
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.database import session_scope
+from core.project import ProjectManager
+from bench_ingest import build_result
+
+
+def reader(pm: ProjectManager, project_id: int, deadline: float, counts: list, slot: int):
+    with session_scope():
+        done = 0
+        while time.perf_counter() < deadline:
+            # Title search scans the whole table inside SQLite, off the GIL
+            pm.page_findings(project_id=project_id, search=f"template-{done % 500}x", limit=10)
+            done += 1
+        counts[slot] = done
+
+
+def run(findings: int, thread_counts: list, seconds: float):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pm = ProjectManager(db_path=str(Path(tmpdir) / "bench.db"))
+        project = pm.create_project(name="bench")
+        scan = pm.create_scan(project.id, tool="nuclei", command="bench")
+        pm.ingest_scan_result(scan.id, build_result(findings))
+
+        baseline = None
+        for n in thread_counts:
+            counts = [0] * n
+            deadline = time.perf_counter() + seconds
+            threads = [
+                threading.Thread(target=reader, args=(pm, project.id, deadline, counts, i))
+                for i in range(n)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            rate = sum(counts) / seconds
+            baseline = baseline or rate
+            print(f"threads={n:<3} {rate:8.1f} queries/s  ({rate / baseline:.2f}x)")
+
+        pm.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--findings", type=int, default=100000)
+    parser.add_argument("--threads", default="1,2,4,8")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+    run(args.findings, [int(n) for n in args.threads.split(",")], args.seconds)
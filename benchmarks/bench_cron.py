@@ -0,0 +1,74 @@
+"""
+Cron next-fire benchmark.
+
+Computes the next fire time of N jobs, each with a cron expression drawn
+from a mix of common and sparse schedules, and reports jobs per second for
+a cold start (expressions parsed) and a warm pass (parsed expressions reused).
+
+Usage:
+    python benchmarks/bench_cron.py [--jobs 100000] [--distinct 5000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from automation.cron import CronExpression, parse_cron
+
+
+PATTERNS = [
+    "{m} {h} * * *",
+    "*/{s} * * * *",
+    "{m} {h} * * {d}",
+    "{m} {h} {dom} * *",
+    "{m} {h} L * *",
+    "{m} {h} * * {d}L",
+    "{m} 9-17/{s} * * MON-FRI",
+    "{m} {h} 29 2 *",
+]
+
+
+def build_expressions(distinct: int, seed: int = 1):
+    rng = random.Random(seed)
+    expressions = []
+    for _ in range(distinct):
+        pattern = rng.choice(PATTERNS)
+        expressions.append(pattern.format(
+            m=rng.randint(0, 59), h=rng.randint(0, 23), s=rng.randint(2, 30),
+            d=rng.randint(0, 6), dom=rng.randint(1, 31)
+        ))
+    return expressions
+
+
+def run(jobs: int, distinct: int):
+    expressions = build_expressions(distinct)
+    rng = random.Random(2)
+    base = datetime(2026, 1, 1)
+    starts = [base + timedelta(seconds=rng.randint(0, 365 * 86400)) for _ in range(jobs)]
+
+    started = time.perf_counter()
+    parsed = [CronExpression(expressions[i % distinct]) for i in range(jobs)]
+    for cron, after in zip(parsed, starts):
+        cron.next_after(after)
+    cold = time.perf_counter() - started
+    print(f"cold (parse + next): {jobs / cold:10.0f} jobs/s  ({cold:.2f}s for {jobs} jobs)")
+
+    parse_cron.cache_clear()
+    started = time.perf_counter()
+    for i, after in enumerate(starts):
+        parse_cron(expressions[i % distinct]).next_after(after)
+    warm = time.perf_counter() - started
+    print(f"shared (parse_cron): {jobs / warm:10.0f} jobs/s  ({warm:.2f}s for {jobs} jobs)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--distinct", type=int, default=5000)
+    args = parser.parse_args()
+    run(args.jobs, args.distinct)
@@ -0,0 +1,78 @@
+"""
+Finding ingestion benchmark.
+
+Compares per-finding ProjectManager.add_finding() against the batched
+ProjectManager.ingest_scan_result() on a throwaway SQLite workspace.
+
+Usage:
+    python benchmarks/bench_ingest.py [--findings 40000] [--batch-size 1000]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.project import ProjectManager
+from parsers.base import Finding, FindingType, ScanResult, Severity
+
+
+def build_result(count: int) -> ScanResult:
+    """Build a nuclei-like ScanResult with `count` findings."""
+    severities = [Severity.CRITICAL, Severity.HIGH, Severity.MEDIUM, Severity.LOW, Severity.INFO]
+    return ScanResult(tool="nuclei", target="bench.example.com", findings=[
+        Finding(
+            type=FindingType.VULNERABILITY,
+            severity=severities[i % len(severities)],
+            title=f"template-{i % 500}",
+            description="Benchmark finding",
+            evidence=f"URL: https://host{i}.bench.example.com/",
+            references=["https://example.com/advisory"],
+            tags=["cve", "bench"],
+            metadata={"template_id": f"template-{i % 500}", "host": f"host{i}.bench.example.com"}
+        )
+        for i in range(count)
+    ])
+
+
+def run(findings: int, batch_size: int, baseline_sample: int):
+    result = build_result(findings)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pm = ProjectManager(db_path=str(Path(tmpdir) / "bench.db"))
+        project = pm.create_project(name="bench")
+
+        # Per-finding baseline on a sample, extrapolated
+        scan = pm.create_scan(project.id, tool="nuclei", command="bench")
+        sample = result.findings[:baseline_sample]
+        start = time.perf_counter()
+        for f in sample:
+            pm.add_finding(
+                scan.id, f.type.value, f.severity.value, f.title,
+                description=f.description, evidence=f.evidence,
+                references=f.references, tags=f.tags, metadata=f.metadata
+            )
+        per_row = (time.perf_counter() - start) / max(1, len(sample))
+
+        scan = pm.create_scan(project.id, tool="nuclei", command="bench")
+        start = time.perf_counter()
+        inserted = pm.ingest_scan_result(scan.id, result, batch_size=batch_size)
+        bulk = time.perf_counter() - start
+        pm.close()
+
+    print(f"findings:            {inserted}")
+    print(f"add_finding:         {1 / per_row:,.0f} rows/s (sampled {len(sample)})")
+    print(f"ingest_scan_result:  {inserted / bulk:,.0f} rows/s ({bulk:.2f}s, batch_size={batch_size})")
+    print(f"speedup:             {per_row * inserted / bulk:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--findings", type=int, default=40000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--baseline-sample", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.findings, args.batch_size, args.baseline_sample)
@@ -12,6 +12,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.app_context import get_app_context
 from core.enterprise import AuditAction
+from core.sharding import DEFAULT_CONCURRENCY, run_sharded
 from core.utils import format_duration
 
 
@@ -365,22 +366,31 @@ def schedule_list():
 @click.option('--type', '-t', 
               type=click.Choice(['daily', 'weekly', 'monthly']),
               default='weekly', help='Schedule type')
-def schedule_add(name, project_id, workflow, target, type):
+@click.option('--cron', 'cron_expression', default=None,
+              help='Cron expression, e.g. "0 2 * * MON" (overrides --type)')
+def schedule_add(name, project_id, workflow, target, type, cron_expression):
     """Add a scheduled scan."""
     from automation.scheduler import ScheduleType
     scheduler = _ctx.scheduler
     
-    schedule_type = ScheduleType(type)
-    config = scheduler.suggest_schedule(target, workflow)
+    if cron_expression:
+        schedule_type = ScheduleType.CRON
+        schedule_config = {"expression": cron_expression}
+    else:
+        schedule_type = ScheduleType(type)
+        schedule_config = scheduler.suggest_schedule(target, workflow).get('schedule_config', {})
     
-    job = scheduler.add_job(
-        name=name,
-        project_id=project_id,
-        workflow_name=workflow,
-        target=target,
-        schedule_type=schedule_type,
-        schedule_config=config.get('schedule_config', {})
-    )
+    try:
+        job = scheduler.add_job(
+            name=name,
+            project_id=project_id,
+            workflow_name=workflow,
+            target=target,
+            schedule_type=schedule_type,
+            schedule_config=schedule_config
+        )
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint='--cron')
     
     click.echo(f"✓ Created scheduled job: {job.name} (ID: {job.id})")
     click.echo(f"  Next run: {job.next_run}")
@@ -397,6 +407,78 @@ def schedule_add(name, project_id, workflow, target, type):
     )
 
 
+# ==================== Workflow Commands ====================
+
+@cli.group()
+def workflow():
+    """Run workflows."""
+    pass
+
+
+@workflow.command('run')
+@click.argument('name')
+@click.argument('target')
+@click.option('--shard-size', type=int, default=None,
+              help='Split a CIDR range or target file into shards of this many targets')
+@click.option('--concurrency', '-c', type=int, default=DEFAULT_CONCURRENCY,
+              help='Shards running at once (with --shard-size)')
+def workflow_run(name, target, shard_size, concurrency):
+    """Run a predefined workflow, or one from a JSON/YAML file, on a target."""
+    from core.workflow import Workflow, get_workflow, list_workflows
+
+    wf = get_workflow(name)
+    if wf is None:
+        if not Path(name).is_file():
+            raise click.BadParameter(
+                f"Unknown workflow; use a file or one of {', '.join(list_workflows())}", param_hint='NAME'
+            )
+        wf = Workflow.load(name)
+
+    click.echo(f"Starting workflow {wf.name} on {target}...")
+    audit_log(
+        AuditAction.SCAN_START,
+        resource_type="workflow",
+        resource_id=wf.name,
+        details={"target": target, "shard_size": shard_size}
+    )
+
+    try:
+        if shard_size:
+            result = run_sharded(_ctx.workflow, wf, target, shard_size=shard_size, concurrency=concurrency)
+            status = result.status
+            click.echo(f"\n✓ Workflow finished")
+            click.echo(f"  Status: {status}")
+            click.echo(f"  Shards: {len(result.metadata['shards'])}")
+            click.echo(f"  Hosts: {len(result.hosts)}")
+            click.echo(f"  Findings: {len(result.findings)}")
+            click.echo(f"  Duration: {format_duration(result.duration_seconds)}")
+        else:
+            results = _ctx.workflow.execute(wf, target)
+            status = results['status']
+            click.echo(f"\n✓ Workflow finished")
+            click.echo(f"  Status: {status}")
+            for step in results['steps']:
+                click.echo(f"  {step['name']:<20} {step['status']:<10} {step['output']}")
+            click.echo(f"  Duration: {format_duration(results['duration_seconds'])}")
+    except Exception as e:
+        click.echo(f"✗ Workflow failed: {e}")
+        audit_log(
+            AuditAction.ERROR,
+            success=False,
+            resource_type="workflow",
+            resource_id=wf.name,
+            details={"target": target, "error": str(e)}
+        )
+        return
+
+    audit_log(
+        AuditAction.SCAN_COMPLETE,
+        resource_type="workflow",
+        resource_id=wf.name,
+        details={"target": target, "status": status, "shard_size": shard_size}
+    )
+
+
 # ==================== Server Commands ====================
 
 @cli.command('serve')
@@ -2,15 +2,19 @@
 from .config import ConfigManager
 from .utils import validate_target, parse_cidr, format_timestamp, TargetList
 from .workflow import WorkflowEngine, Workflow, WorkflowStep, get_workflow, list_workflows
-from .database import Database, Project, Target, Scan, Finding, Note, Session
+from .database import Database, Project, Target, Scan, Finding, Note, Session, session_scope
 from .project import ProjectManager
+from .async_project import AsyncProjectManager
+from .pagination import Page
+from .stats import StatsService
 from .reports import ReportGenerator
+from .scan_runner import ScanRunner
 
 __all__ = [
     'ConfigManager',
     'validate_target', 'parse_cidr', 'format_timestamp', 'TargetList',
     'WorkflowEngine', 'Workflow', 'WorkflowStep', 'get_workflow', 'list_workflows',
-    'Database', 'Project', 'Target', 'Scan', 'Finding', 'Note', 'Session',
-    'ProjectManager',
-    'ReportGenerator'
+    'Database', 'Project', 'Target', 'Scan', 'Finding', 'Note', 'Session', 'session_scope',
+    'ProjectManager', 'AsyncProjectManager', 'Page', 'StatsService',
+    'ReportGenerator', 'ScanRunner'
 ]
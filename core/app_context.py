@@ -4,11 +4,14 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
+from automation.admission import AdmissionController
 from automation.scheduler import SmartScheduler
 from core.config import ConfigManager
 from core.enterprise import AuditAction, AuditLogger
 from core.integrations import IntegrationManager
 from core.project import ProjectManager
+from core.scan_runner import ScanRunner
+from core.step_cache import StepCache
 from core.workflow import WorkflowEngine
 
 
@@ -20,6 +23,7 @@ class AppContext:
     workflow: WorkflowEngine
     audit: AuditLogger
     integrations: IntegrationManager
+    scan_runner: ScanRunner
 
 
 _context: Optional[AppContext] = None
@@ -34,7 +38,18 @@ def get_app_context() -> AppContext:
     config = ConfigManager()
     pm = ProjectManager()
     audit = AuditLogger()
-    scheduler = SmartScheduler()
+    settings = config.settings
+    scheduler = SmartScheduler(
+        max_workers=settings.max_concurrent_scans,
+        admission=AdmissionController(
+            max_global=settings.max_concurrent_scans,
+            per_tool=settings.tool_concurrency,
+            per_target=settings.schedule_target_concurrency,
+            per_project=settings.schedule_project_concurrency,
+            max_load=settings.schedule_max_load,
+            max_memory_percent=settings.schedule_max_memory_percent
+        )
+    )
     integrations = IntegrationManager()
     scheduler.register_on_complete(
         lambda job, success: audit.log(
@@ -52,7 +67,19 @@ def get_app_context() -> AppContext:
             success=success
         )
     )
-    workflow = WorkflowEngine(audit=audit)
+    workflow = WorkflowEngine(audit=audit, max_parallel=config.settings.max_concurrent_scans)
+    if config.settings.step_cache_enabled:
+        workflow.cache = StepCache(
+            workflow.results_dir / ".step_cache",
+            max_bytes=config.settings.step_cache_max_mb * 1024 * 1024,
+            ttls=config.settings.step_cache_ttl
+        )
+    scan_runner = ScanRunner(
+        pm,
+        max_workers=config.settings.max_concurrent_scans,
+        tool_limits=config.settings.tool_concurrency,
+        timeout=config.settings.timeout_seconds
+    )
 
     _context = AppContext(
         config=config,
@@ -60,7 +87,8 @@ def get_app_context() -> AppContext:
         scheduler=scheduler,
         workflow=workflow,
         audit=audit,
-        integrations=integrations
+        integrations=integrations,
+        scan_runner=scan_runner
     )
 
     return _context
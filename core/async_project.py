@@ -0,0 +1,138 @@
+"""
+Async facade over ProjectManager for the API.
+Runs each call in a worker thread inside its own session_scope(), so slow
+queries and report generation never block the event loop.
+"""
+
+import asyncio
+from typing import Any, Callable, List, Optional
+
+from .database import FindingStatus, ScanStatus, session_scope
+from .pagination import DEFAULT_PAGE_SIZE
+from .project import ProjectManager
+
+
+def _serialize(value: Any) -> Any:
+    """Convert models (or lists of them) to dicts; pass anything else through."""
+    if isinstance(value, list):
+        return [_serialize(item) for item in value]
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    return value
+
+
+class AsyncProjectManager:
+    """
+    Awaitable mirror of the ProjectManager API.
+
+    ORM objects cannot outlive the worker's session, so methods return the
+    models' to_dict() output (pages as {items, next_cursor, limit}) instead.
+    """
+
+    def __init__(self, project_manager: ProjectManager):
+        """
+        Initialize AsyncProjectManager.
+
+        Args:
+            project_manager: Synchronous ProjectManager to delegate to
+        """
+        self.pm = project_manager
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run any synchronous callable off the event loop in its own session scope."""
+        def work():
+            with session_scope():
+                return fn(*args, **kwargs)
+        return await asyncio.to_thread(work)
+
+    async def _call(self, method: Callable, *args, **kwargs) -> Any:
+        """Call a ProjectManager method and serialize its result in the worker."""
+        return await self.run(lambda: _serialize(method(*args, **kwargs)))
+
+    # ==================== Projects ====================
+
+    async def list_projects(self, status: Optional[str] = None) -> List[dict]:
+        return await self._call(self.pm.list_projects, status=status)
+
+    async def get_project(self, project_id: int) -> Optional[dict]:
+        return await self._call(self.pm.get_project, project_id)
+
+    async def get_project_by_name(self, name: str) -> Optional[dict]:
+        return await self._call(self.pm.get_project_by_name, name)
+
+    async def create_project(self, name: str, **kwargs) -> dict:
+        return await self._call(self.pm.create_project, name, **kwargs)
+
+    async def update_project(self, project_id: int, **kwargs) -> Optional[dict]:
+        return await self._call(self.pm.update_project, project_id, **kwargs)
+
+    async def delete_project(self, project_id: int) -> bool:
+        return await self._call(self.pm.delete_project, project_id)
+
+    async def archive_project(self, project_id: int) -> Optional[dict]:
+        return await self._call(self.pm.archive_project, project_id)
+
+    # ==================== Targets ====================
+
+    async def page_targets(self, project_id: int, **kwargs) -> dict:
+        return await self._call(self.pm.page_targets, project_id=project_id, **kwargs)
+
+    async def add_target(self, project_id: int, value: str, **kwargs) -> dict:
+        return await self._call(self.pm.add_target, project_id=project_id, value=value, **kwargs)
+
+    async def delete_target(self, target_id: int) -> bool:
+        return await self._call(self.pm.delete_target, target_id)
+
+    # ==================== Scans ====================
+
+    async def page_scans(
+        self,
+        project_id: int,
+        tool: Optional[str] = None,
+        status: Optional[ScanStatus] = None,
+        descending: bool = True,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> dict:
+        return await self._call(
+            self.pm.page_scans, project_id=project_id, tool=tool, status=status,
+            descending=descending, limit=limit, cursor=cursor
+        )
+
+    async def create_scan(self, project_id: int, tool: str, command: str, **kwargs) -> dict:
+        return await self._call(
+            self.pm.create_scan, project_id=project_id, tool=tool, command=command, **kwargs
+        )
+
+    async def get_scan(self, scan_id: int) -> Optional[dict]:
+        return await self._call(self.pm.get_scan, scan_id)
+
+    # ==================== Findings ====================
+
+    async def page_findings(self, **kwargs) -> dict:
+        return await self._call(self.pm.page_findings, **kwargs)
+
+    async def get_finding_stats(self, project_id: int) -> dict:
+        return await self._call(self.pm.get_finding_stats, project_id)
+
+    async def update_finding_status(self, finding_id: int, status: FindingStatus) -> Optional[dict]:
+        return await self._call(self.pm.update_finding_status, finding_id, status)
+
+    # ==================== Notes ====================
+
+    async def page_notes(self, project_id: int, **kwargs) -> dict:
+        return await self._call(self.pm.page_notes, project_id=project_id, **kwargs)
+
+    async def add_note(self, project_id: int, title: str, **kwargs) -> dict:
+        return await self._call(self.pm.add_note, project_id=project_id, title=title, **kwargs)
+
+    # ==================== Sessions & Stats ====================
+
+    async def load_session(self, name: str = "default") -> Optional[dict]:
+        return await self._call(self.pm.load_session, name)
+
+    async def save_session(self, name: str = "default", **kwargs) -> dict:
+        return await self._call(self.pm.save_session, name=name, **kwargs)
+
+    async def get_workspace_stats(self) -> dict:
+        return await self._call(self.pm.get_workspace_stats)
@@ -0,0 +1,180 @@
+"""
+Step conditions for CyberToolkit workflows.
+A small expression language over the metrics of earlier steps, e.g.
+``probe.count > 0 and not scan.exists``. Expressions are parsed once and
+compiled to closures; nothing is ever passed to eval().
+"""
+
+import ast
+import operator
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple, Union
+
+
+# Output files above this size are counted but not parsed for findings
+MAX_PARSE_BYTES = 64 * 1024 * 1024
+
+# Attributes a condition can read from a step, and their aliases
+STEP_ATTRIBUTES = {
+    'exists': 'exists',
+    'count': 'lines',
+    'lines': 'lines',
+    'size': 'size',
+    'bytes': 'size',
+    'findings': 'findings',
+    'status': 'status',
+}
+
+EMPTY_METRICS = {'exists': False, 'lines': 0, 'size': 0, 'findings': 0, 'status': 'pending'}
+
+_COMPARISONS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+
+_BOOLEANS = {'true': True, 'True': True, 'false': False, 'False': False}
+
+
+def output_metrics(path: Union[str, Path], parser: Optional[Any] = None) -> Dict[str, Any]:
+    """
+    Measure a step's output file in a single read.
+
+    Args:
+        path: Output file
+        parser: Parser instance for the tool; when given (and the file is
+            not too large) its findings are counted from the same read.
+            Parsing dominates the cost, so pass one only when a condition
+            reads the step's findings
+
+    Returns:
+        Dict with exists, lines (non-blank), size (bytes) and findings
+    """
+    path = Path(path) if path else None
+    if not path or not path.is_file():
+        return {key: value for key, value in EMPTY_METRICS.items() if key != 'status'}
+
+    size = path.stat().st_size
+    findings = 0
+    if parser is not None and size <= MAX_PARSE_BYTES:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            content = f.read()
+        lines = sum(1 for line in content.splitlines() if line.strip())
+        try:
+            findings = len(parser.parse(content).findings)
+        except Exception:
+            findings = 0
+    else:
+        with open(path, 'rb') as f:
+            lines = sum(1 for line in f if line.strip())
+
+    return {'exists': True, 'lines': lines, 'size': size, 'findings': findings}
+
+
+class Condition:
+    """A compiled condition; call it with {step name: metrics} to evaluate."""
+
+    def __init__(self, source: str, evaluate: Callable[[Dict[str, dict]], Any], reads: FrozenSet[Tuple[str, str]]):
+        self.source = source
+        self._evaluate = evaluate
+        self.reads = reads  # (step name, metric) pairs the condition reads
+        self.references = frozenset(step for step, _ in reads)  # Step names the condition reads
+
+    def __call__(self, metrics: Dict[str, dict]) -> bool:
+        """
+        Raises:
+            ValueError: If the values cannot be compared (e.g. text with a number)
+        """
+        try:
+            return bool(self._evaluate(metrics))
+        except TypeError as e:
+            raise ValueError(f"Cannot evaluate condition '{self.source}': {e}")
+
+    def __repr__(self) -> str:
+        return f"Condition({self.source!r})"
+
+
+def _compile(node: ast.AST, reads: set) -> Callable[[Dict[str, dict]], Any]:
+    if isinstance(node, ast.BoolOp):
+        parts = [_compile(value, reads) for value in node.values]
+        if isinstance(node.op, ast.And):
+            return lambda m: all(part(m) for part in parts)
+        return lambda m: any(part(m) for part in parts)
+
+    if isinstance(node, ast.UnaryOp):
+        if isinstance(node.op, ast.Not):
+            operand = _compile(node.operand, reads)
+            return lambda m: not operand(m)
+        if (isinstance(node.op, ast.USub) and isinstance(node.operand, ast.Constant)
+                and type(node.operand.value) in (int, float)):
+            value = -node.operand.value
+            return lambda m: value
+
+    elif isinstance(node, ast.Compare):
+        left = _compile(node.left, reads)
+        ops = [_COMPARISONS.get(type(op)) for op in node.ops]
+        if None in ops:
+            raise ValueError("Only ==, !=, <, <=, > and >= comparisons are supported")
+        rights = [_compile(comparator, reads) for comparator in node.comparators]
+
+        def compare(m):
+            value = left(m)
+            for op, right in zip(ops, rights):
+                other = right(m)
+                if not op(value, other):
+                    return False
+                value = other
+            return True
+        return compare
+
+    elif isinstance(node, ast.Constant):
+        if isinstance(node.value, (bool, int, float, str)):
+            value = node.value
+            return lambda m: value
+
+    elif isinstance(node, ast.Name):
+        if node.id in _BOOLEANS:
+            value = _BOOLEANS[node.id]
+            return lambda m: value
+        raise ValueError(f"Unknown name '{node.id}'; use <step>.<attribute>")
+
+    elif isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name):
+        step, attribute = node.value.id, node.attr
+        if attribute not in STEP_ATTRIBUTES:
+            raise ValueError(
+                f"Unknown step attribute '{attribute}'; use one of {', '.join(sorted(STEP_ATTRIBUTES))}"
+            )
+        key = STEP_ATTRIBUTES[attribute]
+        reads.add((step, key))
+        return lambda m: m.get(step, EMPTY_METRICS).get(key, EMPTY_METRICS[key])
+
+    raise ValueError(f"Unsupported expression: {ast.dump(node)[:60]}")
+
+
+@lru_cache(maxsize=256)
+def compile_condition(source: str) -> Condition:
+    """
+    Parse and compile a condition.
+
+    Supports step attributes (exists, count/lines, size/bytes, findings,
+    status), numbers, quoted strings, true/false, comparisons, and/or/not
+    and parentheses. Step names must be identifiers.
+
+    Raises:
+        ValueError: On a syntax error or an unsupported construct
+    """
+    try:
+        tree = ast.parse(source.strip(), mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"Invalid condition '{source}': {e.msg}")
+
+    reads: set = set()
+    try:
+        evaluate = _compile(tree.body, reads)
+    except ValueError as e:
+        raise ValueError(f"Invalid condition '{source}': {e}")
+    return Condition(source, evaluate, frozenset(reads))
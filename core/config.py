@@ -23,6 +23,14 @@ class Settings:
     show_timestamps: bool = True
     max_concurrent_scans: int = 3
     timeout_seconds: int = 3600
+    tool_concurrency: Dict[str, int] = field(default_factory=dict)
+    step_cache_enabled: bool = True
+    step_cache_max_mb: int = 1024
+    step_cache_ttl: Dict[str, int] = field(default_factory=dict)  # seconds per tool
+    schedule_target_concurrency: int = 1  # scheduled jobs at once per target network (0 = no limit)
+    schedule_project_concurrency: int = 0  # scheduled jobs at once per project (0 = no limit)
+    schedule_max_load: float = 0.0  # load average per CPU that holds back scheduled starts (0 = off)
+    schedule_max_memory_percent: float = 0.0  # host memory use that holds back scheduled starts (0 = off)
     api_keys: Dict[str, str] = field(default_factory=dict)
     
     @classmethod
@@ -38,6 +46,14 @@ class Settings:
             show_timestamps=data.get('show_timestamps', cls.show_timestamps),
             max_concurrent_scans=data.get('max_concurrent_scans', cls.max_concurrent_scans),
             timeout_seconds=data.get('timeout_seconds', cls.timeout_seconds),
+            tool_concurrency=data.get('tool_concurrency', {}),
+            step_cache_enabled=data.get('step_cache_enabled', cls.step_cache_enabled),
+            step_cache_max_mb=data.get('step_cache_max_mb', cls.step_cache_max_mb),
+            step_cache_ttl=data.get('step_cache_ttl', {}),
+            schedule_target_concurrency=data.get('schedule_target_concurrency', cls.schedule_target_concurrency),
+            schedule_project_concurrency=data.get('schedule_project_concurrency', cls.schedule_project_concurrency),
+            schedule_max_load=data.get('schedule_max_load', cls.schedule_max_load),
+            schedule_max_memory_percent=data.get('schedule_max_memory_percent', cls.schedule_max_memory_percent),
             api_keys=data.get('api_keys', {})
         )
     
@@ -53,6 +69,14 @@ class Settings:
             'show_timestamps': self.show_timestamps,
             'max_concurrent_scans': self.max_concurrent_scans,
             'timeout_seconds': self.timeout_seconds,
+            'tool_concurrency': self.tool_concurrency,
+            'step_cache_enabled': self.step_cache_enabled,
+            'step_cache_max_mb': self.step_cache_max_mb,
+            'step_cache_ttl': self.step_cache_ttl,
+            'schedule_target_concurrency': self.schedule_target_concurrency,
+            'schedule_project_concurrency': self.schedule_project_concurrency,
+            'schedule_max_load': self.schedule_max_load,
+            'schedule_max_memory_percent': self.schedule_max_memory_percent,
             'api_keys': self.api_keys
         }
 
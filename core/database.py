@@ -3,19 +3,27 @@ Database models for CyberToolkit workspace management.
 Uses SQLAlchemy ORM for SQLite/PostgreSQL support.
 """
 
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Dict, List, Optional
 from enum import Enum as PyEnum
 
 from sqlalchemy import (
-    create_engine, Column, Integer, String, Text, DateTime, 
-    ForeignKey, Boolean, Float, Enum, JSON
+    create_engine, event, Column, Integer, String, Text, DateTime, 
+    ForeignKey, Boolean, Float, Enum, JSON, Index, func, select
 )
-from sqlalchemy.orm import declarative_base, relationship, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.orm import column_property, declarative_base, relationship, sessionmaker
+from sqlalchemy.pool import QueuePool, StaticPool
 
 Base = declarative_base()
 
+# Sessions opened inside the current session_scope(), keyed by Database
+_scoped_sessions: ContextVar[Optional[Dict["Database", object]]] = ContextVar(
+    "cybertoolkit_scoped_sessions", default=None
+)
+
 
 class ScanStatus(PyEnum):
     """Status of a scan."""
@@ -77,14 +85,17 @@ class Project(Base):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
             "config": self.config,
-            "target_count": len(self.targets) if self.targets else 0,
-            "scan_count": len(self.scans) if self.scans else 0
+            "target_count": self.target_count or 0,
+            "scan_count": self.scan_count or 0
         }
 
 
 class Target(Base):
     """Target model - represents a scan target."""
     __tablename__ = "targets"
+    __table_args__ = (
+        Index("ix_targets_project_id", "project_id"),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
@@ -120,6 +131,12 @@ class Target(Base):
 class Scan(Base):
     """Scan model - represents a tool execution."""
     __tablename__ = "scans"
+    __table_args__ = (
+        Index("ix_scans_project_tool", "project_id", "tool"),
+        Index("ix_scans_project_status", "project_id", "status"),
+        Index("ix_scans_tool", "tool"),
+        Index("ix_scans_status", "status"),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
@@ -133,6 +150,8 @@ class Scan(Base):
     duration_seconds = Column(Float, default=0.0)
     error_message = Column(Text, default="")
     extra_data = Column(JSON, default=dict)
+    queued_at = Column(DateTime, nullable=True)  # set when queued for the scan runner
+    heartbeat_at = Column(DateTime, nullable=True)  # refreshed by the runner executing it
     
     # Relationships
     project = relationship("Project", back_populates="scans")
@@ -154,7 +173,7 @@ class Scan(Base):
             "started_at": self.started_at.isoformat() if self.started_at else None,
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
             "duration_seconds": self.duration_seconds,
-            "finding_count": len(self.findings) if self.findings else 0,
+            "finding_count": self.finding_count or 0,
             "extra_data": self.extra_data
         }
 
@@ -162,6 +181,11 @@ class Scan(Base):
 class Finding(Base):
     """Finding model - represents a discovered vulnerability or issue."""
     __tablename__ = "findings"
+    __table_args__ = (
+        Index("ix_findings_scan_severity_status", "scan_id", "severity", "status"),
+        Index("ix_findings_severity", "severity"),
+        Index("ix_findings_status", "status"),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     scan_id = Column(Integer, ForeignKey("scans.id"), nullable=False)
@@ -205,6 +229,9 @@ class Finding(Base):
 class Note(Base):
     """Note model - markdown notes attached to projects."""
     __tablename__ = "notes"
+    __table_args__ = (
+        Index("ix_notes_project_id", "project_id"),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
@@ -232,6 +259,9 @@ class Note(Base):
 class Session(Base):
     """Session model - stores session state for persistence."""
     __tablename__ = "sessions"
+    __table_args__ = (
+        Index("ix_sessions_name", "name"),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(255), default="default")
@@ -252,32 +282,117 @@ class Session(Base):
         }
 
 
+# Child counts are loaded as correlated subqueries with the parent row, so
+# to_dict() never has to load a relationship just to count it.
+Project.target_count = column_property(
+    select(func.count(Target.id))
+    .where(Target.project_id == Project.id)
+    .correlate_except(Target)
+    .scalar_subquery()
+)
+Project.scan_count = column_property(
+    select(func.count(Scan.id))
+    .where(Scan.project_id == Project.id)
+    .correlate_except(Scan)
+    .scalar_subquery()
+)
+Scan.finding_count = column_property(
+    select(func.count(Finding.id))
+    .where(Finding.scan_id == Scan.id)
+    .correlate_except(Finding)
+    .scalar_subquery()
+)
+
+
+@contextmanager
+def session_scope():
+    """
+    Run a unit of work (an API request, a scheduled job) on its own sessions.
+    
+    Inside the block every Database hands out a session private to this
+    scope; they are closed when the block exits. Scopes follow contextvars,
+    so they work for both threads and asyncio tasks.
+    """
+    sessions: Dict[Database, object] = {}
+    token = _scoped_sessions.set(sessions)
+    try:
+        yield
+    finally:
+        _scoped_sessions.reset(token)
+        for session in sessions.values():
+            session.close()
+
+
+def _is_sqlite_memory(db_url: str) -> bool:
+    return db_url in ("sqlite://", "sqlite:///") or ":memory:" in db_url
+
+
 class Database:
     """Database manager for CyberToolkit."""
     
-    def __init__(self, db_url: str = "sqlite:///workspace.db"):
+    def __init__(
+        self,
+        db_url: str = "sqlite:///workspace.db",
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        busy_timeout_ms: int = 5000
+    ):
         """
         Initialize database connection.
         
         Args:
             db_url: Database URL (default: SQLite file)
+            pool_size: Connections kept open in the pool
+            max_overflow: Extra connections allowed under load
+            busy_timeout_ms: How long SQLite waits on a locked database
         """
-        # For SQLite, use check_same_thread=False
-        if db_url.startswith("sqlite"):
+        if _is_sqlite_memory(db_url):
+            # An in-memory database exists per connection, so share one
             self.engine = create_engine(
                 db_url,
                 connect_args={"check_same_thread": False},
                 poolclass=StaticPool
             )
+        elif db_url.startswith("sqlite"):
+            self.engine = create_engine(
+                db_url,
+                connect_args={"check_same_thread": False},
+                poolclass=QueuePool,
+                pool_size=pool_size,
+                max_overflow=max_overflow
+            )
         else:
-            self.engine = create_engine(db_url)
+            self.engine = create_engine(
+                db_url,
+                poolclass=QueuePool,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_pre_ping=True
+            )
+        
+        if db_url.startswith("sqlite"):
+            event.listen(self.engine, "connect", self._sqlite_pragmas(busy_timeout_ms))
         
         self.SessionLocal = sessionmaker(bind=self.engine)
-        self._session = None
+        self._local = threading.local()
+    
+    @staticmethod
+    def _sqlite_pragmas(busy_timeout_ms: int):
+        """Build a connect hook enabling WAL so readers never block on the writer."""
+        def on_connect(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+            cursor.close()
+        return on_connect
     
     def create_tables(self):
-        """Create all database tables."""
+        """Create all database tables and apply pending migrations."""
+        from .migrations import run_migrations
+        
         Base.metadata.create_all(self.engine)
+        run_migrations(self.engine)
     
     def drop_tables(self):
         """Drop all database tables."""
@@ -285,16 +400,35 @@ class Database:
     
     @property
     def session(self):
-        """Get current session or create new one."""
-        if self._session is None:
-            self._session = self.SessionLocal()
-        return self._session
+        """
+        Get the session for the current unit of work.
+        
+        Inside session_scope() this is the scope's own session; otherwise
+        each thread gets a long-lived session of its own.
+        """
+        sessions = _scoped_sessions.get()
+        if sessions is not None:
+            session = sessions.get(self)
+            if session is None:
+                session = sessions[self] = self.SessionLocal()
+            return session
+        
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self.SessionLocal()
+        return session
     
     def close(self):
-        """Close current session."""
-        if self._session:
-            self._session.close()
-            self._session = None
+        """Close the current thread's session."""
+        session = getattr(self._local, "session", None)
+        if session is not None:
+            session.close()
+            self._local.session = None
+    
+    def dispose(self):
+        """Close the session and every pooled connection."""
+        self.close()
+        self.engine.dispose()
     
     def commit(self):
         """Commit current transaction."""
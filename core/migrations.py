@@ -0,0 +1,109 @@
+"""
+Lightweight schema migrations for CyberToolkit workspaces.
+Upgrades existing workspace databases in place; each migration runs once
+and is recorded in the schema_migrations table.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, List
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+
+
+_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(255), default=""),
+    Column("applied_at", DateTime),
+)
+
+
+@dataclass
+class Migration:
+    """A single schema upgrade step."""
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None]
+
+
+def _execute(*statements: str) -> Callable[[Connection], None]:
+    """Build an upgrade that runs fixed DDL statements in order."""
+    def upgrade(conn: Connection):
+        for statement in statements:
+            conn.execute(text(statement))
+    return upgrade
+
+
+def _add_columns(table: str, *columns: str) -> Callable[[Connection], None]:
+    """Build an upgrade that adds fixed "name TYPE" columns a table lacks."""
+    def upgrade(conn: Connection):
+        existing = {column["name"] for column in inspect(conn).get_columns(table)}
+        for column in columns:
+            if column.split()[0] not in existing:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column}"))
+    return upgrade
+
+
+# Append new migrations at the end; never renumber released ones, and never
+# change the DDL of a released one. Each checks for what it creates, so they are
+# safe on databases whose tables were created from the current models.
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Add lookup and composite indexes", _execute(
+        "CREATE INDEX IF NOT EXISTS ix_targets_project_id ON targets (project_id)",
+        "CREATE INDEX IF NOT EXISTS ix_scans_project_tool ON scans (project_id, tool)",
+        "CREATE INDEX IF NOT EXISTS ix_scans_project_status ON scans (project_id, status)",
+        "CREATE INDEX IF NOT EXISTS ix_scans_tool ON scans (tool)",
+        "CREATE INDEX IF NOT EXISTS ix_findings_scan_severity_status ON findings (scan_id, severity, status)",
+        "CREATE INDEX IF NOT EXISTS ix_findings_severity ON findings (severity)",
+        "CREATE INDEX IF NOT EXISTS ix_findings_status ON findings (status)",
+        "CREATE INDEX IF NOT EXISTS ix_notes_project_id ON notes (project_id)",
+        "CREATE INDEX IF NOT EXISTS ix_sessions_name ON sessions (name)",
+    )),
+    Migration(2, "Index scans by status for the scan queue", _execute(
+        "CREATE INDEX IF NOT EXISTS ix_scans_status ON scans (status)",
+    )),
+    Migration(3, "Track which scans the scan runner queued and is running", _add_columns(
+        "scans", "queued_at DATETIME", "heartbeat_at DATETIME"
+    )),
+]
+
+
+def get_schema_version(engine: Engine) -> int:
+    """Get the highest applied migration version (0 if none). Does not modify the database."""
+    if not inspect(engine).has_table(schema_migrations.name):
+        return 0
+    with engine.connect() as conn:
+        versions = conn.execute(select(schema_migrations.c.version)).scalars().all()
+    return max(versions, default=0)
+
+
+def run_migrations(engine: Engine) -> List[int]:
+    """
+    Apply pending migrations, each in its own transaction.
+
+    Returns:
+        Versions that were applied
+    """
+    _metadata.create_all(engine)
+    current = get_schema_version(engine)
+    applied = []
+
+    for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+        if migration.version <= current:
+            continue
+
+        with engine.begin() as conn:
+            migration.upgrade(conn)
+            conn.execute(schema_migrations.insert().values(
+                version=migration.version,
+                description=migration.description,
+                applied_at=datetime.now(timezone.utc)
+            ))
+        applied.append(migration.version)
+
+    return applied
@@ -0,0 +1,116 @@
+"""
+Keyset pagination for CyberToolkit list queries.
+Pages are addressed by an opaque cursor holding the sort value and id of
+the last row, so fetching page N costs the same as fetching page 1.
+"""
+
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import DateTime, and_, or_
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+@dataclass
+class Page:
+    """One page of results and the cursor for the next one."""
+    items: List[Any] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    limit: int = DEFAULT_PAGE_SIZE
+
+    def to_dict(self) -> dict:
+        return {
+            "items": [item.to_dict() for item in self.items],
+            "next_cursor": self.next_cursor,
+            "limit": self.limit
+        }
+
+
+def encode_cursor(sort: str, value: Any, row_id: int) -> str:
+    """Encode the position after a row as an opaque cursor."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([sort, value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    Decode a cursor into (sort, value, id).
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort, value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(row_id, int):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return sort, value, row_id
+
+
+def paginate(
+    query,
+    model,
+    sort_columns: Dict[str, Any],
+    sort: str = "id",
+    descending: bool = True,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None
+) -> Page:
+    """
+    Apply keyset pagination to a query.
+
+    Rows are ordered by (sort column, id) so ties on the sort column still
+    have a stable position.
+
+    Args:
+        query: Filtered SQLAlchemy query over `model`
+        model: Mapped class with an integer `id` primary key
+        sort_columns: Allowed sort names mapped to columns
+        sort: Sort name
+        descending: Newest/highest first
+        limit: Page size, capped at MAX_PAGE_SIZE
+        cursor: Cursor from a previous page
+
+    Raises:
+        ValueError: On an unknown sort or a cursor from a different sort
+    """
+    if sort not in sort_columns:
+        raise ValueError(f"Cannot sort by '{sort}'; use one of {sorted(sort_columns)}")
+
+    column = sort_columns[sort]
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    if cursor:
+        cursor_sort, value, last_id = decode_cursor(cursor)
+        if cursor_sort != sort:
+            raise ValueError(f"Cursor was issued for sort '{cursor_sort}', not '{sort}'")
+        if value is not None and isinstance(column.type, DateTime):
+            value = datetime.fromisoformat(value)
+
+        if column is model.id:
+            query = query.filter(model.id < last_id if descending else model.id > last_id)
+        elif descending:
+            query = query.filter(or_(column < value, and_(column == value, model.id < last_id)))
+        else:
+            query = query.filter(or_(column > value, and_(column == value, model.id > last_id)))
+
+    order = [model.id] if column is model.id else [column, model.id]
+    query = query.order_by(*(c.desc() if descending else c.asc() for c in order))
+
+    # One extra row tells us whether another page exists
+    rows = query.limit(limit + 1).all()
+    page = Page(items=rows[:limit], limit=limit)
+    if len(rows) > limit:
+        last = page.items[-1]
+        page.next_cursor = encode_cursor(sort, getattr(last, column.key), last.id)
+    return page
@@ -0,0 +1,236 @@
+"""
+Asynchronous process execution for CyberToolkit.
+Streams tool output line by line, enforces timeouts by killing the whole
+process group and records per-process resource usage.
+"""
+
+import asyncio
+import os
+import signal
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, IO, List, Optional, Union
+
+
+# Lines of stderr kept for error reporting
+STDERR_TAIL_LINES = 50
+
+# Seconds between resource usage samples
+SAMPLE_INTERVAL = 0.25
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+@dataclass
+class ProcessResult:
+    """Outcome and resource usage of one process run."""
+    returncode: Optional[int] = None
+    duration_seconds: float = 0.0
+    peak_rss_kb: Optional[int] = None
+    cpu_user_seconds: Optional[float] = None
+    cpu_system_seconds: Optional[float] = None
+    output_lines: int = 0
+    timed_out: bool = False
+    stderr_tail: str = ""
+
+    def to_dict(self) -> dict:
+        return {
+            'returncode': self.returncode,
+            'duration_seconds': round(self.duration_seconds, 3),
+            'peak_rss_kb': self.peak_rss_kb,
+            'cpu_user_seconds': self.cpu_user_seconds,
+            'cpu_system_seconds': self.cpu_system_seconds,
+            'output_lines': self.output_lines,
+            'timed_out': self.timed_out
+        }
+
+
+class LinePipe:
+    """
+    Bounded in-process pipe carrying one process's stdout lines to another's stdin.
+
+    The writer waits while the pipe is full, so a slow reader throttles a
+    fast writer instead of buffering its whole output. Once the reader has
+    gone away, writes are dropped rather than blocking forever.
+    """
+
+    def __init__(self, maxsize: int = 1000):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self._finished = False
+        self._reader_closed = False
+
+    async def write(self, line: str):
+        if not self._reader_closed and not self._finished:
+            await self._queue.put(line)
+
+    def finish(self):
+        """Mark the end of the stream; never blocks."""
+        self._finished = True
+        try:
+            self._queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass  # the reader notices once it has drained the queue
+
+    def close_reader(self):
+        """Stop accepting lines and release a writer blocked on a full pipe."""
+        self._reader_closed = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        while not (self._finished and self._queue.empty()):
+            line = await self._queue.get()
+            if line is None:
+                return
+            yield line
+
+
+def _sample_usage(pid: int, result: ProcessResult):
+    """
+    Update peak RSS and CPU time from /proc (Linux only).
+
+    VmHWM is the kernel's own high-water mark, so sampling only needs to
+    happen before the process exits; CPU time includes reaped children.
+    """
+    proc = Path(f"/proc/{pid}")
+    try:
+        for line in (proc / "status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                rss = int(line.split()[1])
+                result.peak_rss_kb = max(result.peak_rss_kb or 0, rss)
+                break
+
+        # Fields after the parenthesised command name; utime is field 14
+        fields = (proc / "stat").read_text().rsplit(")", 1)[1].split()
+        utime, stime, cutime, cstime = (int(v) for v in fields[11:15])
+        result.cpu_user_seconds = (utime + cutime) / _CLOCK_TICKS
+        result.cpu_system_seconds = (stime + cstime) / _CLOCK_TICKS
+    except (OSError, ValueError, IndexError):
+        pass
+
+
+def _kill_group(process: asyncio.subprocess.Process, sig: int):
+    """Signal the process and everything it spawned."""
+    try:
+        if sys.platform != "win32":
+            os.killpg(process.pid, sig)
+        elif sig == signal.SIGTERM:
+            process.terminate()
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def run_process(
+    argv: List[str],
+    stdin: Optional[Union[IO, int]] = None,
+    timeout: Optional[float] = None,
+    on_line: Optional[Callable[[str], Any]] = None,
+    kill_grace: float = 5.0,
+    cwd: Optional[Union[str, Path]] = None,
+    input_lines: Optional[AsyncIterator[str]] = None
+) -> ProcessResult:
+    """
+    Run a command without a shell, streaming its stdout.
+
+    Args:
+        argv: Program and arguments
+        stdin: File object or descriptor fed to the process
+        timeout: Seconds before the process group is terminated
+        on_line: Called with each stdout line (without the newline); may be
+            a coroutine function
+        kill_grace: Seconds between SIGTERM and SIGKILL on timeout
+        cwd: Working directory
+        input_lines: Lines written to the process's stdin as they arrive,
+            e.g. a LinePipe; replaces stdin
+
+    Returns:
+        ProcessResult with exit code, resource usage and stderr tail
+    """
+    result = ProcessResult()
+    started = time.monotonic()
+
+    if input_lines is not None:
+        stdin = asyncio.subprocess.PIPE
+    process = await asyncio.create_subprocess_exec(
+        *argv,
+        stdin=stdin if stdin is not None else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd,
+        # Own process group, so a timeout also stops the tool's children
+        start_new_session=sys.platform != "win32"
+    )
+
+    stderr_tail: deque = deque(maxlen=STDERR_TAIL_LINES)
+
+    async def read_stdout():
+        async for raw in process.stdout:
+            result.output_lines += 1
+            if on_line:
+                outcome = on_line(raw.decode(errors="replace").rstrip("\r\n"))
+                if asyncio.iscoroutine(outcome):
+                    await outcome
+        # Output closes as the process exits; take a last sample before reaping
+        _sample_usage(process.pid, result)
+
+    async def feed_stdin():
+        try:
+            async for line in input_lines:
+                process.stdin.write(line.encode() + b"\n")
+                await process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the process stopped reading
+        finally:
+            process.stdin.close()
+
+    async def read_stderr():
+        async for raw in process.stderr:
+            stderr_tail.append(raw.decode(errors="replace").rstrip("\r\n"))
+
+    async def sample():
+        while True:
+            _sample_usage(process.pid, result)
+            await asyncio.sleep(SAMPLE_INTERVAL)
+
+    sampler = asyncio.create_task(sample())
+    feeder = asyncio.create_task(feed_stdin()) if input_lines is not None else None
+    readers = asyncio.gather(read_stdout(), read_stderr())
+
+    try:
+        await asyncio.wait_for(asyncio.shield(readers), timeout)
+        # A tool can close its output and keep running; the timeout covers that too
+        remaining = None if timeout is None else max(0.0, timeout - (time.monotonic() - started))
+        await asyncio.wait_for(process.wait(), remaining)
+    except asyncio.TimeoutError:
+        result.timed_out = True
+        _kill_group(process, signal.SIGTERM)
+        try:
+            await asyncio.wait_for(process.wait(), kill_grace)
+        except asyncio.TimeoutError:
+            _kill_group(process, getattr(signal, "SIGKILL", signal.SIGTERM))
+            await process.wait()
+        readers.cancel()
+        try:
+            await readers
+        except (asyncio.CancelledError, Exception):
+            pass
+    except asyncio.CancelledError:
+        _kill_group(process, getattr(signal, "SIGKILL", signal.SIGTERM))
+        readers.cancel()
+        # Reap the process so nothing outlives the caller's event loop
+        await asyncio.gather(readers, process.wait(), return_exceptions=True)
+        raise
+    finally:
+        sampler.cancel()
+        if feeder:
+            feeder.cancel()
+        result.duration_seconds = time.monotonic() - started
+
+    result.returncode = process.returncode
+    result.stderr_tail = "\n".join(stderr_tail)
+    return result
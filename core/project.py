@@ -3,17 +3,24 @@ Project management service for CyberToolkit.
 Provides CRUD operations for projects, targets, scans, and findings.
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Callable, Dict, Iterator, List, Optional, Union
+
+from sqlalchemy import insert, select, update
 
 from .database import (
     Database, Project, Target, Scan, Finding, Note, Session,
     ScanStatus, FindingStatus, Severity
 )
+from .pagination import DEFAULT_PAGE_SIZE, Page, paginate
+from .stats import StatsService
 from .utils import validate_target
 
 
+_DB_SEVERITIES = {sev.value for sev in Severity}
+
+
 class ProjectManager:
     """Manages projects and workspace operations."""
     
@@ -29,6 +36,7 @@ class ProjectManager:
         
         self.db = Database(f"sqlite:///{db_path}")
         self.db.create_tables()
+        self.stats = StatsService(self.db)
     
     # ==================== Projects ====================
     
@@ -48,6 +56,7 @@ class ProjectManager:
         )
         self.db.session.add(project)
         self.db.commit()
+        self.stats.invalidate(project.id)
         return project
     
     def get_project(self, project_id: int) -> Optional[Project]:
@@ -98,6 +107,7 @@ class ProjectManager:
         
         self.db.session.delete(project)
         self.db.commit()
+        self.stats.invalidate(project_id)
         return True
     
     def archive_project(self, project_id: int) -> Optional[Project]:
@@ -128,6 +138,7 @@ class ProjectManager:
         )
         self.db.session.add(target)
         self.db.commit()
+        self.stats.invalidate(project_id)
         return target
     
     def add_targets_from_file(self, project_id: int, filepath: str) -> int:
@@ -160,6 +171,33 @@ class ProjectManager:
         
         return query.all()
     
+    def page_targets(
+        self,
+        project_id: int,
+        in_scope: Optional[bool] = None,
+        status: Optional[str] = None,
+        target_type: Optional[str] = None,
+        sort: str = "id",
+        descending: bool = True,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> Page:
+        """Get one keyset-paginated page of targets for a project."""
+        query = self.db.session.query(Target).filter(Target.project_id == project_id)
+        
+        if in_scope is not None:
+            query = query.filter(Target.in_scope == in_scope)
+        if status:
+            query = query.filter(Target.status == status)
+        if target_type:
+            query = query.filter(Target.type == target_type)
+        
+        return paginate(
+            query, Target,
+            {"id": Target.id, "created_at": Target.created_at, "value": Target.value},
+            sort=sort, descending=descending, limit=limit, cursor=cursor
+        )
+    
     def update_target(
         self,
         target_id: int,
@@ -191,8 +229,10 @@ class ProjectManager:
         if not target:
             return False
         
+        project_id = target.project_id
         self.db.session.delete(target)
         self.db.commit()
+        self.stats.invalidate(project_id)
         return True
     
     # ==================== Scans ====================
@@ -202,20 +242,39 @@ class ProjectManager:
         project_id: int,
         tool: str,
         command: str,
-        target_id: Optional[int] = None
+        target_id: Optional[int] = None,
+        queue: bool = False
     ) -> Scan:
-        """Create a new scan record."""
+        """
+        Create a new scan record.
+        
+        Args:
+            queue: Queue the scan for the scan runner; other pending scans
+                are only recorded
+        """
         scan = Scan(
             project_id=project_id,
             target_id=target_id,
             tool=tool,
             command=command,
-            status=ScanStatus.PENDING
+            status=ScanStatus.PENDING,
+            queued_at=datetime.utcnow() if queue else None
         )
         self.db.session.add(scan)
         self.db.commit()
+        self.stats.invalidate(project_id)
         return scan
     
+    def _scan_project_id(self, scan_id: int) -> Optional[int]:
+        """Project a scan belongs to, or None if there is no such scan."""
+        return self.db.session.execute(
+            select(Scan.project_id).where(Scan.id == scan_id)
+        ).scalar()
+    
+    def get_scan(self, scan_id: int) -> Optional[Scan]:
+        """Get scan by ID."""
+        return self.db.session.query(Scan).filter(Scan.id == scan_id).first()
+    
     def start_scan(self, scan_id: int) -> Optional[Scan]:
         """Mark scan as started."""
         scan = self.db.session.query(Scan).filter(Scan.id == scan_id).first()
@@ -225,6 +284,69 @@ class ProjectManager:
             self.db.commit()
         return scan
     
+    def claim_scan(self, scan_id: int) -> bool:
+        """
+        Atomically move a pending scan to running.
+        
+        Returns:
+            False if the scan was not pending (e.g. another worker claimed it)
+        """
+        result = self.db.session.execute(
+            update(Scan)
+            .where(Scan.id == scan_id, Scan.status == ScanStatus.PENDING)
+            .values(status=ScanStatus.RUNNING, started_at=datetime.utcnow(), heartbeat_at=datetime.utcnow())
+        )
+        self.db.commit()
+        return result.rowcount == 1
+    
+    def touch_scans(self, scan_ids: List[int]):
+        """Refresh the heartbeat of running scans, marking them as still owned."""
+        if not scan_ids:
+            return
+        self.db.session.execute(
+            update(Scan)
+            .where(Scan.id.in_(scan_ids), Scan.status == ScanStatus.RUNNING)
+            .values(heartbeat_at=datetime.utcnow())
+        )
+        self.db.commit()
+    
+    def get_pending_scans(
+        self,
+        exclude_tools: Optional[List[str]] = None,
+        limit: Optional[int] = None
+    ) -> List[Scan]:
+        """Get scans queued for the scan runner in submission order, the scan queue."""
+        query = self.db.session.query(Scan).filter(
+            Scan.status == ScanStatus.PENDING, Scan.queued_at.isnot(None)
+        )
+        if exclude_tools:
+            query = query.filter(Scan.tool.notin_(exclude_tools))
+        query = query.order_by(Scan.id)
+        if limit:
+            query = query.limit(limit)
+        return query.all()
+    
+    def requeue_interrupted_scans(self, stale_after: float) -> int:
+        """
+        Return runner scans whose heartbeat stopped to the queue.
+        
+        Only scans queued for the scan runner are considered, and only once
+        nobody has refreshed their heartbeat for stale_after seconds, so
+        scans another runner is still executing are left alone.
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=stale_after)
+        result = self.db.session.execute(
+            update(Scan)
+            .where(
+                Scan.status == ScanStatus.RUNNING,
+                Scan.queued_at.isnot(None),
+                Scan.heartbeat_at < cutoff
+            )
+            .values(status=ScanStatus.PENDING, started_at=None, heartbeat_at=None)
+        )
+        self.db.commit()
+        return result.rowcount
+    
     def complete_scan(
         self,
         scan_id: int,
@@ -261,6 +383,33 @@ class ProjectManager:
         
         return query.order_by(Scan.started_at.desc()).all()
     
+    def page_scans(
+        self,
+        project_id: int,
+        tool: Optional[str] = None,
+        status: Optional[ScanStatus] = None,
+        descending: bool = True,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> Page:
+        """
+        Get one keyset-paginated page of scans for a project.
+        
+        Scans are ordered by id, which follows creation order; started_at
+        is NULL for pending scans and cannot anchor a cursor.
+        """
+        query = self.db.session.query(Scan).filter(Scan.project_id == project_id)
+        
+        if tool:
+            query = query.filter(Scan.tool == tool)
+        if status:
+            query = query.filter(Scan.status == status)
+        
+        return paginate(
+            query, Scan, {"id": Scan.id},
+            descending=descending, limit=limit, cursor=cursor
+        )
+    
     # ==================== Findings ====================
     
     def add_finding(
@@ -291,8 +440,85 @@ class ProjectManager:
         )
         self.db.session.add(finding)
         self.db.commit()
+        self.stats.invalidate(self._scan_project_id(scan_id))
         return finding
     
+    def ingest_scan_result(
+        self,
+        scan_id: int,
+        result,
+        batch_size: int = 1000,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> int:
+        """
+        Bulk-insert the findings of a parsed ScanResult.
+        
+        Rows are written with a single executemany INSERT per batch and
+        committed batch by batch, instead of one ORM object and one
+        transaction per finding.
+        
+        Args:
+            scan_id: Scan the findings belong to
+            result: parsers.base.ScanResult to ingest
+            batch_size: Findings per INSERT/transaction
+            progress_callback: Called as (inserted, total) after each batch
+        
+        Returns:
+            Number of findings inserted
+        """
+        total = len(result.findings)
+        table = Finding.__table__
+        now = datetime.now(timezone.utc)
+        inserted = 0
+        batch = []
+        
+        for finding in result.findings:
+            batch.append(self._finding_row(scan_id, finding, now))
+            if len(batch) >= batch_size:
+                inserted += self._insert_batch(table, batch)
+                batch = []
+                if progress_callback:
+                    progress_callback(inserted, total)
+        
+        if batch:
+            inserted += self._insert_batch(table, batch)
+            if progress_callback:
+                progress_callback(inserted, total)
+        
+        self.stats.invalidate(self._scan_project_id(scan_id))
+        return inserted
+    
+    def _insert_batch(self, table, rows: List[dict]) -> int:
+        """Insert one batch of rows in its own transaction."""
+        try:
+            self.db.session.execute(insert(table), rows)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return len(rows)
+    
+    @staticmethod
+    def _finding_row(scan_id: int, finding, now: datetime) -> dict:
+        """Convert a parser Finding into a findings table row."""
+        severity = finding.severity.value
+        return {
+            "scan_id": scan_id,
+            "type": finding.type.value,
+            # The workspace schema has no "unknown" severity
+            "severity": Severity(severity) if severity in _DB_SEVERITIES else Severity.INFO,
+            "status": FindingStatus.OPEN,
+            "title": finding.title,
+            "description": finding.description,
+            "evidence": finding.evidence,
+            "remediation": finding.remediation,
+            "references": list(finding.references),
+            "tags": list(finding.tags),
+            "extra_data": dict(finding.metadata),
+            "created_at": now,
+            "updated_at": now
+        }
+    
     def get_findings(
         self,
         project_id: Optional[int] = None,
@@ -313,7 +539,108 @@ class ProjectManager:
         if status:
             query = query.filter(Finding.status == status)
         
-        return query.all()
+        return query.order_by(Finding.id).all()
+    
+    def iter_finding_rows(
+        self,
+        project_id: Optional[int] = None,
+        scan_id: Optional[int] = None,
+        severity: Optional[Severity] = None,
+        status: Optional[FindingStatus] = None,
+        batch_size: int = 1000
+    ) -> Iterator[dict]:
+        """
+        Stream findings as plain dicts in id order.
+        
+        Rows are fetched `batch_size` at a time from a cursor on a dedicated
+        connection, without building ORM objects, so memory stays flat no
+        matter how many findings the project has.
+        
+        Yields:
+            Dicts with the same keys as Finding.to_dict()
+        """
+        columns = Finding.__table__.c
+        query = select(*columns)
+        
+        if scan_id:
+            query = query.where(columns.scan_id == scan_id)
+        if project_id:
+            query = query.join(Scan.__table__, columns.scan_id == Scan.id).where(Scan.project_id == project_id)
+        if severity:
+            query = query.where(columns.severity == severity)
+        if status:
+            query = query.where(columns.status == status)
+        
+        query = query.order_by(columns.id)
+        
+        with self.db.engine.connect() as conn:
+            result = conn.execution_options(yield_per=batch_size).execute(query)
+            for row in result.mappings():
+                yield {
+                    "id": row["id"],
+                    "scan_id": row["scan_id"],
+                    "type": row["type"],
+                    "severity": row["severity"].value if row["severity"] else None,
+                    "status": row["status"].value if row["status"] else None,
+                    "title": row["title"],
+                    "description": row["description"],
+                    "evidence": row["evidence"],
+                    "remediation": row["remediation"],
+                    "references": row["references"],
+                    "tags": row["tags"],
+                    "extra_data": row["extra_data"],
+                    "created_at": row["created_at"].isoformat() if row["created_at"] else None
+                }
+    
+    def page_findings(
+        self,
+        project_id: Optional[int] = None,
+        scan_id: Optional[int] = None,
+        severity: Optional[Severity] = None,
+        status: Optional[FindingStatus] = None,
+        finding_type: Optional[str] = None,
+        search: Optional[str] = None,
+        sort: str = "id",
+        descending: bool = True,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> Page:
+        """
+        Get one keyset-paginated page of findings.
+        
+        Args:
+            project_id: Restrict to a project's scans
+            scan_id: Restrict to one scan
+            severity: Filter by severity
+            status: Filter by status
+            finding_type: Filter by finding type
+            search: Case-insensitive substring match on the title
+            sort: 'id' or 'created_at'
+            descending: Newest first
+            limit: Page size
+            cursor: next_cursor from the previous page
+        """
+        query = self.db.session.query(Finding)
+        
+        if scan_id:
+            query = query.filter(Finding.scan_id == scan_id)
+        if project_id:
+            query = query.join(Scan).filter(Scan.project_id == project_id)
+        
+        if severity:
+            query = query.filter(Finding.severity == severity)
+        if status:
+            query = query.filter(Finding.status == status)
+        if finding_type:
+            query = query.filter(Finding.type == finding_type)
+        if search:
+            query = query.filter(Finding.title.icontains(search, autoescape=True))
+        
+        return paginate(
+            query, Finding,
+            {"id": Finding.id, "created_at": Finding.created_at},
+            sort=sort, descending=descending, limit=limit, cursor=cursor
+        )
     
     def update_finding_status(
         self,
@@ -325,29 +652,16 @@ class ProjectManager:
         if finding:
             finding.status = status
             self.db.commit()
+            self.stats.invalidate(self._scan_project_id(finding.scan_id))
         return finding
     
     def get_finding_stats(self, project_id: int) -> dict:
         """Get finding statistics for a project."""
-        findings = self.get_findings(project_id=project_id)
-        
-        stats = {
-            "total": len(findings),
-            "by_severity": {},
-            "by_status": {},
-            "by_type": {}
-        }
-        
-        for sev in Severity:
-            stats["by_severity"][sev.value] = sum(1 for f in findings if f.severity == sev)
-        
-        for status in FindingStatus:
-            stats["by_status"][status.value] = sum(1 for f in findings if f.status == status)
-        
-        for finding in findings:
-            stats["by_type"][finding.type] = stats["by_type"].get(finding.type, 0) + 1
-        
-        return stats
+        return self.stats.get_finding_stats(project_id)
+    
+    def get_workspace_stats(self) -> dict:
+        """Get project, target, scan and finding totals for the workspace."""
+        return self.stats.get_workspace_stats()
     
     # ==================== Notes ====================
     
@@ -376,6 +690,26 @@ class ProjectManager:
             query = query.filter(Note.category == category)
         return query.order_by(Note.updated_at.desc()).all()
     
+    def page_notes(
+        self,
+        project_id: int,
+        category: Optional[str] = None,
+        sort: str = "updated_at",
+        descending: bool = True,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> Page:
+        """Get one keyset-paginated page of notes for a project."""
+        query = self.db.session.query(Note).filter(Note.project_id == project_id)
+        if category:
+            query = query.filter(Note.category == category)
+        
+        return paginate(
+            query, Note,
+            {"id": Note.id, "created_at": Note.created_at, "updated_at": Note.updated_at},
+            sort=sort, descending=descending, limit=limit, cursor=cursor
+        )
+    
     def update_note(
         self,
         note_id: int,
@@ -432,4 +766,4 @@ class ProjectManager:
     
     def close(self):
         """Close database connection."""
-        self.db.close()
+        self.db.dispose()
@@ -3,10 +3,12 @@ Reporting engine for CyberToolkit.
 Generates HTML and PDF reports from scan results.
 """
 
+import csv
+import io
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Union
 from string import Template
 
 from .database import Severity, FindingStatus
@@ -257,6 +259,68 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
 </html>'''
 
 
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+CSV_FIELDS = [
+    "id", "scan_id", "type", "severity", "status", "title", "description",
+    "evidence", "remediation", "references", "tags", "created_at"
+]
+
+# Spreadsheet apps evaluate cells starting with these characters as formulas
+_CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_cell(value) -> str:
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    if value is None:
+        return ""
+    value = str(value)
+    if value.startswith(_CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_ndjson(rows: Iterable[dict], chunk_rows: int = 500) -> Iterator[str]:
+    """Encode rows as newline-delimited JSON, yielding chunks of lines."""
+    chunk = []
+    first = True
+    for row in rows:
+        chunk.append(json.dumps(row))
+        # Flush the first row right away so clients see data immediately
+        if first or len(chunk) >= chunk_rows:
+            yield "\n".join(chunk) + "\n"
+            chunk = []
+            first = False
+    if chunk:
+        yield "\n".join(chunk) + "\n"
+
+
+def iter_csv(rows: Iterable[dict], chunk_rows: int = 500) -> Iterator[str]:
+    """Encode rows as CSV with a header line, yielding chunks of lines."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_FIELDS)
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+
+    pending = 0
+    for row in rows:
+        writer.writerow([_csv_cell(row.get(field)) for field in CSV_FIELDS])
+        pending += 1
+        if pending >= chunk_rows:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue()
+
+
 class ReportGenerator:
     """Generates security assessment reports."""
     
@@ -416,7 +480,7 @@ class ReportGenerator:
         rows = []
         for scan in scans:
             status_color = "var(--low)" if scan.status.value == "completed" else "var(--high)"
-            finding_count = len(scan.findings) if scan.findings else 0
+            finding_count = scan.finding_count or 0
             
             duration = f"{scan.duration_seconds:.1f}s" if scan.duration_seconds else "-"
             
@@ -469,6 +533,72 @@ class ReportGenerator:
         
         return str(output_path)
     
+    def stream_findings(
+        self,
+        project_id: int,
+        format: str = "ndjson",
+        severity: Optional[Severity] = None,
+        status: Optional[FindingStatus] = None
+    ) -> Iterator[str]:
+        """
+        Stream a project's findings as NDJSON or CSV text chunks.
+        
+        The project and format are checked up front; rows are then read
+        from the database only as the returned iterator is consumed.
+        
+        Args:
+            project_id: Project ID
+            format: 'ndjson' or 'csv'
+            severity: Only export this severity
+            status: Only export this status
+        
+        Returns:
+            Iterator of text chunks
+        """
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {format}")
+        if not self.pm.get_project(project_id):
+            raise ValueError(f"Project not found: {project_id}")
+        
+        rows = self.pm.iter_finding_rows(project_id=project_id, severity=severity, status=status)
+        return iter_csv(rows) if format == "csv" else iter_ndjson(rows)
+    
+    def export_findings(
+        self,
+        project_id: int,
+        format: str = "ndjson",
+        output_path: Optional[str] = None,
+        severity: Optional[Severity] = None,
+        status: Optional[FindingStatus] = None
+    ) -> str:
+        """
+        Export a project's findings to an NDJSON or CSV file without
+        holding them all in memory.
+        
+        Args:
+            project_id: Project ID
+            format: 'ndjson' or 'csv'
+            output_path: Output file path
+            severity: Only export this severity
+            status: Only export this status
+        
+        Returns:
+            Path to generated file
+        """
+        chunks = self.stream_findings(project_id, format=format, severity=severity, status=status)
+        
+        if output_path is None:
+            project = self.pm.get_project(project_id)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_path = self.reports_dir / f"findings_{project.name}_{timestamp}.{format}"
+        
+        output_path = Path(output_path)
+        with open(output_path, "w", encoding="utf-8", newline="") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        
+        return str(output_path)
+    
     def generate_markdown_report(self, project_id: int, output_path: Optional[str] = None) -> str:
         """
         Generate Markdown report for a project.
@@ -546,7 +676,7 @@ class ReportGenerator:
 """
         for scan in scans:
             duration = f"{scan.duration_seconds:.1f}s" if scan.duration_seconds else "-"
-            finding_count = len(scan.findings) if scan.findings else 0
+            finding_count = scan.finding_count or 0
             md += f"| {scan.tool} | {scan.status.value} | {duration} | {finding_count} |\n"
         
         # Save
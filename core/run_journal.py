@@ -0,0 +1,164 @@
+"""
+Run journal for workflow checkpointing.
+Each workflow run appends its progress to a JSON-lines file so an
+interrupted run can be resumed without repeating finished steps.
+"""
+
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .step_cache import file_digest
+
+
+class RunJournal:
+    """
+    Append-only record of one workflow run.
+
+    Records are flushed and fsynced as they are written, so the journal is
+    intact up to the last finished step even if the process is killed. The
+    newest record for a step wins when the journal is read back. Records may
+    be written from several threads at once.
+
+    Example:
+        journal = RunJournal.create(Path("results/runs"), workflow.to_dict(), "example.com")
+        journal.step_started("portscan")
+        journal.step_finished("portscan", "completed", "results/nmap.xml")
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open an existing journal.
+
+        Args:
+            path: Journal file
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    @property
+    def run_id(self) -> str:
+        return self.path.stem
+
+    @classmethod
+    def create(cls, runs_dir: Path, workflow: dict, target: str) -> 'RunJournal':
+        """Start the journal for a new run."""
+        runs_dir = Path(runs_dir)
+        runs_dir.mkdir(parents=True, exist_ok=True)
+        journal = cls(runs_dir / f"{uuid.uuid4().hex[:12]}.jsonl")
+        journal._append({'event': 'run_start', 'workflow': workflow, 'target': target})
+        return journal
+
+    @classmethod
+    def open(cls, runs_dir: Path, run_id: str) -> 'RunJournal':
+        """
+        Open the journal of an earlier run.
+
+        Raises:
+            FileNotFoundError: If there is no such run
+        """
+        if not run_id.isalnum():
+            raise FileNotFoundError(f"Unknown run: {run_id}")
+        path = Path(runs_dir) / f"{run_id}.jsonl"
+        if not path.exists():
+            raise FileNotFoundError(f"Unknown run: {run_id}")
+        return cls(path)
+
+    def _append(self, record: dict):
+        record['at'] = datetime.now().isoformat()
+        line = json.dumps(record) + "\n"
+        with self._lock, open(self.path, 'a') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def step_started(self, name: str):
+        self._append({'event': 'step_start', 'step': name})
+
+    def step_finished(
+        self,
+        name: str,
+        status: str,
+        output_file: str = "",
+        started_at: Optional[datetime] = None,
+        completed_at: Optional[datetime] = None,
+        error: str = "",
+        metrics: Optional[dict] = None
+    ):
+        """Record a step's final state, with a hash of its output for later validation."""
+        digest = None
+        if output_file and Path(output_file).is_file():
+            digest = file_digest(output_file)
+        self._append({
+            'event': 'step_finish',
+            'step': name,
+            'status': status,
+            'output': output_file,
+            'sha256': digest,
+            'started_at': started_at.isoformat() if started_at else None,
+            'completed_at': completed_at.isoformat() if completed_at else None,
+            'error': error,
+            'metrics': metrics or {}
+        })
+
+    def run_finished(self, status: str):
+        self._append({'event': 'run_finish', 'status': status})
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Read the journal back.
+
+        A torn final line (the process died mid-write) is ignored.
+
+        Returns:
+            Dict with workflow, target, status, steps (latest step_finish
+            record per step) and started (steps that started but never
+            finished)
+        """
+        records: List[dict] = []
+        with open(self.path, 'r') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+
+        state: Dict[str, Any] = {'workflow': None, 'target': '', 'status': None, 'steps': {}, 'started': set()}
+        for record in records:
+            event = record.get('event')
+            if event == 'run_start':
+                state['workflow'] = record['workflow']
+                state['target'] = record['target']
+            elif event == 'step_start':
+                state['started'].add(record['step'])
+            elif event == 'step_finish':
+                state['steps'][record['step']] = record
+                state['started'].discard(record['step'])
+            elif event == 'run_finish':
+                state['status'] = record['status']
+        return state
+
+    def valid_outputs(self) -> Dict[str, str]:
+        """
+        Steps that completed and whose output file is unchanged since.
+
+        Returns:
+            {step name: output file}
+        """
+        valid = {}
+        for name, record in self.load()['steps'].items():
+            if record['status'] != 'completed':
+                continue
+            output = record.get('output', '')
+            if not output or record.get('sha256') is None:
+                continue
+            try:
+                if file_digest(output) == record['sha256']:
+                    valid[name] = output
+            except OSError:
+                pass
+        return valid
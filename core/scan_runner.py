@@ -0,0 +1,374 @@
+"""
+Scan execution service for CyberToolkit.
+Runs queued scans from the scans table on a bounded worker pool, parses
+their output and ingests the findings.
+"""
+
+import logging
+import shlex
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from parsers.registry import ParserRegistry
+
+from .database import session_scope
+from .project import ProjectManager
+
+
+logger = logging.getLogger(__name__)
+
+# Characters of stderr kept in a failed scan's error message
+_ERROR_TAIL = 500
+
+
+@dataclass(frozen=True)
+class ToolPolicy:
+    """Command-line arguments a client may pass to a tool."""
+    options: Dict[str, bool]  # option -> whether it takes a value
+    output_args: Tuple[str, ...] = ()  # appended by the runner so the output can be parsed
+    positional: bool = False  # bare arguments (targets) are allowed
+    attached_values: bool = False  # short options may carry their value, e.g. -p80
+
+
+# Options that read or write files, load scripts or templates, or change the
+# output format are deliberately absent.
+TOOL_POLICIES: Dict[str, ToolPolicy] = {
+    "nmap": ToolPolicy(
+        options={
+            "-sS": False, "-sT": False, "-sU": False, "-sV": False, "-sC": False,
+            "-sn": False, "-Pn": False, "-n": False, "-O": False, "-A": False,
+            "-F": False, "-r": False, "-v": False, "-6": False,
+            "--open": False, "--reason": False, "--version-light": False, "--version-all": False,
+            "-p": True, "-T": True, "--top-ports": True, "--exclude": True,
+            "--min-rate": True, "--max-rate": True, "--max-retries": True,
+            "--host-timeout": True, "--version-intensity": True,
+        },
+        output_args=("-oX", "-"),
+        positional=True,
+        attached_values=True
+    ),
+    "nuclei": ToolPolicy(
+        options={
+            "-u": True, "-target": True, "-tags": True, "-etags": True,
+            "-s": True, "-severity": True, "-id": True, "-author": True,
+            "-rl": True, "-rate-limit": True, "-c": True, "-timeout": True, "-retries": True,
+            "-silent": False, "-nc": False,
+        },
+        output_args=("-jsonl",)
+    ),
+}
+
+
+class ScanRunner:
+    """
+    Bounded job runner for scans.
+
+    The queue is the scans table itself: scans created with queue=True are
+    claimed atomically in submission order, so a scan is never started twice
+    and queued scans survive a restart. While a scan runs, the runner
+    refreshes its heartbeat; a running scan whose heartbeat is older than
+    lease_seconds was interrupted, and is queued again.
+
+    Example:
+        runner = ScanRunner(pm, max_workers=4, tool_limits={"nmap": 2})
+        runner.start()
+        pm.create_scan(project_id, tool="nmap", command="nmap -sV 10.0.0.1", queue=True)
+        runner.notify()
+    """
+
+    def __init__(
+        self,
+        project_manager: ProjectManager,
+        max_workers: int = 3,
+        tool_limits: Optional[Dict[str, int]] = None,
+        allowed_tools: Optional[Iterable[str]] = None,
+        results_dir: Optional[Path] = None,
+        timeout: int = 3600,
+        poll_interval: float = 5.0,
+        on_update: Optional[Callable[[int, str, int], None]] = None,
+        registry: Optional[ParserRegistry] = None,
+        policies: Optional[Dict[str, ToolPolicy]] = None,
+        lease_seconds: float = 60.0
+    ):
+        """
+        Initialize ScanRunner.
+
+        Args:
+            project_manager: ProjectManager owning the scans table
+            max_workers: Scans running at once across all tools
+            tool_limits: Per-tool caps, e.g. {"nmap": 2}
+            allowed_tools: Tools the runner may execute (default: tools with a parser and a policy)
+            results_dir: Where raw tool output is stored
+            timeout: Seconds before a scan process is killed
+            poll_interval: Seconds between queue checks when not notified
+            on_update: Called as (scan_id, status, progress) on every change
+            registry: Parser registry used to parse tool output
+            policies: Allowed arguments per tool (default: TOOL_POLICIES)
+            lease_seconds: Seconds without a heartbeat before a running scan
+                is considered interrupted; must exceed poll_interval
+        """
+        if lease_seconds <= poll_interval:
+            raise ValueError("lease_seconds must be greater than poll_interval")
+        self.pm = project_manager
+        self.max_workers = max_workers
+        self.tool_limits = dict(tool_limits or {})
+        self.registry = registry or ParserRegistry()
+        self.policies = dict(TOOL_POLICIES if policies is None else policies)
+        if allowed_tools is not None:
+            self.allowed_tools = set(allowed_tools)
+        else:
+            self.allowed_tools = set(self.registry.list_parsers()) & set(self.policies)
+        self.results_dir = Path(results_dir) if results_dir else Path(__file__).parent.parent / "results"
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.on_update = on_update
+        self.lease_seconds = lease_seconds
+
+        self._running: Dict[int, str] = {}  # scan_id -> tool
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    # ==================== Lifecycle ====================
+
+    def start(self):
+        """Start the dispatcher thread."""
+        if self._thread:
+            return
+
+        self._stopping.clear()
+        self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="scan-worker")
+        self._thread = threading.Thread(target=self._dispatch_loop, name="scan-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = True):
+        """Stop dispatching; optionally wait for running scans to finish."""
+        self._stopping.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._executor:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def notify(self):
+        """Wake the dispatcher, e.g. after a scan was queued or a worker finished."""
+        self._wake.set()
+
+    @property
+    def running(self) -> Dict[int, str]:
+        """Scans currently executing, as {scan_id: tool}."""
+        with self._lock:
+            return dict(self._running)
+
+    # ==================== Validation ====================
+
+    def build_command(self, tool: str, command: str) -> List[str]:
+        """
+        Turn a scan's command line into an argv list.
+
+        The program must be the scan's tool, the tool must be allowed and
+        installed, and it is resolved through PATH; no shell is involved.
+        Every option must be in the tool's policy, and the policy's output
+        arguments are appended so the result can be parsed.
+
+        Raises:
+            ValueError: If the command cannot be run
+        """
+        if tool not in self.allowed_tools:
+            raise ValueError(f"Tool not allowed: {tool}")
+        policy = self.policies.get(tool)
+        if policy is None:
+            raise ValueError(f"No argument policy for tool: {tool}")
+
+        try:
+            parts = shlex.split(command)
+        except ValueError as e:
+            raise ValueError(f"Invalid command: {e}")
+
+        if not parts or Path(parts[0]).name != tool:
+            raise ValueError(f"Command must start with '{tool}'")
+
+        args = parts[1:]
+        self._check_args(tool, policy, args)
+
+        executable = shutil.which(tool)
+        if not executable:
+            raise ValueError(f"Tool not found: {tool}")
+
+        return [executable] + args + list(policy.output_args)
+
+    @staticmethod
+    def _check_args(tool: str, policy: ToolPolicy, args: List[str]):
+        """Raise ValueError for any argument the policy does not allow."""
+        i = 0
+        while i < len(args):
+            arg = args[i]
+            i += 1
+            if not arg.startswith("-"):
+                if not policy.positional:
+                    raise ValueError(f"Unexpected argument for {tool}: {arg}")
+                continue
+
+            if arg in policy.options:
+                if policy.options[arg]:
+                    if i >= len(args) or args[i].startswith("-"):
+                        raise ValueError(f"Option {arg} needs a value")
+                    i += 1
+                continue
+
+            name = arg.split("=", 1)[0]
+            if "=" in arg and policy.options.get(name):
+                continue
+            if policy.attached_values and policy.options.get(arg[:2]):
+                continue
+            raise ValueError(f"Option not allowed for {tool}: {arg}")
+
+    # ==================== Dispatching ====================
+
+    def _dispatch_loop(self):
+        while not self._stopping.is_set():
+            try:
+                self.renew_leases()
+                self.dispatch_pending()
+            except Exception:
+                # A transient database error must not kill the dispatcher
+                logger.exception("Scan dispatch failed")
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def _saturated_tools(self) -> List[str]:
+        counts: Dict[str, int] = {}
+        for tool in self._running.values():
+            counts[tool] = counts.get(tool, 0) + 1
+        return [tool for tool, limit in self.tool_limits.items() if counts.get(tool, 0) >= limit]
+
+    def renew_leases(self) -> int:
+        """
+        Refresh the heartbeat of this runner's scans and requeue interrupted ones.
+
+        Returns:
+            Number of scans queued again
+        """
+        with self._lock:
+            running = list(self._running)
+        with session_scope():
+            self.pm.touch_scans(running)
+            return self.pm.requeue_interrupted_scans(stale_after=self.lease_seconds)
+
+    def dispatch_pending(self) -> List[int]:
+        """
+        Claim and submit as many pending scans as capacity allows.
+
+        Returns:
+            IDs of the scans that were started
+        """
+        if not self._executor:
+            raise RuntimeError("ScanRunner is not started")
+
+        started = []
+        with session_scope():
+            while not self._stopping.is_set():
+                with self._lock:
+                    free = self.max_workers - len(self._running)
+                    saturated = self._saturated_tools()
+                if free <= 0:
+                    break
+
+                pending = self.pm.get_pending_scans(exclude_tools=saturated, limit=free)
+                if not pending:
+                    break
+
+                for scan in pending:
+                    scan_id, tool = scan.id, scan.tool
+                    with self._lock:
+                        if tool in self._saturated_tools():
+                            continue
+                    claimed = self.pm.claim_scan(scan_id)
+                    if not claimed:
+                        continue
+                    with self._lock:
+                        self._running[scan_id] = tool
+                    self._executor.submit(self._run_scan, scan_id)
+                    started.append(scan_id)
+                    break  # re-check capacity before claiming the next one
+
+        return started
+
+    # ==================== Execution ====================
+
+    def _update(self, scan_id: int, status: str, progress: int):
+        if self.on_update:
+            try:
+                self.on_update(scan_id, status, progress)
+            except Exception:
+                logger.exception("Scan update callback failed for scan %s", scan_id)
+
+    def _run_scan(self, scan_id: int):
+        try:
+            with session_scope():
+                self._execute(scan_id)
+        finally:
+            with self._lock:
+                self._running.pop(scan_id, None)
+            self.notify()
+
+    def _execute(self, scan_id: int):
+        scan = self.pm.get_scan(scan_id)
+        tool, command = scan.tool, scan.command
+        self._update(scan_id, "running", 0)
+
+        output_path = self.results_dir / f"scan_{scan_id}_{tool}.out"
+        try:
+            argv = self.build_command(tool, command)
+            with open(output_path, "wb") as out:
+                process = subprocess.run(
+                    argv,
+                    stdout=out,
+                    stderr=subprocess.PIPE,
+                    timeout=self.timeout
+                )
+            if process.returncode != 0:
+                stderr = process.stderr.decode(errors="replace").strip()
+                raise RuntimeError(f"{tool} exited with code {process.returncode}: {stderr[-_ERROR_TAIL:]}")
+
+            self._update(scan_id, "running", 50)
+            self._ingest(scan_id, tool, output_path)
+
+        except subprocess.TimeoutExpired:
+            self.pm.complete_scan(scan_id, result_path=str(output_path), error=f"Timed out after {self.timeout}s")
+            self._update(scan_id, "failed", 100)
+        except Exception as e:
+            self.pm.complete_scan(scan_id, result_path=str(output_path), error=str(e) or type(e).__name__)
+            self._update(scan_id, "failed", 100)
+        else:
+            self.pm.complete_scan(scan_id, result_path=str(output_path))
+            self._update(scan_id, "completed", 100)
+
+    def _ingest(self, scan_id: int, tool: str, output_path: Path):
+        """Parse the tool output, if a parser exists, and store its findings."""
+        parser_cls = self.registry.get_parser(tool)
+        if parser_cls is None or output_path.stat().st_size == 0:
+            return
+
+        parser = parser_cls()
+        result = parser.parse_file(output_path)
+        if result.status == "failed" and not result.findings:
+            errors = "; ".join(parser.get_errors()) or "unknown error"
+            raise RuntimeError(f"Could not parse {tool} output: {errors}")
+
+        self.pm.ingest_scan_result(
+            scan_id, result,
+            progress_callback=lambda done, total: self._update(
+                scan_id, "running", 50 + 49 * done // max(total, 1)
+            )
+        )
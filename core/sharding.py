@@ -0,0 +1,255 @@
+"""
+Sharded target fan-out for workflows.
+Splits CIDR ranges and large target files into chunks, runs a workflow over
+the chunks with bounded concurrency and merges the per-shard results.
+"""
+
+import asyncio
+import ipaddress
+import threading
+import uuid
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Union
+
+from parsers.base import ScanResult
+from parsers.registry import ParserRegistry
+
+from .utils import validate_target
+from .workflow import Workflow, WorkflowEngine
+
+
+DEFAULT_SHARD_SIZE = 256
+DEFAULT_CONCURRENCY = 4
+
+
+def shard_network(cidr: str, shard_size: int = DEFAULT_SHARD_SIZE) -> Iterator[str]:
+    """
+    Split a network into equal subnets of at least shard_size addresses.
+
+    Subnets are generated lazily, so a /12 (or an IPv6 /64) costs nothing
+    until its shards are consumed. shard_size is rounded up to a power of two.
+
+    Raises:
+        ValueError: If cidr is not a valid network
+    """
+    network = ipaddress.ip_network(cidr, strict=False)
+    host_bits = max(0, (max(1, shard_size) - 1).bit_length())
+    prefix = max(network.prefixlen, network.max_prefixlen - host_bits)
+    for subnet in network.subnets(new_prefix=prefix):
+        yield str(subnet)
+
+
+def iter_target_lines(path: Union[str, Path]) -> Iterator[str]:
+    """Yield targets from a file one line at a time, skipping blanks and comments."""
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line
+
+
+def shard_lines(
+    lines: Iterable[str],
+    shard_size: int,
+    shards_dir: Path
+) -> Iterator[Path]:
+    """
+    Write consecutive chunks of shard_size lines to files, yielding each path.
+
+    Each file is written only when the previous one has been consumed, so
+    at most one chunk is in memory.
+    """
+    shards_dir = Path(shards_dir)
+    shards_dir.mkdir(parents=True, exist_ok=True)
+    index = 0
+    chunk: List[str] = []
+
+    def flush() -> Path:
+        path = shards_dir / f"shard_{index:06d}.txt"
+        path.write_text("\n".join(chunk) + "\n")
+        return path
+
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= shard_size:
+            yield flush()
+            index += 1
+            chunk = []
+    if chunk:
+        yield flush()
+
+
+def iter_shards(
+    source: Union[str, Path],
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    shards_dir: Optional[Path] = None
+) -> Iterator[str]:
+    """
+    Shards for a workflow target source.
+
+    Args:
+        source: CIDR range, path to a target file, or a single target
+        shard_size: Addresses (CIDR) or lines (file) per shard
+        shards_dir: Where target file shards are written
+
+    Yields:
+        A subnet in CIDR notation, the path of a shard file, or the target itself
+    """
+    source = str(source)
+    is_valid, target_type, _ = validate_target(source)
+    if is_valid and target_type == "cidr":
+        yield from shard_network(source, shard_size)
+    elif Path(source).is_file():
+        if shards_dir is None:
+            raise ValueError("shards_dir is required to shard a target file")
+        for path in shard_lines(iter_target_lines(source), shard_size, shards_dir):
+            yield str(path)
+    else:
+        yield source
+
+
+def merge_scan_results(results: Iterable[ScanResult], tool: str, target: str) -> ScanResult:
+    """
+    Combine per-shard results into one.
+
+    Findings and hosts are concatenated; the status is 'completed' if every
+    shard completed, 'failed' if none did and 'partial' otherwise.
+    """
+    merged = ScanResult(tool=tool, target=target)
+    merged.metadata['shards'] = []
+    statuses = set()
+    for result in results:
+        merged.findings.extend(result.findings)
+        merged.hosts.extend(result.hosts)
+        merged.duration_seconds = max(merged.duration_seconds, result.duration_seconds)
+        merged.metadata['shards'].append({
+            'target': result.target,
+            'status': result.status,
+            'run_id': result.metadata.get('run_id'),
+            'findings': len(result.findings)
+        })
+        statuses.add(result.status)
+
+    if statuses <= {'completed'}:
+        merged.status = 'completed'
+    elif 'completed' not in statuses:
+        merged.status = 'failed'
+    else:
+        merged.status = 'partial'
+    return merged
+
+
+def _shard_result(results: dict, registry: ParserRegistry, lock: threading.Lock) -> ScanResult:
+    """ScanResult for one shard run, with findings parsed from its step outputs."""
+    result = ScanResult(
+        tool=results['workflow'],
+        target=results['target'],
+        status=results['status'],
+        duration_seconds=results['duration_seconds']
+    )
+    result.metadata['run_id'] = results['run_id']
+    for step in results['steps']:
+        if step['status'] != 'completed' or not step['output'] or not Path(step['output']).is_file():
+            continue
+        with lock:  # the registry keeps per-call error state
+            parsed = registry.parse_file(step['output'])
+        if parsed:
+            result.findings.extend(parsed.findings)
+            result.hosts.extend(parsed.hosts)
+    return result
+
+
+def _targets_file(shard: str, shards_dir: Path, index: int) -> Path:
+    """The shard's own file for target file shards, else a one-line file listing it."""
+    path = Path(shard)
+    if path.parent == shards_dir and path.is_file():
+        return path
+    shards_dir.mkdir(parents=True, exist_ok=True)
+    path = shards_dir / f"target_{index:06d}.txt"
+    path.write_text(shard + "\n")
+    return path
+
+
+async def execute_sharded(
+    engine: WorkflowEngine,
+    workflow: Workflow,
+    source: Union[str, Path],
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    registry: Optional[ParserRegistry] = None
+) -> ScanResult:
+    """
+    Run a workflow over every shard of a target source.
+
+    Shards are pulled from the generator only as workers free up, so
+    neither the target list nor the set of pending runs grows with the
+    size of the range. Each shard runs on a fork of the engine with its own
+    results directory and two variables:
+
+        ${TARGETS_FILE}  a file listing the shard's targets, one per line,
+                         for list options such as nuclei -l or nmap -iL
+        ${TARGET}        the subnet or single target, for options such as
+                         nuclei -u; for a target file source it is the
+                         shard file path, so use ${TARGETS_FILE} there
+
+    Args:
+        engine: Engine whose settings, cache and callbacks are used
+        workflow: Workflow to run per shard
+        source: CIDR range, target file or single target
+        shard_size: Addresses or lines per shard
+        concurrency: Shards running at once
+        registry: Parsers used to read findings from step outputs
+
+    Returns:
+        Merged ScanResult across all shards
+    """
+    registry = registry or ParserRegistry()
+    parse_lock = threading.Lock()
+    run_dir = engine.results_dir / "shards" / uuid.uuid4().hex[:12]
+    shards = iter_shards(source, shard_size, run_dir / "targets")
+    definition = workflow.to_dict()
+    results: List[ScanResult] = []
+
+    async def run_shard(index: int, shard: str) -> ScanResult:
+        shard_engine = engine.fork(run_dir / f"{index:06d}")
+        try:
+            shard_workflow = Workflow.from_dict(definition)
+            shard_workflow.variables['TARGETS_FILE'] = str(_targets_file(shard, run_dir / "targets", index))
+            outcome = await shard_engine.execute_async(shard_workflow, shard)
+            # Parsing large outputs is CPU-bound; keep it off the event loop
+            result = await asyncio.to_thread(_shard_result, outcome, registry, parse_lock)
+        except Exception as e:
+            result = ScanResult(tool=workflow.name, target=shard, status='failed')
+            result.metadata['error'] = str(e)
+        result.metadata['shard'] = index
+        return result
+
+    running = set()
+    for index, shard in enumerate(shards):
+        if len(running) >= max(1, concurrency):
+            finished, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            results.extend(task.result() for task in finished)
+        running.add(asyncio.create_task(run_shard(index, shard)))
+
+    if running:
+        finished, _ = await asyncio.wait(running)
+        results.extend(task.result() for task in finished)
+
+    results.sort(key=lambda result: result.metadata['shard'])
+    return merge_scan_results(results, workflow.name, str(source))
+
+
+def run_sharded(
+    engine: WorkflowEngine,
+    workflow: Workflow,
+    source: Union[str, Path],
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    registry: Optional[ParserRegistry] = None
+) -> ScanResult:
+    """
+    Run a workflow over every shard of a target source, blocking until it finishes.
+
+    Thin wrapper around execute_sharded(); coroutines should await that instead.
+    """
+    return asyncio.run(execute_sharded(engine, workflow, source, shard_size, concurrency, registry))
@@ -0,0 +1,116 @@
+"""
+Statistics service for CyberToolkit workspaces.
+Computes dashboard counts with SQL aggregates and caches them until invalidated.
+"""
+
+import copy
+import threading
+import time
+from typing import Dict, Hashable, Optional
+
+from sqlalchemy import func, select
+
+from .database import Database, Project, Target, Scan, Finding, FindingStatus, Severity
+
+
+class StatsService:
+    """Aggregated workspace and project statistics with invalidation."""
+
+    def __init__(self, db: Database, ttl: float = 30.0):
+        """
+        Initialize StatsService.
+
+        Args:
+            db: Database to query
+            ttl: Seconds a cached value stays valid even without invalidation,
+                so writes from other processes are picked up eventually
+        """
+        self.db = db
+        self.ttl = ttl
+        self._cache: Dict[Hashable, tuple] = {}
+        self._lock = threading.Lock()
+        self._generation = 0  # bumped by every invalidate()
+
+    def _cached(self, key: Hashable, compute):
+        """
+        Return a copy of a cached value, or compute and store it.
+
+        A value computed while an invalidation happened may predate the
+        write, so it is returned but not cached.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry and now - entry[0] < self.ttl:
+                return copy.deepcopy(entry[1])
+            generation = self._generation
+
+        value = compute()
+        with self._lock:
+            if generation == self._generation:
+                self._cache[key] = (now, value)
+        return copy.deepcopy(value)
+
+    def invalidate(self, project_id: Optional[int] = None):
+        """
+        Drop cached statistics after a write.
+
+        Args:
+            project_id: Project whose stats changed; None clears everything
+        """
+        with self._lock:
+            self._generation += 1
+            if project_id is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(("project", project_id), None)
+                self._cache.pop(("workspace",), None)
+
+    def get_workspace_stats(self) -> dict:
+        """Get workspace-wide totals in a single query."""
+        return self._cached(("workspace",), self._compute_workspace_stats)
+
+    def _compute_workspace_stats(self) -> dict:
+        query = select(
+            select(func.count(Project.id)).scalar_subquery(),
+            select(func.count(Target.id)).scalar_subquery(),
+            select(func.count(Scan.id)).scalar_subquery(),
+            select(func.count(Finding.id)).scalar_subquery()
+        )
+        projects, targets, scans, findings = self.db.session.execute(query).one()
+
+        return {
+            "total_projects": projects,
+            "total_targets": targets,
+            "total_scans": scans,
+            "total_findings": findings
+        }
+
+    def get_finding_stats(self, project_id: int) -> dict:
+        """Get finding counts by severity, status and type for a project."""
+        return self._cached(("project", project_id), lambda: self._compute_finding_stats(project_id))
+
+    def _compute_finding_stats(self, project_id: int) -> dict:
+        query = (
+            select(Finding.severity, Finding.status, Finding.type, func.count(Finding.id))
+            .join(Scan, Finding.scan_id == Scan.id)
+            .where(Scan.project_id == project_id)
+            .group_by(Finding.severity, Finding.status, Finding.type)
+        )
+
+        stats = {
+            "total": 0,
+            "by_severity": {sev.value: 0 for sev in Severity},
+            "by_status": {status.value: 0 for status in FindingStatus},
+            "by_type": {}
+        }
+
+        for severity, status, finding_type, count in self.db.session.execute(query):
+            stats["total"] += count
+            if severity is not None:
+                stats["by_severity"][severity.value] += count
+            if status is not None:
+                stats["by_status"][status.value] += count
+            stats["by_type"][finding_type] = stats["by_type"].get(finding_type, 0) + count
+
+        return stats
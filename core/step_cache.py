@@ -0,0 +1,236 @@
+"""
+Content-addressed result cache for workflow steps.
+Identical tool runs (same tool build, flags and input contents) reuse the
+previous output file instead of running the tool again.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+
+# Seconds a cached result stays fresh, per tool
+DEFAULT_TTLS = {
+    'subfinder': 6 * 3600,
+    'httpx': 3600,
+    'nuclei': 6 * 3600,
+    'nmap': 12 * 3600,
+}
+DEFAULT_TTL = 3600
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    """SHA-256 of a file's contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def unshare(path: Union[str, Path]):
+    """
+    Remove a file that is hard-linked into the cache.
+
+    Tools truncate their output file in place, which would otherwise
+    overwrite the cached copy too.
+    """
+    try:
+        if os.stat(path).st_nlink > 1:
+            os.unlink(path)
+    except OSError:
+        pass
+
+
+class StepCache:
+    """
+    Cache of step output files keyed on (tool build, flags, input hash).
+
+    Objects live under `<cache_dir>/objects` and are hard-linked into place
+    on a hit (copied where links are unsupported). The index tracks size and
+    last use so the least recently used results are evicted once the cache
+    outgrows max_bytes. Methods may be called from several threads at once.
+
+    Example:
+        cache = StepCache(Path("results/.step_cache"), ttls={"nmap": 3600})
+        key = cache.key("nmap", "-sV -F example.com")
+        if not cache.fetch(key, "results/nmap.xml"):
+            ...  # run nmap
+            cache.store(key, "nmap", "results/nmap.xml")
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttls: Optional[Dict[str, int]] = None,
+        default_ttl: int = DEFAULT_TTL
+    ):
+        """
+        Initialize StepCache.
+
+        Args:
+            cache_dir: Directory holding the index and cached objects
+            max_bytes: Total size the cache is trimmed back to
+            ttls: Per-tool freshness in seconds, merged over DEFAULT_TTLS
+            default_ttl: Freshness for tools without their own TTL
+        """
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.cache_dir / "index.json"
+        self.max_bytes = max_bytes
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self._index: Dict[str, dict] = self._load_index()
+        self._builds: Dict[str, tuple] = {}  # executable -> (stat signature, digest)
+        self._lock = threading.Lock()  # guards the index and its file
+
+    def _load_index(self) -> Dict[str, dict]:
+        try:
+            with open(self.index_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        tmp = self.index_path.with_suffix(".tmp")
+        with open(tmp, 'w') as f:
+            json.dump(self._index, f)
+        os.replace(tmp, self.index_path)
+
+    def tool_build(self, tool: str) -> Optional[str]:
+        """
+        Fingerprint of the installed tool binary.
+
+        Stands in for the tool's version: hashing the executable changes
+        whenever the tool is upgraded, without running it. The digest is
+        recomputed only when the file's size or mtime changes.
+        """
+        executable = shutil.which(tool)
+        if not executable:
+            return None
+        stat = os.stat(executable)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        cached = self._builds.get(executable)
+        if cached and cached[0] == signature:
+            return cached[1]
+        digest = file_digest(executable)
+        self._builds[executable] = (signature, digest)
+        return digest
+
+    def ttl(self, tool: str) -> int:
+        return self.ttls.get(tool, self.default_ttl)
+
+    def key(self, tool: str, flags: str, input_file: str = "") -> Optional[str]:
+        """
+        Cache key for a step, or None if it cannot be cached.
+
+        Args:
+            tool: Tool name
+            flags: Flags with variables already resolved
+            input_file: Input the tool reads; hashed by contents, not path
+        """
+        build = self.tool_build(tool)
+        if build is None:
+            return None
+        input_hash = ""
+        if input_file:
+            try:
+                input_hash = file_digest(input_file)
+            except OSError:
+                return None
+        raw = json.dumps([tool, build, flags, input_hash])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def fetch(self, key: str, output_file: Union[str, Path]) -> bool:
+        """
+        Put a fresh cached result at output_file.
+
+        Returns:
+            True on a hit
+        """
+        with self._lock:
+            entry = self._index.get(key)
+            if not entry:
+                return False
+            obj = self.objects_dir / key
+            if time.time() - entry['created_at'] > self.ttl(entry['tool']) or not obj.exists():
+                self._drop(key)
+                self._save_index()
+                return False
+
+            output_file = Path(output_file)
+            output_file.parent.mkdir(parents=True, exist_ok=True)
+            if output_file.exists() or output_file.is_symlink():
+                output_file.unlink()
+            try:
+                os.link(obj, output_file)
+            except OSError:
+                shutil.copy2(obj, output_file)
+
+            entry['last_used'] = time.time()
+            self._save_index()
+            return True
+
+    def store(self, key: str, tool: str, output_file: Union[str, Path]):
+        """Add a finished step's output file to the cache, then evict to size."""
+        with self._lock:
+            output_file = Path(output_file)
+            if not output_file.is_file():
+                return
+            obj = self.objects_dir / key
+            if obj.exists():
+                obj.unlink()
+            try:
+                os.link(output_file, obj)
+            except OSError:
+                shutil.copy2(output_file, obj)
+
+            now = time.time()
+            self._index[key] = {
+                'tool': tool,
+                'size': obj.stat().st_size,
+                'created_at': now,
+                'last_used': now
+            }
+            self._evict()
+            self._save_index()
+
+    def _drop(self, key: str):
+        self._index.pop(key, None)
+        try:
+            (self.objects_dir / key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def evict(self):
+        """Drop expired results, then least recently used ones until under max_bytes."""
+        with self._lock:
+            self._evict()
+
+    def _evict(self):
+        now = time.time()
+        for key, entry in list(self._index.items()):
+            if now - entry['created_at'] > self.ttl(entry['tool']):
+                self._drop(key)
+
+        total = sum(entry['size'] for entry in self._index.values())
+        for key, entry in sorted(self._index.items(), key=lambda item: item[1]['last_used']):
+            if total <= self.max_bytes:
+                break
+            total -= entry['size']
+            self._drop(key)
+
+    @property
+    def size(self) -> int:
+        """Bytes held by cached results."""
+        with self._lock:
+            return sum(entry['size'] for entry in self._index.values())
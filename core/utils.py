@@ -56,6 +56,9 @@ def parse_cidr(cidr: str) -> List[str]:
     """
     Parse CIDR notation and return list of IP addresses.
     
+    Limited to 65536 addresses; use core.sharding.shard_network to split
+    larger ranges lazily.
+    
     Args:
         cidr: CIDR notation string (e.g., '192.168.1.0/24')
     
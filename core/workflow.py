@@ -3,23 +3,61 @@ Workflow engine for CyberToolkit.
 Enables tool chaining and automated multi-step workflows.
 """
 
+import asyncio
 import json
 import shlex
-import subprocess
 import shutil
 import yaml
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Union
 from datetime import datetime
 from enum import Enum
 
 from parsers.base import ScanResult
+from parsers.registry import ParserRegistry
 
+from .conditions import EMPTY_METRICS, compile_condition, output_metrics
 from .enterprise import AuditAction, AuditLogger
+from .process import LinePipe, run_process
+from .run_journal import RunJournal
+from .step_cache import StepCache, unshare
 from .utils import format_timestamp, sanitize_filename
 
 
+# What happens to the rest of the workflow when a step fails:
+#   stop     - steps depending on it are skipped, other branches carry on
+#   continue - steps depending on it run anyway
+#   abort    - every remaining step is cancelled
+FAILURE_POLICIES = ("stop", "continue", "abort")
+
+# Tools that read their targets from stdin rather than -iL
+STDIN_TOOLS = ('httpx', 'nuclei')
+
+
+def _nmap_resume(args: List[str]) -> Optional[List[str]]:
+    """nmap can only resume from its own normal or grepable log."""
+    for i, arg in enumerate(args[:-1]):
+        if arg in ('-oN', '-oG'):
+            return ['nmap', '--resume', args[i + 1]]
+        if arg == '-oA':
+            return ['nmap', '--resume', args[i + 1] + '.gnmap']
+    return None
+
+
+# Tools that can pick up an interrupted run: tool -> flags -> resume command
+NATIVE_RESUME: Dict[str, Callable[[List[str]], Optional[List[str]]]] = {
+    'nmap': _nmap_resume,
+}
+
+
+def step_reference(input_source: str) -> Optional[str]:
+    """Return the step named by a `$step` input source, or None for a path or ${VAR}."""
+    if input_source.startswith('$') and not input_source.startswith('${'):
+        return input_source[1:]
+    return None
+
+
 class StepStatus(Enum):
     """Status of a workflow step."""
     PENDING = "pending"
@@ -39,12 +77,28 @@ class WorkflowStep:
     output_file: str = ""
     condition: str = ""  # Optional condition for execution
     timeout: int = 3600
-    parallel: bool = False
+    parallel: bool = False  # Run alongside earlier steps instead of after the previous one
+    depends_on: List[str] = field(default_factory=list)
+    on_failure: str = "stop"  # One of FAILURE_POLICIES
+    stream: bool = False  # Read the input step's stdout live instead of its finished output file
     status: StepStatus = StepStatus.PENDING
     result: Any = None
     error: str = ""
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
+    metrics: Dict[str, Any] = field(default_factory=dict)  # exit code, duration, peak RSS, CPU time
+    
+    def stream_source(self) -> Optional[str]:
+        """
+        Name of the step whose stdout this step reads live, if any.
+        
+        Streaming needs a `$step` input, a tool that reads stdin and no
+        condition (conditions look at the finished output); otherwise the
+        step waits for the input file as usual.
+        """
+        if self.stream and self.tool in STDIN_TOOLS and not self.condition:
+            return step_reference(self.input_source)
+        return None
     
     def to_dict(self) -> dict:
         return {
@@ -54,6 +108,11 @@ class WorkflowStep:
             'input_source': self.input_source,
             'output_file': self.output_file,
             'condition': self.condition,
+            'timeout': self.timeout,
+            'parallel': self.parallel,
+            'depends_on': self.depends_on,
+            'on_failure': self.on_failure,
+            'stream': self.stream,
             'status': self.status.value,
             'error': self.error
         }
@@ -72,6 +131,79 @@ class Workflow:
         """Add a step to the workflow."""
         self.steps.append(step)
     
+    def steps_read_for(self, metric: str) -> Set[str]:
+        """
+        Names of the steps whose `metric` some condition reads.
+        
+        Raises:
+            ValueError: If a condition is invalid
+        """
+        return {
+            name
+            for step in self.steps if step.condition
+            for name, read in compile_condition(step.condition).reads
+            if read == metric
+        }
+    
+    def dependency_graph(self) -> Dict[str, List[str]]:
+        """
+        Map each step name to the names of the steps it waits for.
+        
+        Dependencies come from `$step` input sources, depends_on and the
+        steps a condition refers to. A step not marked parallel also waits
+        for the step before it, so workflows without parallel steps still run
+        in order.
+        
+        Raises:
+            ValueError: On duplicate or unknown step names, unknown failure
+                policies, invalid conditions or a dependency cycle
+        """
+        names = [step.name for step in self.steps]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate step names: {', '.join(duplicates)}")
+        
+        graph: Dict[str, List[str]] = {}
+        previous = None
+        for step in self.steps:
+            if step.on_failure not in FAILURE_POLICIES:
+                raise ValueError(f"Step '{step.name}' has unknown on_failure '{step.on_failure}'")
+            
+            deps = list(step.depends_on)
+            ref = step_reference(step.input_source)
+            if ref:
+                deps.append(ref)
+            if step.condition:
+                # Conditions read the finished output of the steps they name
+                deps.extend(sorted(compile_condition(step.condition).references))
+            if previous and not step.parallel:
+                deps.append(previous)
+            
+            unknown = [dep for dep in deps if dep not in names]
+            if unknown:
+                raise ValueError(f"Step '{step.name}' depends on unknown step(s): {', '.join(unknown)}")
+            graph[step.name] = list(dict.fromkeys(deps))
+            previous = step.name
+        
+        # Depth-first search for cycles
+        state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+        
+        def visit(name: str, path: List[str]):
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                cycle = path[path.index(name):] + [name]
+                raise ValueError(f"Dependency cycle: {' -> '.join(cycle)}")
+            state[name] = 1
+            for dep in graph[name]:
+                visit(dep, path + [name])
+            state[name] = 2
+        
+        for name in names:
+            visit(name, [])
+        
+        return graph
+    
     def to_dict(self) -> dict:
         return {
             'name': self.name,
@@ -91,6 +223,9 @@ class Workflow:
         )
         
         for step_data in data.get('steps', []):
+            depends_on = step_data.get('depends_on') or []
+            if isinstance(depends_on, str):
+                depends_on = [depends_on]
             step = WorkflowStep(
                 name=step_data.get('name', ''),
                 tool=step_data.get('tool', ''),
@@ -98,7 +233,11 @@ class Workflow:
                 input_source=step_data.get('input_source', ''),
                 output_file=step_data.get('output_file', ''),
                 condition=step_data.get('condition', ''),
-                timeout=step_data.get('timeout', 3600)
+                timeout=step_data.get('timeout', 3600),
+                parallel=step_data.get('parallel', False),
+                depends_on=depends_on,
+                on_failure=step_data.get('on_failure', 'stop'),
+                stream=step_data.get('stream', False)
             )
             workflow.add_step(step)
         
@@ -127,15 +266,41 @@ class Workflow:
 class WorkflowEngine:
     """Executes workflows with tool chaining."""
     
-    def __init__(self, results_dir: Optional[Path] = None, audit: Optional[AuditLogger] = None):
+    def __init__(
+        self,
+        results_dir: Optional[Path] = None,
+        audit: Optional[AuditLogger] = None,
+        max_parallel: int = 4,
+        cache: Optional[StepCache] = None
+    ):
         self.results_dir = results_dir or Path(__file__).parent.parent / "results"
-        self.results_dir.mkdir(exist_ok=True)
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+        self.runs_dir = self.results_dir / "runs"  # Journals for resume()
+        self.max_parallel = max_parallel  # Steps running at once
+        self.cache = cache  # Reuses outputs of identical earlier runs when set
         
         self.current_workflow: Optional[Workflow] = None
         self.step_outputs: Dict[str, str] = {}  # step_name -> output_file
+        self.step_metrics: Dict[str, dict] = {}  # step_name -> output metrics and status, for conditions
+        self._finding_steps: Set[str] = set()  # steps whose findings a condition reads
+        self.registry = ParserRegistry()
         self.callbacks: Dict[str, Callable] = {}
         self.audit = audit
     
+    def fork(self, results_dir: Path) -> 'WorkflowEngine':
+        """
+        New engine with this one's settings, cache and callbacks but its own
+        results directory and run state, for running workflows side by side.
+        """
+        engine = WorkflowEngine(
+            results_dir=results_dir,
+            audit=self.audit,
+            max_parallel=self.max_parallel,
+            cache=self.cache
+        )
+        engine.callbacks = self.callbacks
+        return engine
+    
     def register_callback(self, event: str, callback: Callable):
         """Register a callback for workflow events."""
         self.callbacks[event] = callback
@@ -156,54 +321,117 @@ class WorkflowEngine:
             value = value.replace(f"${var_name}", var_value)
         return value
     
-    def _evaluate_condition(self, condition: str, context: Dict[str, Any]) -> bool:
-        """Evaluate a step condition."""
+    def _evaluate_condition(self, condition: str) -> bool:
+        """
+        Evaluate a step condition against the metrics of earlier steps.
+        
+        Raises:
+            ValueError: If the condition is invalid or cannot be evaluated
+        """
         if not condition:
             return True
+        return compile_condition(condition)(self.step_metrics)
+    
+    def _set_status(self, step: WorkflowStep, status: StepStatus):
+        """Set a step's status and make it visible to later conditions."""
+        step.status = status
+        self.step_metrics[step.name] = {**self.step_metrics.get(step.name, EMPTY_METRICS), 'status': status.value}
+    
+    async def _measure_output(self, step: WorkflowStep, output_file: str):
+        """
+        Gather a finished step's output metrics once, off the event loop.
         
-        # Simple condition evaluator
-        # Supports: "step_name.count > 0", "step_name.exists"
-        try:
-            # Replace step references with actual values
-            for step_name, output_file in self.step_outputs.items():
-                if f"{step_name}.exists" in condition:
-                    exists = Path(output_file).exists() if output_file else False
-                    condition = condition.replace(f"{step_name}.exists", str(exists))
-                
-                if f"{step_name}.count" in condition:
-                    count = 0
-                    if output_file and Path(output_file).exists():
-                        with open(output_file, 'r') as f:
-                            count = sum(1 for line in f if line.strip())
-                    condition = condition.replace(f"{step_name}.count", str(count))
-            
-            # Evaluate the condition
-            return eval(condition, {"__builtins__": {}}, context)
-        except:
-            return True  # Default to true on error
+        Findings are only counted for steps a condition reads them from, as
+        parsing costs far more than the other metrics.
+        """
+        parser_cls = self.registry.get_parser(step.tool) if step.name in self._finding_steps else None
+        metrics = await asyncio.to_thread(output_metrics, output_file, parser_cls() if parser_cls else None)
+        step.metrics['output'] = metrics
+        self.step_metrics[step.name] = {**metrics, 'status': StepStatus.COMPLETED.value}
     
-    def execute_step(self, step: WorkflowStep, variables: Dict[str, str]) -> bool:
-        """Execute a single workflow step."""
+    def _log_failure(self, step: WorkflowStep):
+        """Record a failed step."""
+        self._set_status(step, StepStatus.FAILED)
+        self._emit('step_failed', step)
+        if self.audit:
+            self.audit.log(
+                AuditAction.ERROR,
+                user_id="workflow",
+                username="workflow",
+                resource_type="workflow_step",
+                resource_id=step.name,
+                details={"tool": step.tool, "error": step.error},
+                success=False
+            )
+    
+    def _complete_step(self, step: WorkflowStep, output_file: str) -> bool:
+        """Record a finished step."""
+        step.status = StepStatus.COMPLETED
+        step.completed_at = datetime.now()
+        self.step_outputs[step.name] = output_file
+        self._emit('step_complete', step)
+
+        if self.audit:
+            self.audit.log(
+                AuditAction.SCAN_COMPLETE,
+                user_id="workflow",
+                username="workflow",
+                resource_type="workflow_step",
+                resource_id=step.name,
+                details={
+                    "tool": step.tool,
+                    "output": output_file,
+                    "status": step.status.value,
+                    "metrics": step.metrics
+                },
+                success=True
+            )
+
+        return True
+    
+    async def execute_step_async(
+        self,
+        step: WorkflowStep,
+        variables: Dict[str, str],
+        input_pipe: Optional[LinePipe] = None,
+        output_pipes: Optional[List[LinePipe]] = None,
+        resume: bool = False
+    ) -> bool:
+        """
+        Execute a single workflow step.
+        
+        The tool's stdout is streamed line by line to the 'step_output'
+        callback as {'step', 'line'} instead of being buffered. On timeout the
+        tool's whole process group is killed. With a cache, a fresh result of
+        an identical run is linked into place instead of running the tool.
+        
+        Args:
+            step: Step to execute
+            variables: Values for ${VAR} placeholders
+            input_pipe: Live stdin for the tool, replacing its input source
+            output_pipes: Pipes that also receive every stdout line
+            resume: The step was interrupted earlier; continue it with the
+                tool's native resume if it has one
+        
+        Returns:
+            False if the step failed
+        """
         # Check if tool exists
         if not self.check_tool(step.tool):
-            step.status = StepStatus.FAILED
             step.error = f"Tool not found: {step.tool}"
-            if self.audit:
-                self.audit.log(
-                    AuditAction.ERROR,
-                    user_id="workflow",
-                    username="workflow",
-                    resource_type="workflow_step",
-                    resource_id=step.name,
-                    details={"tool": step.tool, "error": step.error},
-                    success=False
-                )
+            self._log_failure(step)
             return False
         
         # Check condition
         if step.condition:
-            if not self._evaluate_condition(step.condition, {'steps': self.step_outputs}):
-                step.status = StepStatus.SKIPPED
+            try:
+                run = self._evaluate_condition(step.condition)
+            except ValueError as e:
+                step.error = str(e)
+                self._log_failure(step)
+                return False
+            if not run:
+                self._set_status(step, StepStatus.SKIPPED)
                 return True
         
         step.status = StepStatus.RUNNING
@@ -227,9 +455,9 @@ class WorkflowEngine:
         # Resolve input source
         input_file = ""
         if step.input_source:
-            if step.input_source.startswith('$'):
+            ref_step = step_reference(step.input_source)
+            if ref_step:
                 # Reference to previous step output
-                ref_step = step.input_source[1:]
                 input_file = self.step_outputs.get(ref_step, "")
             else:
                 input_file = self._resolve_variable(step.input_source, variables)
@@ -245,100 +473,274 @@ class WorkflowEngine:
         cmd_parts = [step.tool] + shlex.split(flags)
         cmd_parts.extend(["-o", output_file])
         
+        async def forward(line: str):
+            self._emit('step_output', {'step': step.name, 'line': line})
+            for pipe in output_pipes or []:
+                await pipe.write(line)
+        
         stdin_file = None
         try:
+            if input_pipe is not None:
+                input_file = ""
             if input_file:
-                if step.tool in ['httpx', 'nuclei']:
+                if step.tool in STDIN_TOOLS:
                     # Open input file as stdin instead of cat pipe
-                    stdin_file = open(input_file, 'r')
-                    process = subprocess.run(
-                        cmd_parts,
-                        stdin=stdin_file,
-                        capture_output=True,
-                        text=True,
-                        timeout=step.timeout
-                    )
+                    stdin_file = open(input_file, 'rb')
                 else:
                     cmd_parts.extend(["-iL", input_file])
-                    process = subprocess.run(
-                        cmd_parts,
-                        capture_output=True,
-                        text=True,
-                        timeout=step.timeout
-                    )
-            else:
-                process = subprocess.run(
+            
+            # Streamed input is unknown up front, and consumers need live stdout
+            cache_key = None
+            if self.cache and input_pipe is None and not output_pipes:
+                cache_key = await asyncio.to_thread(self.cache.key, step.tool, flags, input_file)
+            
+            if cache_key and await asyncio.to_thread(self.cache.fetch, cache_key, output_file):
+                step.metrics = {'cache_hit': True}
+                await self._measure_output(step, output_file)
+                return self._complete_step(step, output_file)
+            
+            outcome = None
+            resume_cmd = NATIVE_RESUME[step.tool](shlex.split(flags)) if resume and step.tool in NATIVE_RESUME else None
+            if resume_cmd and Path(resume_cmd[-1]).exists():
+                outcome = await run_process(resume_cmd, timeout=step.timeout, on_line=forward)
+                if outcome.timed_out or outcome.returncode != 0:
+                    outcome = None  # Could not resume; start over
+            
+            if outcome is None:
+                unshare(output_file)
+                outcome = await run_process(
                     cmd_parts,
-                    capture_output=True,
-                    text=True,
-                    timeout=step.timeout
+                    stdin=stdin_file,
+                    timeout=step.timeout,
+                    on_line=forward,
+                    input_lines=input_pipe
                 )
+            step.metrics = outcome.to_dict()
             
-            step.status = StepStatus.COMPLETED
-            step.completed_at = datetime.now()
-            self.step_outputs[step.name] = output_file
-            self._emit('step_complete', step)
-
-            if self.audit:
-                self.audit.log(
-                    AuditAction.SCAN_COMPLETE,
-                    user_id="workflow",
-                    username="workflow",
-                    resource_type="workflow_step",
-                    resource_id=step.name,
-                    details={"tool": step.tool, "output": output_file, "status": step.status.value},
-                    success=True
-                )
-
-            return True
+            if outcome.timed_out:
+                step.error = "Timeout expired"
+                self._log_failure(step)
+                return False
+            if outcome.returncode != 0:
+                step.error = f"{step.tool} exited with code {outcome.returncode}"
+                if outcome.stderr_tail:
+                    step.error += f": {outcome.stderr_tail[-500:]}"
+                self._log_failure(step)
+                return False
+            
+            if cache_key:
+                await asyncio.to_thread(self.cache.store, cache_key, step.tool, output_file)
+            await self._measure_output(step, output_file)
+            return self._complete_step(step, output_file)
             
-        except subprocess.TimeoutExpired:
-            step.status = StepStatus.FAILED
-            step.error = "Timeout expired"
-            self._emit('step_failed', step)
-            if self.audit:
-                self.audit.log(
-                    AuditAction.ERROR,
-                    user_id="workflow",
-                    username="workflow",
-                    resource_type="workflow_step",
-                    resource_id=step.name,
-                    details={"tool": step.tool, "error": step.error},
-                    success=False
-                )
-            return False
         except Exception as e:
-            step.status = StepStatus.FAILED
             step.error = str(e)
-            self._emit('step_failed', step)
-            if self.audit:
-                self.audit.log(
-                    AuditAction.ERROR,
-                    user_id="workflow",
-                    username="workflow",
-                    resource_type="workflow_step",
-                    resource_id=step.name,
-                    details={"tool": step.tool, "error": step.error},
-                    success=False
-                )
+            self._log_failure(step)
             return False
         finally:
             if stdin_file:
                 stdin_file.close()
     
-    def execute(self, workflow: Workflow, target: str) -> Dict[str, Any]:
+    def execute_step(self, step: WorkflowStep, variables: Dict[str, str]) -> bool:
+        """Execute a single workflow step (blocking wrapper around execute_step_async)."""
+        return asyncio.run(self.execute_step_async(step, variables))
+    
+    async def _run_graph(
+        self,
+        workflow: Workflow,
+        variables: Dict[str, str],
+        journal: Optional[RunJournal] = None,
+        done: Optional[Dict[str, str]] = None,
+        interrupted: Optional[set] = None
+    ):
+        """
+        Run every step once its dependencies have finished, max_parallel at a time.
+        
+        A streaming step starts without waiting for its input step and reads
+        that step's stdout through a LinePipe; the input step still writes
+        its own output file. Streaming steps share their source's slot, so a
+        pipeline never deadlocks waiting for a free one.
+        
+        Args:
+            workflow: Workflow to run
+            variables: Values for ${VAR} placeholders
+            journal: Journal that records each step as it starts and finishes
+            done: Steps finished by an earlier attempt, as {name: output file}
+            interrupted: Steps an earlier attempt started but never finished
+        """
+        graph = workflow.dependency_graph()
+        for step in workflow.steps:
+            step.status = StepStatus.PENDING
+            step.error = ""
+            step.metrics = {}
+        
+        # A finished step only counts if everything it read from counts too
+        done = dict(done or {})
+        interrupted = interrupted or set()
+        changed = True
+        while changed:
+            stale = [name for name in done if any(dep not in done for dep in graph.get(name, []))]
+            for name in stale:
+                del done[name]
+            changed = bool(stale)
+        
+        input_pipes: Dict[str, LinePipe] = {}
+        output_pipes: Dict[str, List[LinePipe]] = {}
+        consumers: Dict[str, List[str]] = {}
+        for step in workflow.steps:
+            source = step.stream_source()
+            if source and source not in done:
+                input_pipes[step.name] = LinePipe()
+                output_pipes.setdefault(source, []).append(input_pipes[step.name])
+                consumers.setdefault(source, []).append(step.name)
+        
+        slots = asyncio.Semaphore(max(1, self.max_parallel))
+        tasks: Dict[str, asyncio.Task] = {}
+        halted = set()  # Failed steps whose dependents must not run
+        reasons: Dict[str, str] = {}  # Why a cancelled step did not finish
+        
+        def halt(name: str):
+            """Keep dependents of a step from running, stopping any already reading it."""
+            halted.add(name)
+            for consumer in consumers.get(name, []):
+                if not tasks[consumer].done():
+                    reasons[consumer] = f"Upstream step failed: {name}"
+                    halt(consumer)
+                    tasks[consumer].cancel()
+        
+        async def record(step: WorkflowStep):
+            # Hashing the output and fsyncing the journal must not stall other steps
+            if journal:
+                await asyncio.to_thread(
+                    journal.step_finished,
+                    step.name, step.status.value, self.step_outputs.get(step.name, ""),
+                    started_at=step.started_at, completed_at=step.completed_at,
+                    error=step.error, metrics=step.metrics
+                )
+        
+        async def run(step: WorkflowStep):
+            if step.name in done:
+                step.metrics = {'checkpoint': True}
+                self.step_outputs[step.name] = done[step.name]
+                await self._measure_output(step, done[step.name])
+                step.status = StepStatus.COMPLETED
+                return
+            
+            input_pipe = input_pipes.get(step.name)
+            source = step.stream_source() if input_pipe is not None else None
+            deps = graph[step.name]
+            waits = [dep for dep in deps if dep != source]
+            try:
+                if waits:
+                    await asyncio.wait([tasks[dep] for dep in waits])
+                
+                blocked = [dep for dep in deps if dep in halted]
+                if blocked:
+                    self._set_status(step, StepStatus.SKIPPED)
+                    step.error = f"Upstream step failed: {blocked[0]}"
+                    halt(step.name)
+                    await record(step)
+                    return
+                
+                resume = step.name in interrupted
+                if input_pipe is not None:
+                    if journal:
+                        await asyncio.to_thread(journal.step_started, step.name)
+                    success = await self.execute_step_async(step, variables, input_pipe=input_pipe)
+                else:
+                    async with slots:
+                        if journal:
+                            await asyncio.to_thread(journal.step_started, step.name)
+                        success = await self.execute_step_async(
+                            step, variables, output_pipes=output_pipes.get(step.name), resume=resume
+                        )
+                await record(step)
+            finally:
+                for pipe in output_pipes.get(step.name, []):
+                    pipe.finish()
+                if input_pipe is not None:
+                    input_pipe.close_reader()
+            
+            if not success and step.status == StepStatus.FAILED:
+                if step.on_failure == "abort":
+                    for name, task in tasks.items():
+                        if name != step.name:
+                            reasons.setdefault(name, "Workflow aborted")
+                            task.cancel()
+                elif step.on_failure == "stop":
+                    halt(step.name)
+        
+        for step in workflow.steps:
+            tasks[step.name] = asyncio.create_task(run(step))
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        
+        for step in workflow.steps:
+            if step.status in (StepStatus.PENDING, StepStatus.RUNNING):
+                step.status = StepStatus.SKIPPED
+                step.error = reasons.get(step.name, "Workflow aborted")
+                await record(step)
+    
+    async def execute_async(self, workflow: Workflow, target: str) -> Dict[str, Any]:
         """
         Execute a complete workflow.
         
+        Steps run as a dependency graph (see Workflow.dependency_graph), with
+        independent branches running concurrently up to max_parallel. Progress
+        is journaled under runs_dir; the results' run_id can be passed to
+        resume() if the run is interrupted.
+        
         Args:
             workflow: Workflow to execute
             target: Target for the workflow
         
         Returns:
             Dictionary with execution results
+        
+        Raises:
+            ValueError: If the workflow's dependency graph is invalid
+        """
+        workflow.dependency_graph()
+        journal = RunJournal.create(self.runs_dir, workflow.to_dict(), target)
+        return await self._execute(workflow, target, journal)
+    
+    async def resume_async(self, run_id: str) -> Dict[str, Any]:
+        """
+        Continue an earlier run of a workflow.
+        
+        Steps that completed and whose output file is unchanged are not run
+        again; everything downstream of a step that has to re-run is run
+        again too. Interrupted steps use the tool's native resume where it
+        has one (nmap --resume with an -oN/-oG/-oA log).
+        
+        Args:
+            run_id: run_id from the earlier run's results
+        
+        Returns:
+            Dictionary with execution results
+        
+        Raises:
+            FileNotFoundError: If there is no such run
         """
+        journal = RunJournal.open(self.runs_dir, run_id)
+        state = journal.load()
+        workflow = Workflow.from_dict(state['workflow'])
+        return await self._execute(
+            workflow, state['target'], journal,
+            done=journal.valid_outputs(), interrupted=state['started']
+        )
+    
+    async def _execute(
+        self,
+        workflow: Workflow,
+        target: str,
+        journal: RunJournal,
+        done: Optional[Dict[str, str]] = None,
+        interrupted: Optional[set] = None
+    ) -> Dict[str, Any]:
         self.current_workflow = workflow
         self.step_outputs = {}
+        self.step_metrics = {}
+        self._finding_steps = workflow.steps_read_for('findings')
         
         # Set target and results path as variables
         variables = {
@@ -348,6 +750,7 @@ class WorkflowEngine:
         }
         
         results = {
+            'run_id': journal.run_id,
             'workflow': workflow.name,
             'target': target,
             'started_at': datetime.now().isoformat(),
@@ -357,23 +760,21 @@ class WorkflowEngine:
         
         self._emit('workflow_start', workflow)
         
-        for step in workflow.steps:
-            success = self.execute_step(step, variables)
-            
-            results['steps'].append({
+        await self._run_graph(workflow, variables, journal, done, interrupted)
+        
+        results['steps'] = [
+            {
                 'name': step.name,
                 'tool': step.tool,
                 'status': step.status.value,
                 'output': self.step_outputs.get(step.name, ''),
-                'error': step.error
-            })
-            
-            if not success and step.status == StepStatus.FAILED:
-                # Stop on failure (could make configurable)
-                results['status'] = 'failed'
-                break
-        else:
-            results['status'] = 'completed'
+                'error': step.error,
+                'metrics': step.metrics
+            }
+            for step in workflow.steps
+        ]
+        failed = any(step.status == StepStatus.FAILED for step in workflow.steps)
+        results['status'] = 'failed' if failed else 'completed'
         
         results['completed_at'] = datetime.now().isoformat()
 
@@ -408,9 +809,22 @@ class WorkflowEngine:
                 success=(results['status'] == 'completed')
             )
 
+        journal.run_finished(results['status'])
         self._emit('workflow_complete', results)
         
         return results
+    
+    def execute(self, workflow: Workflow, target: str) -> Dict[str, Any]:
+        """
+        Execute a complete workflow, blocking until it finishes.
+        
+        Thin wrapper around execute_async(); coroutines should await that instead.
+        """
+        return asyncio.run(self.execute_async(workflow, target))
+    
+    def resume(self, run_id: str) -> Dict[str, Any]:
+        """Blocking wrapper around resume_async()."""
+        return asyncio.run(self.resume_async(run_id))
 
 
 # Pre-defined workflows
@@ -430,7 +844,8 @@ PREDEFINED_WORKFLOWS = {
                 tool="httpx",
                 flags="-sc -cl -title -tech-detect",
                 input_source="$subdomains",
-                output_file="${RESULTS}/live_hosts.txt"
+                output_file="${RESULTS}/live_hosts.txt",
+                stream=True
             ),
             WorkflowStep(
                 name="scan",
@@ -453,6 +868,41 @@ PREDEFINED_WORKFLOWS = {
                 output_file="${RESULTS}/nmap_scan.xml"
             )
         ]
+    ),
+    'full_scan': Workflow(
+        name="Full Scan",
+        description="Web reconnaissance with a port scan running alongside it",
+        steps=[
+            WorkflowStep(
+                name="subdomains",
+                tool="subfinder",
+                flags="-d ${TARGET} -silent",
+                output_file="${RESULTS}/subdomains.txt"
+            ),
+            WorkflowStep(
+                name="probe",
+                tool="httpx",
+                flags="-sc -cl -title -tech-detect",
+                input_source="$subdomains",
+                output_file="${RESULTS}/live_hosts.txt",
+                stream=True
+            ),
+            WorkflowStep(
+                name="scan",
+                tool="nuclei",
+                flags="-severity critical,high,medium",
+                input_source="$probe",
+                output_file="${RESULTS}/vulnerabilities.json",
+                condition="probe.count > 0"
+            ),
+            WorkflowStep(
+                name="portscan",
+                tool="nmap",
+                flags="-sV -T4 -F",
+                output_file="${RESULTS}/nmap_scan.xml",
+                parallel=True
+            )
+        ]
     )
 }
 
@@ -2,5 +2,8 @@
 from .base import BaseParser, ScanResult, Finding
 from .nmap_parser import NmapParser
 from .nuclei_parser import NucleiParser
+from .registry import ParserRegistry
+from .compact import FindingTable, HostTable
 
-__all__ = ['BaseParser', 'ScanResult', 'Finding', 'NmapParser', 'NucleiParser']
+__all__ = ['BaseParser', 'ScanResult', 'Finding', 'NmapParser', 'NucleiParser', 'ParserRegistry',
+           'FindingTable', 'HostTable']
@@ -0,0 +1,358 @@
+"""
+Binary archive format for ScanResult.
+
+Layout (all integers little-endian):
+
+    header   MAGIC(4) version(u16) compression(u8) reserved(u8)
+    blocks   u32 length followed by a (optionally compressed) UTF-8 JSON
+             array of records
+    index    JSON object of block offsets plus a host address lookup
+    footer   index offset(u64) index length(u32) MAGIC(4)
+
+Records are grouped into blocks so compression and decoding work on many
+records at once, while the index lets a reader decode only the blocks it
+needs: the metadata, the findings, or the single block holding one host.
+The length prefixes keep the blocks walkable even if the index is lost.
+JSON keeps blocks readable across Python versions and safe to decode from
+untrusted files. Records are positional arrays, so blocks carry no field
+names and decode without building a dict per finding or host; loading is
+benchmarked against plain JSON in benchmarks/bench_archive.py. Free-form
+values (metadata, ports, services) are stored as they are, so they must be
+JSON types: anything else is refused at write time rather than stored
+lossily, and tuples read back as lists.
+"""
+
+import gzip
+import json
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from .base import Finding, FindingType, Host, ScanResult, Severity
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+MAGIC = b'CTSR'
+FORMAT_VERSION = 2
+
+COMPRESSION_NONE = 0
+COMPRESSION_GZIP = 1
+COMPRESSION_ZSTD = 2
+COMPRESSION_NAMES = {
+    'none': COMPRESSION_NONE,
+    'gzip': COMPRESSION_GZIP,
+    'zstd': COMPRESSION_ZSTD,
+}
+
+_HEADER = struct.Struct('<4sHBB')
+_FOOTER = struct.Struct('<QI4s')
+_BLOCK_LEN = struct.Struct('<I')
+
+# Records collected before a block is flushed
+DEFAULT_BLOCK_RECORDS = 2048
+
+_FINDING_TYPES = {t.value: t for t in FindingType}
+_SEVERITIES = {s.value: s for s in Severity}
+
+
+class ArchiveError(ValueError):
+    """Raised when a file is not a valid scan archive."""
+
+
+def _refuse(value: Any):
+    raise ArchiveError(f"Cannot store {type(value).__name__} values in a scan archive")
+
+
+_ENCODER = json.JSONEncoder(separators=(',', ':'), default=_refuse)
+
+
+def _encode(value: Any) -> bytes:
+    try:
+        return _ENCODER.encode(value).encode('utf-8')
+    except TypeError as e:  # dict keys JSON cannot hold
+        raise ArchiveError(f"Cannot store value in a scan archive: {e}")
+
+
+def _decode(data: bytes) -> Any:
+    try:
+        return json.loads(data)
+    except ValueError as e:  # includes UnicodeDecodeError
+        raise ArchiveError(f"Corrupt archive block: {e}")
+
+
+def _compressor(compression: int):
+    """Get (compress, decompress) callables for a compression id."""
+    if compression == COMPRESSION_NONE:
+        return (lambda data: data), (lambda data: data)
+    if compression == COMPRESSION_GZIP:
+        return (lambda data: gzip.compress(data, compresslevel=6)), gzip.decompress
+    if compression == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise ArchiveError("zstd compression requires the 'zstandard' package")
+        return zstandard.ZstdCompressor(level=3).compress, zstandard.ZstdDecompressor().decompress
+    raise ArchiveError(f"Unknown compression id: {compression}")
+
+
+def _finding_record(finding: Finding) -> tuple:
+    return (
+        finding.type.value, finding.severity.value, finding.title,
+        finding.description, finding.evidence, finding.remediation,
+        list(finding.references), list(finding.tags), finding.metadata
+    )
+
+
+def _finding_from_record(record: tuple) -> Finding:
+    # Positional arguments follow the Finding field order
+    return Finding(_FINDING_TYPES[record[0]], _SEVERITIES[record[1]], *record[2:])
+
+
+def _host_record(host: Host) -> tuple:
+    return (
+        host.address, host.hostname, host.os, host.status,
+        host.ports, host.services, host.metadata
+    )
+
+
+def _host_from_record(record: tuple) -> Host:
+    return Host(*record)
+
+
+class _BlockWriter:
+    """Packs records into length-prefixed blocks and tracks their offsets."""
+
+    def __init__(self, f, compress, block_records: int):
+        self.f = f
+        self.compress = compress
+        self.block_records = block_records
+        self.blocks: List[Tuple[int, int, int]] = []  # (offset, length, records)
+        self._buffer: List[Any] = []
+
+    def add(self, record: Any) -> Tuple[int, int]:
+        """Add a record. Returns its (block number, position in block)."""
+        position = (len(self.blocks), len(self._buffer))
+        self._buffer.append(record)
+        if len(self._buffer) >= self.block_records:
+            self.flush()
+        return position
+
+    def flush(self):
+        """Write buffered records as one block."""
+        if not self._buffer:
+            return
+        data = self.compress(_encode(self._buffer))
+        self.f.write(_BLOCK_LEN.pack(len(data)))
+        self.blocks.append((self.f.tell(), len(data), len(self._buffer)))
+        self.f.write(data)
+        self._buffer = []
+
+    def take_blocks(self) -> List[Tuple[int, int, int]]:
+        """Flush and return the blocks written since the last call."""
+        self.flush()
+        blocks, self.blocks = self.blocks, []
+        return blocks
+
+
+def write_archive(
+    result: ScanResult,
+    filepath: Union[str, Path],
+    compression: str = 'none',
+    block_records: int = DEFAULT_BLOCK_RECORDS
+):
+    """
+    Write a ScanResult to a binary archive.
+
+    Args:
+        result: Scan result to write
+        filepath: Destination path
+        compression: 'none', 'gzip' or 'zstd'
+        block_records: Records per block
+    """
+    if compression not in COMPRESSION_NAMES:
+        raise ArchiveError(f"Unknown compression: {compression}")
+    compression_id = COMPRESSION_NAMES[compression]
+    compress, _ = _compressor(compression_id)
+
+    meta = {
+        'tool': result.tool,
+        'target': result.target,
+        'status': result.status,
+        'timestamp': result.timestamp,
+        'duration_seconds': result.duration_seconds,
+        'command': result.command,
+        'raw_output': result.raw_output,
+        'metadata': result.metadata,
+    }
+
+    with open(filepath, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, compression_id, 0))
+
+        writer = _BlockWriter(f, compress, block_records)
+        writer.add(meta)
+        meta_blocks = writer.take_blocks()
+
+        for finding in result.findings:
+            writer.add(_finding_record(finding))
+        finding_blocks = writer.take_blocks()
+
+        host_positions: Dict[str, Tuple[int, int]] = {}
+        for host in result.hosts:
+            position = writer.add(_host_record(host))
+            host_positions.setdefault(host.address, position)
+        host_blocks = writer.take_blocks()
+
+        index = compress(_encode({
+            'meta': meta_blocks,
+            'findings': finding_blocks,
+            'hosts': host_blocks,
+            'host_positions': host_positions,
+        }))
+        index_offset = f.tell()
+        f.write(index)
+        f.write(_FOOTER.pack(index_offset, len(index), MAGIC))
+
+
+def is_archive(filepath: Union[str, Path]) -> bool:
+    """Check whether a file starts with the archive magic bytes."""
+    try:
+        with open(filepath, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class ScanArchive:
+    """
+    Random-access reader for binary scan archives.
+
+    Example:
+        with ScanArchive("scan.ctsr") as archive:
+            host = archive.get_host("10.0.0.1")
+            for finding in archive.iter_findings():
+                ...
+    """
+
+    def __init__(self, filepath: Union[str, Path]):
+        self.filepath = Path(filepath)
+        self._f = open(self.filepath, 'rb')
+        try:
+            self._read_index()
+        except Exception:
+            self._f.close()
+            raise
+
+    def _read_index(self):
+        header = self._f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ArchiveError(f"Not a scan archive: {self.filepath}")
+
+        magic, version, compression, _ = _HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ArchiveError(f"Not a scan archive: {self.filepath}")
+        if version != FORMAT_VERSION:
+            raise ArchiveError(f"Unsupported archive version {version} (expected {FORMAT_VERSION})")
+
+        self.version = version
+        self.compression = compression
+        _, self._decompress = _compressor(compression)
+
+        self._f.seek(0, 2)
+        if self._f.tell() < _HEADER.size + _FOOTER.size:
+            raise ArchiveError(f"Truncated scan archive: {self.filepath}")
+        self._f.seek(-_FOOTER.size, 2)
+        index_offset, index_length, magic = _FOOTER.unpack(self._f.read(_FOOTER.size))
+        if magic != MAGIC:
+            raise ArchiveError(f"Truncated scan archive: {self.filepath}")
+
+        self._f.seek(index_offset)
+        index = _decode(self._decompress(self._f.read(index_length)))
+        try:
+            self._meta_blocks = index['meta']
+            self._finding_blocks = index['findings']
+            self._host_blocks = index['hosts']
+            self._host_positions = index['host_positions']
+        except (KeyError, TypeError):
+            raise ArchiveError(f"Corrupt archive index: {self.filepath}")
+
+    def _read_block(self, block: Tuple[int, int, int]) -> List[Any]:
+        """Decode every record in a block."""
+        offset, length, _ = block
+        self._f.seek(offset)
+        return _decode(self._decompress(self._f.read(length)))
+
+    @property
+    def finding_count(self) -> int:
+        return sum(block[2] for block in self._finding_blocks)
+
+    @property
+    def host_count(self) -> int:
+        return sum(block[2] for block in self._host_blocks)
+
+    def read_metadata(self) -> dict:
+        """Read the scan-level fields (tool, target, status, metadata, ...)."""
+        return self._read_block(self._meta_blocks[0])[0]
+
+    def iter_findings(self) -> Iterator[Finding]:
+        """Decode findings one block at a time."""
+        for block in self._finding_blocks:
+            yield from map(_finding_from_record, self._read_block(block))
+
+    def iter_hosts(self) -> Iterator[Host]:
+        """Decode hosts one block at a time."""
+        for block in self._host_blocks:
+            yield from map(_host_from_record, self._read_block(block))
+
+    def get_host(self, address: str) -> Optional[Host]:
+        """Decode only the block containing one host."""
+        position = self._host_positions.get(address)
+        if position is None:
+            return None
+        block_no, index = position
+        return _host_from_record(self._read_block(self._host_blocks[block_no])[index])
+
+    def host_addresses(self) -> List[str]:
+        """List archived host addresses from the index."""
+        return list(self._host_positions)
+
+    def load(self, compact: bool = False) -> ScanResult:
+        """
+        Decode the full ScanResult.
+
+        Args:
+            compact: Store findings and hosts in columnar tables
+        """
+        meta = self.read_metadata()
+        result = ScanResult(
+            tool=meta['tool'],
+            target=meta['target'],
+            status=meta['status'],
+            timestamp=meta['timestamp'],
+            duration_seconds=meta['duration_seconds'],
+            command=meta['command'],
+            raw_output=meta['raw_output'],
+            metadata=meta['metadata']
+        )
+        if compact:
+            result.compact()
+
+        result.findings.extend(self.iter_findings())
+        result.hosts.extend(self.iter_hosts())
+        return result
+
+    def close(self):
+        self._f.close()
+
+    def __enter__(self) -> 'ScanArchive':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_archive(filepath: Union[str, Path], compact: bool = False) -> ScanResult:
+    """Load a full ScanResult from a binary archive."""
+    with ScanArchive(filepath) as archive:
+        return archive.load(compact=compact)
@@ -10,6 +10,7 @@ from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 import json
+import os
 
 
 class Severity(Enum):
@@ -56,7 +57,7 @@ class FindingType(Enum):
     OTHER = "other"
 
 
-@dataclass
+@dataclass(slots=True)
 class Finding:
     """Represents a single finding from a scan."""
     type: FindingType
@@ -99,7 +100,7 @@ class Finding:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Host:
     """Represents a scanned host."""
     address: str
@@ -121,11 +122,30 @@ class Host:
             'services': self.services,
             'metadata': self.metadata
         }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Host':
+        """Create Host from dictionary."""
+        return cls(
+            address=data.get('address', ''),
+            hostname=data.get('hostname', ''),
+            os=data.get('os', ''),
+            status=data.get('status', 'unknown'),
+            ports=data.get('ports', []),
+            services=data.get('services', []),
+            metadata=data.get('metadata', {})
+        )
 
 
 @dataclass  
 class ScanResult:
-    """Universal scan result container."""
+    """
+    Universal scan result container.
+    
+    ``findings`` and ``hosts`` are plain lists by default. Large results can
+    call ``compact()`` to switch them to columnar tables that behave like
+    lists but only build Finding/Host objects when rows are read.
+    """
     tool: str
     target: str
     status: str = "completed"
@@ -156,23 +176,54 @@ class ScanResult:
         """Convert scan result to JSON string."""
         return json.dumps(self.to_dict(), indent=indent)
     
-    def save(self, filepath: Union[str, Path]) -> bool:
-        """Save scan result to JSON file."""
+    def save(
+        self,
+        filepath: Union[str, Path],
+        binary: bool = False,
+        compression: str = "none"
+    ) -> bool:
+        """
+        Save scan result to a file.
+        
+        Args:
+            filepath: Destination path
+            binary: Write the binary archive format (see parsers.archive)
+                instead of JSON
+            compression: Archive compression: 'none', 'gzip' or 'zstd'
+        """
+        # Write next to the destination and swap it in, so a failed save
+        # never leaves a partial file behind
+        filepath = Path(filepath)
+        tmp = filepath.with_name(f".{filepath.name}.{os.getpid()}.tmp")
         try:
-            with open(filepath, 'w') as f:
-                f.write(self.to_json())
+            if binary:
+                from .archive import write_archive
+                write_archive(self, tmp, compression=compression)
+            else:
+                with open(tmp, 'w') as f:
+                    f.write(self.to_json())
+            os.replace(tmp, filepath)
             return True
-        except IOError:
+        except (IOError, ValueError):
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
             return False
     
     @classmethod
     def load(cls, filepath: Union[str, Path]) -> Optional['ScanResult']:
-        """Load scan result from JSON file."""
+        """Load scan result from a JSON file or binary archive."""
+        from .archive import is_archive, read_archive
+        
         try:
+            if is_archive(filepath):
+                return read_archive(filepath)
+            
             with open(filepath, 'r') as f:
                 data = json.load(f)
             return cls.from_dict(data)
-        except (IOError, json.JSONDecodeError):
+        except (IOError, ValueError, EOFError):
             return None
     
     @classmethod
@@ -186,13 +237,25 @@ class ScanResult:
             duration_seconds=data.get('duration_seconds', 0.0),
             command=data.get('command', ''),
             findings=[Finding.from_dict(f) for f in data.get('findings', [])],
-            hosts=[],  # Would need Host.from_dict
+            hosts=[Host.from_dict(h) for h in data.get('hosts', [])],
             raw_output=data.get('raw_output', ''),
             metadata=data.get('metadata', {})
         )
     
+    def compact(self) -> 'ScanResult':
+        """Move findings and hosts into columnar tables. Returns self."""
+        from .compact import FindingTable, HostTable
+        
+        if not isinstance(self.findings, FindingTable):
+            self.findings = FindingTable(self.findings)
+        if not isinstance(self.hosts, HostTable):
+            self.hosts = HostTable(self.hosts)
+        return self
+    
     def get_findings_by_severity(self, severity: Severity) -> List[Finding]:
         """Get findings filtered by severity."""
+        if hasattr(self.findings, 'filter_severity'):
+            return self.findings.filter_severity(severity)
         return [f for f in self.findings if f.severity == severity]
     
     def get_critical_findings(self) -> List[Finding]:
@@ -205,9 +268,13 @@ class ScanResult:
     
     def summary(self) -> dict:
         """Get summary statistics."""
-        severity_counts = {}
-        for sev in Severity:
-            severity_counts[sev.value] = len(self.get_findings_by_severity(sev))
+        severity_counts = {sev.value: 0 for sev in Severity}
+        if hasattr(self.findings, 'severity_counts'):
+            for sev, count in self.findings.severity_counts().items():
+                severity_counts[sev.value] = count
+        else:
+            for finding in self.findings:
+                severity_counts[finding.severity.value] += 1
         
         return {
             'tool': self.tool,
@@ -0,0 +1,291 @@
+"""
+Compact columnar storage for large parse results.
+Keeps findings, hosts and ports in parallel array columns with pooled strings,
+and only builds Finding/Host dataclasses when a row is accessed.
+"""
+
+from array import array
+from collections import Counter
+from collections.abc import Sequence
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Union
+
+from .base import Finding, FindingType, Host, Severity
+
+
+FINDING_TYPES: List[FindingType] = list(FindingType)
+SEVERITIES: List[Severity] = list(Severity)
+_TYPE_CODES = {t: i for i, t in enumerate(FINDING_TYPES)}
+_SEVERITY_CODES = {s: i for i, s in enumerate(SEVERITIES)}
+
+# Keys produced by NmapParser._parse_port, in output order
+PORT_FIELDS = ('number', 'protocol', 'state', 'service', 'product', 'version', 'extrainfo')
+
+
+class ValuePool:
+    """Interns hashable values (strings, tuples) to small integer ids."""
+
+    def __init__(self):
+        self._ids: Dict[Hashable, int] = {}
+        self._values: List[Any] = []
+
+    def add(self, value: Hashable) -> int:
+        """Return the id for a value, adding it if new."""
+        index = self._ids.get(value)
+        if index is None:
+            index = len(self._values)
+            self._ids[value] = index
+            self._values.append(value)
+        return index
+
+    def intern(self, value: Hashable) -> Any:
+        """Return the canonical instance of a value."""
+        return self._values[self.add(value)]
+
+    def get(self, index: int) -> Any:
+        """Get a value by id."""
+        return self._values[index]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class FindingTable(Sequence):
+    """
+    Columnar list of findings.
+
+    Behaves like a list of Finding objects (len, iteration, indexing,
+    append, extend) but stores each field in a column. Repeated strings
+    such as titles, tags and metadata values are stored once.
+    """
+
+    def __init__(self, findings: Optional[Iterable[Finding]] = None):
+        self._pool = ValuePool()
+        self._type = array('B')
+        self._severity = array('B')
+        self._title = array('I')
+        self._description = array('I')
+        self._remediation = array('I')
+        self._references = array('I')
+        self._tags = array('I')
+        self._meta_keys = array('I')
+        self._evidence: List[str] = []
+        self._meta_values: List[tuple] = []
+
+        if findings is not None:
+            self.extend(findings)
+
+    def append(self, finding: Finding):
+        """Add a finding as a new row."""
+        pool = self._pool
+        self._type.append(_TYPE_CODES[finding.type])
+        self._severity.append(_SEVERITY_CODES[finding.severity])
+        self._title.append(pool.add(finding.title))
+        self._description.append(pool.add(finding.description))
+        self._remediation.append(pool.add(finding.remediation))
+        self._references.append(pool.add(tuple(pool.intern(r) for r in finding.references)))
+        self._tags.append(pool.add(tuple(pool.intern(t) for t in finding.tags)))
+        self._evidence.append(finding.evidence)
+
+        metadata = finding.metadata
+        self._meta_keys.append(pool.add(tuple(pool.intern(k) for k in metadata)))
+        self._meta_values.append(tuple(
+            pool.intern(v) if isinstance(v, str) else v for v in metadata.values()
+        ))
+
+    def extend(self, findings: Iterable[Finding]):
+        """Add several findings."""
+        for finding in findings:
+            self.append(finding)
+
+    def row(self, index: int) -> Finding:
+        """Build the Finding dataclass for one row."""
+        pool = self._pool
+        return Finding(
+            type=FINDING_TYPES[self._type[index]],
+            severity=SEVERITIES[self._severity[index]],
+            title=pool.get(self._title[index]),
+            description=pool.get(self._description[index]),
+            evidence=self._evidence[index],
+            remediation=pool.get(self._remediation[index]),
+            references=list(pool.get(self._references[index])),
+            tags=list(pool.get(self._tags[index])),
+            metadata=dict(zip(pool.get(self._meta_keys[index]), self._meta_values[index]))
+        )
+
+    def __len__(self) -> int:
+        return len(self._type)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Finding, List[Finding]]:
+        if isinstance(index, slice):
+            return [self.row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("FindingTable index out of range")
+        return self.row(index)
+
+    def __iter__(self) -> Iterator[Finding]:
+        for index in range(len(self)):
+            yield self.row(index)
+
+    def severity_counts(self) -> Dict[Severity, int]:
+        """Count rows per severity without building Finding objects."""
+        counts = Counter(self._severity)
+        return {sev: counts.get(code, 0) for sev, code in _SEVERITY_CODES.items()}
+
+    def filter_severity(self, severity: Severity) -> List[Finding]:
+        """Build Findings only for rows with the given severity."""
+        code = _SEVERITY_CODES[severity]
+        return [self.row(i) for i, sev in enumerate(self._severity) if sev == code]
+
+
+class PortTable:
+    """Columnar storage for port dictionaries as produced by NmapParser."""
+
+    def __init__(self, pool: Optional[ValuePool] = None):
+        self._pool = pool or ValuePool()
+        self._number = array('H')
+        self._fields = {name: array('I') for name in PORT_FIELDS[1:]}
+        # Rare per-row extras, keyed by row index
+        self._scripts: Dict[int, list] = {}
+        self._irregular: Dict[int, dict] = {}
+
+    def append(self, port: dict) -> int:
+        """Add a port dict. Returns its row index."""
+        index = len(self._number)
+        keys = set(port)
+        regular = (
+            keys.issuperset(PORT_FIELDS)
+            and keys.issubset(PORT_FIELDS + ('scripts',))
+            and isinstance(port['number'], int)
+            and 0 <= port['number'] <= 0xFFFF
+            and all(isinstance(port[name], str) for name in PORT_FIELDS[1:])
+        )
+
+        if regular:
+            self._number.append(port['number'])
+            for name, column in self._fields.items():
+                column.append(self._pool.add(port[name]))
+            if 'scripts' in port:
+                self._scripts[index] = port['scripts']
+        else:
+            # Keep unusual dicts verbatim so round-trips stay lossless
+            self._number.append(0)
+            for column in self._fields.values():
+                column.append(0)
+            self._irregular[index] = dict(port)
+
+        return index
+
+    def row(self, index: int) -> dict:
+        """Build the port dict for one row."""
+        if index in self._irregular:
+            return dict(self._irregular[index])
+
+        port = {'number': self._number[index]}
+        for name, column in self._fields.items():
+            port[name] = self._pool.get(column[index])
+        if index in self._scripts:
+            port['scripts'] = self._scripts[index]
+        return port
+
+    def __len__(self) -> int:
+        return len(self._number)
+
+
+def _derived_services(ports: List[dict]) -> List[dict]:
+    """Services list as NmapParser builds it from a host's ports."""
+    return [
+        {
+            'port': port.get('number'),
+            'name': port['service'],
+            'product': port.get('product', ''),
+            'version': port.get('version', '')
+        }
+        for port in ports if port.get('service')
+    ]
+
+
+class HostTable(Sequence):
+    """
+    Columnar list of hosts.
+
+    Behaves like a list of Host objects. Ports live in a shared PortTable
+    and each host stores only the range of its rows; the services list is
+    rebuilt from the ports when it matches what NmapParser would derive.
+    """
+
+    def __init__(self, hosts: Optional[Iterable[Host]] = None):
+        self._pool = ValuePool()
+        self.ports = PortTable(self._pool)
+        self._address: List[str] = []
+        self._hostname = array('I')
+        self._os = array('I')
+        self._status = array('I')
+        self._port_start = array('I')
+        self._port_count = array('I')
+        self._services: List[Optional[List[dict]]] = []
+        self._metadata: List[Optional[dict]] = []
+
+        if hosts is not None:
+            self.extend(hosts)
+
+    def append(self, host: Host):
+        """Add a host as a new row."""
+        pool = self._pool
+        self._address.append(host.address)
+        self._hostname.append(pool.add(host.hostname))
+        self._os.append(pool.add(host.os))
+        self._status.append(pool.add(host.status))
+
+        self._port_start.append(len(self.ports))
+        self._port_count.append(len(host.ports))
+        for port in host.ports:
+            self.ports.append(port)
+
+        derived = _derived_services(host.ports) == host.services
+        self._services.append(None if derived else list(host.services))
+        self._metadata.append(dict(host.metadata) if host.metadata else None)
+
+    def extend(self, hosts: Iterable[Host]):
+        """Add several hosts."""
+        for host in hosts:
+            self.append(host)
+
+    def row(self, index: int) -> Host:
+        """Build the Host dataclass for one row."""
+        pool = self._pool
+        start = self._port_start[index]
+        ports = [self.ports.row(i) for i in range(start, start + self._port_count[index])]
+        services = self._services[index]
+        metadata = self._metadata[index]
+
+        return Host(
+            address=self._address[index],
+            hostname=pool.get(self._hostname[index]),
+            os=pool.get(self._os[index]),
+            status=pool.get(self._status[index]),
+            ports=ports,
+            services=_derived_services(ports) if services is None else list(services),
+            metadata=dict(metadata) if metadata else {}
+        )
+
+    def __len__(self) -> int:
+        return len(self._address)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Host, List[Host]]:
+        if isinstance(index, slice):
+            return [self.row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("HostTable index out of range")
+        return self.row(index)
+
+    def __iter__(self) -> Iterator[Host]:
+        for index in range(len(self)):
+            yield self.row(index)
+
+    def addresses(self) -> List[str]:
+        """Host addresses without building Host objects."""
+        return list(self._address)
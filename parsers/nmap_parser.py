@@ -5,7 +5,7 @@ Parses nmap XML output format (-oX) into universal ScanResult format.
 
 import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 from datetime import datetime
 
 from .base import (
@@ -20,6 +20,9 @@ class NmapParser(BaseParser):
     tool_name = "nmap"
     supported_formats = ["xml"]
     
+    # Files larger than this are parsed incrementally with iterparse
+    STREAMING_THRESHOLD = 64 * 1024 * 1024
+    
     def can_parse(self, data: Union[str, bytes]) -> bool:
         """Check if data is valid Nmap XML output."""
         if isinstance(data, bytes):
@@ -54,16 +57,8 @@ class NmapParser(BaseParser):
             result.raw_output = data
             return result
         
-        # Parse scan info
-        result.metadata['nmap_version'] = root.get('version', '')
-        result.metadata['scan_type'] = root.get('scantype', '')
-        result.command = root.get('args', '')
-        
-        # Parse timing
-        if root.get('start'):
-            result.timestamp = datetime.fromtimestamp(
-                int(root.get('start'))
-            ).isoformat()
+        # Parse scan info and timing
+        self._apply_run_info(root, result)
         
         # Calculate duration from runstats
         runstats = root.find('.//runstats/finished')
@@ -95,6 +90,156 @@ class NmapParser(BaseParser):
         result.raw_output = data
         return result
     
+    def parse_file(self, filepath: Union[str, Path]) -> ScanResult:
+        """Parse an nmap XML file, streaming it if it is above the size threshold."""
+        filepath = Path(filepath)
+        
+        if not filepath.exists():
+            raise FileNotFoundError(f"File not found: {filepath}")
+        
+        if filepath.stat().st_size <= self.STREAMING_THRESHOLD:
+            return super().parse_file(filepath)
+        
+        return self.parse_streaming(filepath)
+    
+    def parse_streaming(self, filepath: Union[str, Path], compact: bool = False) -> ScanResult:
+        """
+        Parse an nmap XML file incrementally.
+        
+        Memory use stays flat regardless of scan size: every <host> element
+        is discarded once it has been converted. The raw XML is not kept in
+        ``raw_output``; its location is recorded in ``metadata['source_file']``.
+        
+        Args:
+            filepath: Path to nmap -oX output
+            compact: Store hosts and findings in read-only columnar tables
+                instead of lists; callers that modify findings must leave
+                this off
+        """
+        self.clear_logs()
+        
+        result = ScanResult(
+            tool="nmap",
+            target="",
+            status="completed"
+        )
+        if compact:
+            result.compact()
+        result.metadata['source_file'] = str(filepath)
+        
+        # NSE vulnerability findings go last, matching parse()
+        script_findings: List[Finding] = []
+        
+        for host, port_findings, vuln_findings in self._iter_host_elements(
+            filepath, result, script_findings
+        ):
+            result.hosts.append(host)
+            if not result.target:
+                result.target = host.address
+            result.findings.extend(port_findings)
+            script_findings.extend(vuln_findings)
+        
+        result.findings.extend(script_findings)
+        
+        if self.errors:
+            result.status = "failed"
+        
+        return result
+    
+    def iter_hosts(
+        self,
+        filepath: Union[str, Path],
+        script_findings: Optional[List[Finding]] = None
+    ) -> Iterator[Tuple[Host, List[Finding]]]:
+        """
+        Incrementally yield hosts from an nmap XML file.
+        
+        Findings that belong to no host (pre-scan and post-scan NSE scripts)
+        cannot be yielded with one; pass ``script_findings`` to collect them.
+        
+        Args:
+            filepath: Path to nmap -oX output
+            script_findings: List that receives the pre/post-scan NSE findings
+                as they are read; complete once iteration finishes
+        
+        Yields:
+            Tuples of (Host, findings) where findings holds the host's port
+            findings followed by its NSE vulnerability findings
+        """
+        self.clear_logs()
+        
+        for host, port_findings, vuln_findings in self._iter_host_elements(
+            filepath, script_findings=script_findings
+        ):
+            yield host, port_findings + vuln_findings
+    
+    def _iter_host_elements(
+        self,
+        filepath: Union[str, Path],
+        result: Optional[ScanResult] = None,
+        script_findings: Optional[List[Finding]] = None
+    ) -> Iterator[Tuple[Host, List[Finding], List[Finding]]]:
+        """
+        Walk the XML with iterparse and yield (host, port findings, vuln findings).
+        
+        Run-level attributes (version, args, start time, elapsed) are written
+        to ``result`` and pre/post-scan NSE findings to ``script_findings``
+        when given.
+        """
+        root = None
+        
+        try:
+            for event, elem in ET.iterparse(str(filepath), events=('start', 'end')):
+                if event == 'start':
+                    if root is None:
+                        root = elem
+                        if result is not None:
+                            self._apply_run_info(elem, result)
+                    continue
+                
+                if elem.tag == 'host':
+                    host = self._parse_host(elem)
+                    vuln_findings = []
+                    for script in elem.iter('script'):
+                        vuln_findings.extend(self._parse_script_output(script))
+                    
+                    if host:
+                        port_findings = [
+                            self._create_port_finding(host, port) for port in host.ports
+                        ]
+                        yield host, port_findings, vuln_findings
+                    elif script_findings is not None:
+                        script_findings.extend(vuln_findings)
+                    
+                    # Drop the finished host (and any siblings) from the tree
+                    root.clear()
+                
+                elif elem.tag in ('prescript', 'postscript'):
+                    vuln_findings = []
+                    for script in elem.iter('script'):
+                        vuln_findings.extend(self._parse_script_output(script))
+                    if script_findings is not None:
+                        script_findings.extend(vuln_findings)
+                    root.clear()
+                
+                elif elem.tag == 'finished' and result is not None:
+                    elapsed = elem.get('elapsed')
+                    if elapsed:
+                        result.duration_seconds = float(elapsed)
+        except ET.ParseError as e:
+            self._log_error(f"XML parsing error: {e}")
+    
+    def _apply_run_info(self, root: ET.Element, result: ScanResult):
+        """Copy <nmaprun> attributes into the result."""
+        result.metadata['nmap_version'] = root.get('version', '')
+        result.metadata['scan_type'] = root.get('scantype', '')
+        result.command = root.get('args', '')
+        
+        if root.get('start'):
+            result.timestamp = datetime.fromtimestamp(
+                int(root.get('start'))
+            ).isoformat()
+    
     def _parse_host(self, host_elem: ET.Element) -> Optional[Host]:
         """Parse a single host element."""
         # Get host status
@@ -4,8 +4,10 @@ Parses nuclei JSON/JSONL output format (-json) into universal ScanResult format.
 """
 
 import json
+import threading
+import time
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import IO, Dict, Iterator, List, Optional, Union
 from datetime import datetime
 
 from .base import (
@@ -14,6 +16,10 @@ from .base import (
 )
 
 
+# Shared decoder so per-line decoding doesn't build a new one each call
+_DECODER = json.JSONDecoder()
+
+
 class NucleiParser(BaseParser):
     """Parser for Nuclei JSON/JSONL output."""
     
@@ -57,24 +63,15 @@ class NucleiParser(BaseParser):
         # Parse JSONL (one JSON object per line)
         targets = set()
         
-        for line in data.strip().split('\n'):
-            if not line.strip():
-                continue
-            
-            try:
-                obj = json.loads(line)
-                finding = self._parse_finding(obj)
-                if finding:
-                    result.findings.append(finding)
-                    
-                    # Track targets
-                    target = obj.get('host', obj.get('matched-at', ''))
-                    if target:
-                        targets.add(target)
-                        
-            except json.JSONDecodeError as e:
-                self._log_warning(f"Skipping invalid JSON line: {e}")
-                continue
+        for obj in self._iter_objects(self._iter_lines(data)):
+            finding = self._parse_finding(obj)
+            if finding:
+                result.findings.append(finding)
+                
+                # Track targets
+                target = obj.get('host', obj.get('matched-at', ''))
+                if target:
+                    targets.add(target)
         
         # Set target
         if targets:
@@ -87,6 +84,149 @@ class NucleiParser(BaseParser):
         
         return result
     
+    def iter_findings(
+        self,
+        source: Union[str, Path, IO],
+        follow: bool = False,
+        poll_interval: float = 0.5,
+        stop_event: Optional[threading.Event] = None,
+        idle_timeout: Optional[float] = None
+    ) -> Iterator[Finding]:
+        """
+        Stream findings from Nuclei JSONL output one line at a time.
+        
+        Args:
+            source: Path to the JSONL file or an open file object
+            follow: Keep tailing the file for new lines (for a running scan)
+            poll_interval: Seconds to wait between reads when following
+            stop_event: Stop following once set and the file is drained
+            idle_timeout: Stop following after this many seconds without new data
+        
+        Yields:
+            Finding objects in file order
+        """
+        self.clear_logs()
+        
+        if isinstance(source, (str, Path)):
+            path = Path(source)
+            if follow:
+                # nuclei may not have created the file yet
+                if not self._wait_for_file(path, poll_interval, stop_event, idle_timeout):
+                    return
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                yield from self._iter_file_findings(
+                    f, follow, poll_interval, stop_event, idle_timeout
+                )
+            return
+        
+        yield from self._iter_file_findings(
+            source, follow, poll_interval, stop_event, idle_timeout
+        )
+    
+    def _iter_file_findings(
+        self,
+        fileobj: IO,
+        follow: bool,
+        poll_interval: float,
+        stop_event: Optional[threading.Event],
+        idle_timeout: Optional[float]
+    ) -> Iterator[Finding]:
+        """Yield findings from an open file object."""
+        if follow:
+            lines = self._follow_lines(fileobj, poll_interval, stop_event, idle_timeout)
+        else:
+            lines = iter(fileobj)
+        
+        for obj in self._iter_objects(lines):
+            finding = self._parse_finding(obj)
+            if finding:
+                yield finding
+    
+    def _iter_objects(self, lines: Iterator[Union[str, bytes]]) -> Iterator[dict]:
+        """Decode JSON objects from an iterator of lines, skipping bad ones."""
+        for line in lines:
+            if isinstance(line, bytes):
+                line = line.decode('utf-8', errors='ignore')
+            
+            line = line.strip()
+            if not line:
+                continue
+            
+            try:
+                obj = _DECODER.decode(line)
+            except json.JSONDecodeError as e:
+                self._log_warning(f"Skipping invalid JSON line: {e}")
+                continue
+            
+            if isinstance(obj, dict):
+                yield obj
+    
+    @staticmethod
+    def _iter_lines(data: str) -> Iterator[str]:
+        """Iterate over the lines of a string without copying it."""
+        start = 0
+        length = len(data)
+        while start < length:
+            end = data.find('\n', start)
+            if end == -1:
+                end = length
+            yield data[start:end]
+            start = end + 1
+    
+    @staticmethod
+    def _follow_lines(
+        fileobj: IO,
+        poll_interval: float,
+        stop_event: Optional[threading.Event],
+        idle_timeout: Optional[float]
+    ) -> Iterator[Union[str, bytes]]:
+        """Tail a file, yielding only complete lines until stopped or idle."""
+        buffer = None
+        last_data = time.monotonic()
+        
+        while True:
+            chunk = fileobj.readline()
+            if chunk:
+                last_data = time.monotonic()
+                buffer = chunk if buffer is None else buffer + chunk
+                if buffer[-1:] in ('\n', b'\n'):
+                    yield buffer
+                    buffer = None
+                continue
+            
+            if stop_event is not None and stop_event.is_set():
+                # Lines written just before the stop signal are still unread
+                for chunk in iter(fileobj.readline, chunk):
+                    buffer = chunk if buffer is None else buffer + chunk
+                    if buffer[-1:] in ('\n', b'\n'):
+                        yield buffer
+                        buffer = None
+                break
+            if idle_timeout is not None and time.monotonic() - last_data >= idle_timeout:
+                break
+            time.sleep(poll_interval)
+        
+        # Writer is done; a trailing line without newline is still complete
+        if buffer:
+            yield buffer
+    
+    @staticmethod
+    def _wait_for_file(
+        path: Path,
+        poll_interval: float,
+        stop_event: Optional[threading.Event],
+        idle_timeout: Optional[float]
+    ) -> bool:
+        """Wait for a file to appear. Returns False if stopped first."""
+        started = time.monotonic()
+        while not path.exists():
+            if stop_event is not None and stop_event.is_set():
+                return False
+            if idle_timeout is not None and time.monotonic() - started >= idle_timeout:
+                return False
+            time.sleep(poll_interval)
+        return True
+    
     def _parse_finding(self, obj: dict) -> Optional[Finding]:
         """Parse a single Nuclei result object into a Finding."""
         # Handle different nuclei output versions
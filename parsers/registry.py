@@ -0,0 +1,256 @@
+"""
+Parser registry and multi-file parse engine for CyberToolkit.
+Detects the right parser for each tool output file and parses many files in parallel.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, Union
+
+from .base import BaseParser, ScanResult
+from .nmap_parser import NmapParser
+from .nuclei_parser import NucleiParser
+
+
+# Built-in parsers, checked in this order
+DEFAULT_PARSERS: List[Type[BaseParser]] = [NmapParser, NucleiParser]
+
+
+def _parse_worker(parser_cls: Type[BaseParser], filepath: str) -> Tuple[Optional[ScanResult], List[str]]:
+    """Parse one file in a worker process. Returns (result, errors)."""
+    parser = parser_cls()
+    try:
+        result = parser.parse_file(filepath)
+    except Exception as e:
+        return None, [f"{filepath}: {e}"]
+
+    result.metadata['source_file'] = filepath
+    return result, [f"{filepath}: {err}" for err in parser.get_errors()]
+
+
+class ParserRegistry:
+    """Registry of output parsers with content-based auto-detection."""
+
+    # Bytes read from each file for can_parse()
+    SNIFF_BYTES = 8192
+    # Keep reading up to this many bytes looking for the end of the first line
+    MAX_SNIFF_BYTES = 1024 * 1024
+
+    def __init__(self, plugin_manager: Optional[Any] = None, include_defaults: bool = True):
+        """
+        Initialize ParserRegistry.
+
+        Args:
+            plugin_manager: PluginManager whose parser plugins are also tried
+            include_defaults: Register the built-in nmap and nuclei parsers
+        """
+        self._parsers: Dict[str, Type[BaseParser]] = {}
+        self._instances: Dict[str, BaseParser] = {}
+        self.plugin_manager = plugin_manager
+        self.errors: List[str] = []
+        self.unmatched: List[str] = []
+
+        if include_defaults:
+            for parser_cls in DEFAULT_PARSERS:
+                self.register(parser_cls)
+
+    def register(self, parser_cls: Type[BaseParser]):
+        """Register a parser class under its tool name."""
+        self._parsers[parser_cls.tool_name] = parser_cls
+        self._instances[parser_cls.tool_name] = parser_cls()
+
+    def unregister(self, tool_name: str) -> bool:
+        """Remove a registered parser."""
+        if tool_name in self._parsers:
+            del self._parsers[tool_name]
+            del self._instances[tool_name]
+            return True
+        return False
+
+    def list_parsers(self) -> List[str]:
+        """List registered parser tool names."""
+        return list(self._parsers.keys())
+
+    def get_parser(self, tool_name: str) -> Optional[Type[BaseParser]]:
+        """Get a registered parser class by tool name."""
+        return self._parsers.get(tool_name)
+
+    def _sniff(self, filepath: Path) -> str:
+        """Read the head of a file, extending to the end of the first line."""
+        with open(filepath, 'rb') as f:
+            head = f.read(self.SNIFF_BYTES)
+            while b'\n' not in head and len(head) < self.MAX_SNIFF_BYTES:
+                chunk = f.read(self.SNIFF_BYTES)
+                if not chunk:
+                    break
+                head += chunk
+
+        return head.decode('utf-8', errors='ignore')
+
+    def _plugin_parsers(self) -> List[Any]:
+        """Get enabled parser plugins from the plugin manager."""
+        if self.plugin_manager is None:
+            return []
+        return [p for p in self.plugin_manager.get_parsers() if p.enabled]
+
+    def _plugin_matches(self, plugin: Any, filepath: Path, head: str) -> bool:
+        """Check a parser plugin against a file."""
+        can_parse = getattr(plugin, 'can_parse', None)
+        if callable(can_parse):
+            try:
+                return bool(can_parse(head))
+            except Exception:
+                return False
+
+        return filepath.suffix.lstrip('.').lower() in [
+            fmt.lower() for fmt in plugin.SUPPORTED_FORMATS
+        ]
+
+    def detect(self, filepath: Union[str, Path]) -> Optional[Union[Type[BaseParser], Any]]:
+        """
+        Detect which parser handles a file.
+
+        Returns:
+            A registered parser class, a parser plugin instance, or None
+        """
+        filepath = Path(filepath)
+
+        try:
+            head = self._sniff(filepath)
+        except OSError as e:
+            self.errors.append(f"{filepath}: {e}")
+            return None
+
+        if not head.strip():
+            return None
+
+        for tool_name, parser in self._instances.items():
+            try:
+                if parser.can_parse(head):
+                    return self._parsers[tool_name]
+            except Exception:
+                continue
+
+        for plugin in self._plugin_parsers():
+            if self._plugin_matches(plugin, filepath, head):
+                return plugin
+
+        return None
+
+    def parse_file(self, filepath: Union[str, Path]) -> Optional[ScanResult]:
+        """Detect and parse a single file. Returns None if no parser matches."""
+        results = self.parse_files([filepath], max_workers=1)
+        return results[0] if results else None
+
+    def parse_directory(
+        self,
+        directory: Union[str, Path],
+        pattern: str = "*",
+        recursive: bool = True,
+        max_workers: Optional[int] = None
+    ) -> List[ScanResult]:
+        """
+        Detect and parse every matching file in a directory.
+
+        Args:
+            directory: Directory containing tool output files
+            pattern: Glob pattern for candidate files
+            recursive: Descend into subdirectories
+            max_workers: Worker processes (default: CPU count)
+
+        Returns:
+            ScanResults ordered by file path
+        """
+        directory = Path(directory)
+        if not directory.is_dir():
+            raise NotADirectoryError(f"Not a directory: {directory}")
+
+        paths = directory.rglob(pattern) if recursive else directory.glob(pattern)
+        return self.parse_files([p for p in paths if p.is_file()], max_workers=max_workers)
+
+    def parse_files(
+        self,
+        filepaths: Iterable[Union[str, Path]],
+        max_workers: Optional[int] = None
+    ) -> List[ScanResult]:
+        """
+        Detect and parse a set of files, using a process pool for built-in parsers.
+
+        Parser plugins are loaded from arbitrary files and cannot be sent
+        to worker processes, so files they match are parsed in this process.
+
+        Args:
+            filepaths: Files to parse
+            max_workers: Worker processes (default: CPU count, 1 disables the pool)
+
+        Returns:
+            ScanResults ordered by file path; unmatched files are listed in
+            ``self.unmatched`` and failures in ``self.errors``
+        """
+        self.errors = []
+        self.unmatched = []
+
+        pool_jobs: List[Tuple[int, Type[BaseParser], str]] = []
+        plugin_jobs: List[Tuple[int, Any, str]] = []
+
+        for index, filepath in enumerate(sorted(str(p) for p in filepaths)):
+            handler = self.detect(filepath)
+            if handler is None:
+                self.unmatched.append(filepath)
+            elif isinstance(handler, type):
+                pool_jobs.append((index, handler, filepath))
+            else:
+                plugin_jobs.append((index, handler, filepath))
+
+        results: Dict[int, ScanResult] = {}
+
+        workers = max_workers or os.cpu_count() or 1
+        if workers > 1 and len(pool_jobs) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(pool_jobs))) as executor:
+                outcomes = executor.map(
+                    _parse_worker,
+                    [cls for _, cls, _ in pool_jobs],
+                    [path for _, _, path in pool_jobs],
+                    chunksize=max(1, len(pool_jobs) // (workers * 4))
+                )
+                for (index, _, _), (result, errors) in zip(pool_jobs, outcomes):
+                    self._collect(results, index, result, errors)
+        else:
+            for index, parser_cls, filepath in pool_jobs:
+                self._collect(results, index, *_parse_worker(parser_cls, filepath))
+
+        for index, plugin, filepath in plugin_jobs:
+            self._collect(results, index, *self._parse_with_plugin(plugin, filepath))
+
+        return [results[index] for index in sorted(results)]
+
+    def _collect(
+        self,
+        results: Dict[int, ScanResult],
+        index: int,
+        result: Optional[ScanResult],
+        errors: List[str]
+    ):
+        """Store a worker outcome."""
+        self.errors.extend(errors)
+        if result is not None:
+            results[index] = result
+
+    def _parse_with_plugin(self, plugin: Any, filepath: str) -> Tuple[Optional[ScanResult], List[str]]:
+        """Parse a file with a ParserPlugin, converting its dict output."""
+        try:
+            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+                data = plugin.parse(f.read())
+        except Exception as e:
+            return None, [f"{filepath}: {e}"]
+
+        if isinstance(data, ScanResult):
+            result = data
+        else:
+            data = dict(data or {})
+            data.setdefault('tool', plugin.PLUGIN_ID)
+            result = ScanResult.from_dict(data)
+
+        result.metadata['source_file'] = filepath
+        return result, []
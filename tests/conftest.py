@@ -0,0 +1,74 @@
+import os
+import stat
+import sys
+
+import pytest
+
+
+@pytest.fixture
+def install_tool(tmp_path, monkeypatch):
+    """
+    Put fake command-line tools on PATH for one test.
+
+    Returns install(name, source, **fields): the script source is formatted
+    with {python} (the running interpreter) and any extra fields.
+    """
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+
+    def install(name, source, **fields):
+        tool = bin_dir / name
+        tool.write_text(source.format(python=sys.executable, **fields))
+        tool.chmod(tool.stat().st_mode | stat.S_IEXEC)
+        return tool
+
+    return install
+
+
+# Fake nuclei: one JSONL finding per target (comma-separated -u values or a
+# -l file), written to -o or stdout. --fail exits with an error, --wait FILE
+# blocks until FILE exists and --sleep SECONDS delays; start and end times
+# are appended to {log}.
+FAKE_NUCLEI = """#!{python}
+import json, os, sys, time
+args = sys.argv[1:]
+
+def value(flag):
+    return args[args.index(flag) + 1] if flag in args else None
+
+with open({log!r}, "a") as f:
+    f.write("start %f\\n" % time.time())
+if "--fail" in args:
+    sys.stderr.write("boom\\n")
+    sys.exit(2)
+if value("--wait"):
+    while not os.path.exists(value("--wait")):
+        time.sleep(0.01)
+time.sleep(float(value("--sleep") or 0))
+
+targets = []
+if value("-u"):
+    targets = value("-u").split(",")
+elif value("-l"):
+    targets = open(value("-l")).read().split()
+out = open(value("-o"), "w") if value("-o") else sys.stdout
+for i, target in enumerate(targets):
+    out.write(json.dumps({{
+        "template-id": "tmpl-%d" % i,
+        "info": {{"name": "tmpl-%d" % i, "severity": "high", "tags": "cve"}},
+        "host": target,
+        "matched-at": target
+    }}) + "\\n")
+out.close()
+with open({log!r}, "a") as f:
+    f.write("end %f\\n" % time.time())
+"""
+
+
+@pytest.fixture
+def fake_nuclei(install_tool, tmp_path):
+    """Install FAKE_NUCLEI on PATH; returns the file it logs start and end times to."""
+    log = tmp_path / "nuclei.log"
+    install_tool("nuclei", FAKE_NUCLEI, log=str(log))
+    return log
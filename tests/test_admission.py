@@ -0,0 +1,46 @@
+from datetime import datetime
+
+from automation.admission import AdmissionController, target_key
+
+
+def test_target_key_groups_networks():
+    assert target_key("10.0.0.5") == "10.0.0.0/24"
+    assert target_key("10.0.0.0/28") == "10.0.0.0/24"
+    assert target_key("10.0.0.0/16") == "10.0.0.0/16"
+    assert target_key("2001:db8::1") == "2001:db8::/64"
+    assert target_key("Example.com") == "example.com"
+
+
+def test_slots_are_taken_all_or_nothing():
+    admission = AdmissionController(max_global=3, per_tool={"nuclei": 1}, per_target=2, per_project=0)
+
+    assert admission.try_acquire("a", ["nuclei"], "10.0.0.1", 1)
+    # nuclei is full; the job must not keep its global or target slot either
+    assert not admission.try_acquire("b", ["httpx", "nuclei"], "10.0.0.2", 1)
+    assert admission.try_acquire("c", ["httpx"], "10.0.0.3", 1)
+    # a and c hold both slots for 10.0.0.0/24
+    assert not admission.try_acquire("d", ["nmap"], "10.0.0.9", 2)
+    assert admission.try_acquire("e", ["nmap"], "10.0.1.9", 2)
+    assert not admission.try_acquire("f", ["nmap"], "example.com", 2)  # global limit
+    assert admission.running == 3
+
+    admission.release("a")
+    assert admission.try_acquire("b", ["httpx", "nuclei"], "10.0.0.2", 1)
+
+
+def test_host_load_holds_back_starts():
+    load = {"value": 3.0}
+    admission = AdmissionController(max_load=1.5, load_probe=lambda: load["value"])
+    assert not admission.try_acquire("a", [], "example.com", None)
+    load["value"] = 0.5
+    assert admission.try_acquire("a", [], "example.com", None)
+
+
+def test_deferred_slots_are_spread_out():
+    admission = AdmissionController(spacing=10)
+    now = datetime(2026, 10, 16, 12, 0)
+    slots = [admission.defer(now) for _ in range(6)]
+    for i, slot in enumerate(slots):
+        offset = (slot - now).total_seconds()
+        assert 10 * (i + 1) <= offset < 10 * (i + 2)
+    assert len(set(slots)) == len(slots)
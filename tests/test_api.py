@@ -1,14 +1,27 @@
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
+from functools import partial
+import json
 import os
 import sys
+import tempfile
 from pathlib import Path
 
 # Add project root to sys.path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from api.main import app, get_pm
+import core.app_context
+from automation.scheduler import SmartScheduler
+from core.project import ProjectManager
+
+# Keep the app's workspace and schedule databases out of the source tree
+_state_dir = tempfile.TemporaryDirectory(prefix="cybertoolkit-api-test-")
+with patch.object(core.app_context, "SmartScheduler",
+                  partial(SmartScheduler, storage_path=Path(_state_dir.name) / "schedules.db")), \
+        patch.object(core.app_context, "ProjectManager",
+                     partial(ProjectManager, db_path=str(Path(_state_dir.name) / "workspace.db"))):
+    from api.main import app, get_pm
 
 # Create a mock ProjectManager
 mock_pm = MagicMock()
@@ -74,3 +87,124 @@ def test_api_auth_middleware_no_key_provided(mock_load_key):
     response = client.get("/api/projects/1/findings/stats")
     assert response.status_code == 401
     assert response.json() == {"detail": "Invalid or missing API key"}
+
+@patch("api.main._load_api_key")
+def test_stats_endpoint_uses_workspace_stats(mock_load_key):
+    """Dashboard stats come from one aggregate call."""
+    mock_load_key.return_value = ""
+    mock_pm.get_workspace_stats.return_value = {
+        "total_projects": 2, "total_targets": 5, "total_scans": 3, "total_findings": 40
+    }
+
+    response = client.get("/api/stats")
+
+    assert response.status_code == 200
+    assert response.json()["total_findings"] == 40
+    mock_pm.list_projects.assert_not_called()
+
+@patch("api.main._load_api_key")
+def test_list_findings_is_paginated(mock_load_key):
+    """List endpoints return a page envelope and pass filters down."""
+    from core.pagination import Page
+    mock_load_key.return_value = ""
+    mock_pm.page_findings.return_value = Page(items=[], next_cursor="abc", limit=25)
+
+    response = client.get("/api/projects/1/findings?severity=high&limit=25&order=asc")
+
+    assert response.status_code == 200
+    assert response.json() == {"items": [], "next_cursor": "abc", "limit": 25}
+    kwargs = mock_pm.page_findings.call_args.kwargs
+    assert kwargs["severity"].value == "high"
+    assert kwargs["limit"] == 25 and kwargs["descending"] is False
+
+    assert client.get("/api/projects/1/findings?limit=100000").status_code == 422
+    mock_pm.page_findings.side_effect = ValueError("Invalid cursor: x")
+    assert client.get("/api/projects/1/findings?cursor=x").status_code == 400
+    mock_pm.page_findings.side_effect = None
+
+@patch("api.main._load_api_key")
+def test_export_findings_streams_ndjson(mock_load_key, tmp_path):
+    """The export endpoint streams one JSON document per finding."""
+    from core.project import ProjectManager
+    mock_load_key.return_value = ""
+    pm = ProjectManager(db_path=str(tmp_path / "export.db"))
+    project = pm.create_project(name="export")
+    scan = pm.create_scan(project.id, tool="nmap", command="nmap")
+    for i in range(3):
+        pm.add_finding(scan.id, "port", "info", f"Port {i}")
+
+    app.dependency_overrides[get_pm] = lambda: pm
+    try:
+        response = client.get(f"/api/projects/{project.id}/findings/export?format=ndjson")
+        missing = client.get("/api/projects/999/findings/export")
+    finally:
+        app.dependency_overrides[get_pm] = lambda: mock_pm
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [l["title"] for l in lines] == ["Port 0", "Port 1", "Port 2"]
+    assert missing.status_code == 404
+
+@patch("api.main._load_api_key")
+def test_slow_handler_does_not_block_event_loop(mock_load_key):
+    """ProjectManager calls run in worker threads, so other requests keep flowing."""
+    import asyncio
+    import threading
+    import httpx
+
+    mock_load_key.return_value = ""
+    release = threading.Event()
+
+    def slow_stats(project_id):
+        release.wait(timeout=5)
+        return {"total": 1}
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            slow = asyncio.create_task(ac.get("/api/projects/1/findings/stats"))
+            await asyncio.sleep(0.05)
+            health = await asyncio.wait_for(ac.get("/health"), timeout=2)
+            assert not slow.done()
+            release.set()
+            return health, await slow
+
+    mock_pm.get_finding_stats.side_effect = slow_stats
+    try:
+        health, slow = asyncio.run(scenario())
+    finally:
+        mock_pm.get_finding_stats.side_effect = None
+
+    assert health.status_code == 200
+    assert slow.json() == {"total": 1}
+
+@patch("api.main.ctx")
+@patch("api.main._load_api_key")
+def test_create_scan_queues_for_runner(mock_load_key, mock_ctx):
+    """Valid scans are queued for the runner; invalid ones, or any without an API key, are rejected."""
+    from api.main import get_scan_runner
+    mock_load_key.return_value = "secret"
+    headers = {"X-API-Key": "secret"}
+    runner = MagicMock()
+    app.dependency_overrides[get_scan_runner] = lambda: runner
+    mock_pm.create_scan.return_value.to_dict.return_value = {
+        "id": 7, "tool": "nmap", "status": "pending", "target_id": None
+    }
+    try:
+        response = client.post("/api/projects/1/scans", json={"tool": "nmap", "command": "nmap -sV 10.0.0.1"},
+                               headers=headers)
+        runner.build_command.side_effect = ValueError("Tool not allowed: bash")
+        rejected = client.post("/api/projects/1/scans", json={"tool": "bash", "command": "bash -c id"},
+                               headers=headers)
+        mock_load_key.return_value = ""
+        keyless = client.post("/api/projects/1/scans", json={"tool": "nmap", "command": "nmap -sV 10.0.0.1"})
+    finally:
+        del app.dependency_overrides[get_scan_runner]
+
+    assert response.status_code == 201
+    assert response.json()["id"] == 7
+    assert mock_pm.create_scan.call_args.kwargs["queue"] is True
+    runner.notify.assert_called_once_with()
+    assert rejected.status_code == 400
+    assert keyless.status_code == 403
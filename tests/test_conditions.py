@@ -0,0 +1,135 @@
+from unittest.mock import patch
+
+import pytest
+
+from core.conditions import compile_condition, output_metrics
+from core.workflow import StepStatus, Workflow, WorkflowEngine, WorkflowStep
+
+
+def test_condition_compiles_and_evaluates():
+    metrics = {
+        'probe': {'exists': True, 'lines': 3, 'size': 40, 'findings': 2, 'status': 'completed'},
+        'scan': {'exists': False, 'lines': 0, 'size': 0, 'findings': 0, 'status': 'skipped'},
+    }
+    assert compile_condition("probe.count > 0")(metrics)
+    assert compile_condition("probe.findings >= 2 and not scan.exists")(metrics)
+    assert compile_condition("scan.status == 'skipped' or scan.size > 0")(metrics)
+    assert compile_condition("0 < probe.lines <= 3")(metrics)
+    assert not compile_condition("probe.bytes > 100 or (scan.exists == true)")(metrics)
+    # Steps without metrics read as not yet run
+    assert compile_condition("missing.count == 0 and missing.status == 'pending'")(metrics)
+    assert compile_condition("probe.count > -1").references == {'probe'}
+    assert compile_condition("probe.findings > 0 or probe.bytes > 0").reads == {('probe', 'findings'), ('probe', 'size')}
+
+
+@pytest.mark.parametrize("source", [
+    "__import__('os').system('true')",
+    "probe.count.real > 0",
+    "probe.secret",
+    "len(probe) > 0",
+    "probe.count + 1 > 0",
+    "count > 0",
+    "probe.count >",
+])
+def test_condition_rejects_unsupported_expressions(source):
+    with pytest.raises(ValueError):
+        compile_condition(source)
+
+
+def test_comparing_mismatched_types_raises_value_error():
+    condition = compile_condition("probe.status > 1")
+    with pytest.raises(ValueError):
+        condition({'probe': {'status': 'completed'}})
+
+
+def test_output_metrics_reads_file_once(tmp_path):
+    out = tmp_path / "out.txt"
+    out.write_text("a\n\nb\nc\n")
+
+    class CountingParser:
+        def parse(self, content):
+            return type("Result", (), {'findings': content.split()})()
+
+    with patch("builtins.open", wraps=open) as opened:
+        metrics = output_metrics(out, CountingParser())
+    assert opened.call_count == 1
+    assert metrics == {'exists': True, 'lines': 3, 'size': 7, 'findings': 3}
+    assert output_metrics(tmp_path / "missing.txt")['exists'] is False
+
+
+def test_condition_steps_become_dependencies():
+    wf = Workflow(name="conditional", steps=[
+        WorkflowStep(name="a", tool="echo"),
+        WorkflowStep(name="b", tool="echo", parallel=True),
+        WorkflowStep(name="c", tool="echo", parallel=True, condition="a.count > 0 and b.exists"),
+    ])
+    assert wf.dependency_graph()["c"] == ["a", "b"]
+
+    wf.steps[2].condition = "z.count > 0"
+    with pytest.raises(ValueError):
+        wf.dependency_graph()
+    wf.steps[2].condition = "a.count >"
+    with pytest.raises(ValueError):
+        wf.dependency_graph()
+
+
+WRITE_LINES = """#!{python}
+import sys
+count = int(sys.argv[1])
+with open(sys.argv[sys.argv.index("-o") + 1], "w") as f:
+    f.write("".join(f"line{{i}}\\n" for i in range(count)))
+"""
+
+
+def test_engine_runs_or_skips_steps_on_output_metrics(tmp_path, install_tool):
+    install_tool("writelines", WRITE_LINES)
+
+    wf = Workflow(name="conditional", steps=[
+        WorkflowStep(name="some", tool="writelines", flags="2"),
+        WorkflowStep(name="none", tool="writelines", flags="0"),
+        WorkflowStep(name="after_some", tool="writelines", flags="1", condition="some.count == 2"),
+        WorkflowStep(name="after_none", tool="writelines", flags="1", condition="none.count > 0"),
+        WorkflowStep(name="either", tool="writelines", flags="1",
+                     condition="after_none.status == 'skipped' and after_some.exists"),
+    ])
+    engine = WorkflowEngine(results_dir=tmp_path / "results")
+    results = engine.execute(wf, "example.com")
+
+    statuses = {step['name']: step['status'] for step in results['steps']}
+    assert statuses == {
+        'some': 'completed',
+        'none': 'completed',
+        'after_some': 'completed',
+        'after_none': 'skipped',
+        'either': 'completed',
+    }
+    assert wf.steps[0].metrics['output']['lines'] == 2
+    assert engine.step_metrics['none'] == {
+        'exists': True, 'lines': 0, 'size': 0, 'findings': 0, 'status': StepStatus.COMPLETED.value
+    }
+
+
+def test_engine_parses_findings_only_for_steps_a_condition_reads(tmp_path, install_tool):
+    install_tool("writelines", WRITE_LINES)
+    parsed = []
+
+    class LineParser:
+        def parse(self, content):
+            parsed.append(content)
+            return type("Result", (), {'findings': content.split()})()
+
+    wf = Workflow(name="conditional", steps=[
+        WorkflowStep(name="probe", tool="writelines", flags="3"),
+        WorkflowStep(name="scan", tool="writelines", flags="2"),
+        WorkflowStep(name="after", tool="writelines", flags="1",
+                     condition="probe.findings == 3 and scan.count == 2"),
+    ])
+    assert wf.steps_read_for('findings') == {'probe'}
+    engine = WorkflowEngine(results_dir=tmp_path / "results")
+    with patch.object(engine.registry, "get_parser", return_value=LineParser):
+        results = engine.execute(wf, "example.com")
+
+    assert [step['status'] for step in results['steps']] == ['completed'] * 3
+    assert len(parsed) == 1
+    assert engine.step_metrics['probe']['findings'] == 3
+    assert engine.step_metrics['scan']['lines'] == 2
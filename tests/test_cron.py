@@ -0,0 +1,140 @@
+import calendar
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from automation.cron import CronExpression, parse_cron
+from automation.scheduler import ScheduledJob, ScheduleType
+
+
+# Property tests draw random expressions together with the value sets they
+# denote, and check next_after against a minute-by-minute reference search.
+
+def _random_field(rng, lo, hi):
+    """Random field text and the set of values it selects."""
+    kind = rng.choice(["star", "value", "range", "step", "list"])
+    if kind == "star":
+        return "*", set(range(lo, hi + 1))
+    if kind == "value":
+        value = rng.randint(lo, hi)
+        return str(value), {value}
+    if kind == "range":
+        start = rng.randint(lo, hi)
+        end = rng.randint(start, hi)
+        return f"{start}-{end}", set(range(start, end + 1))
+    if kind == "step":
+        start = rng.randint(lo, hi)
+        step = rng.randint(1, max(1, (hi - lo) // 2))
+        if rng.random() < 0.5:
+            return f"*/{step}", set(range(lo, hi + 1, step))
+        return f"{start}/{step}", set(range(start, hi + 1, step))
+    values = rng.sample(range(lo, hi + 1), rng.randint(2, 4))
+    return ",".join(map(str, values)), set(values)
+
+
+def _random_expression(rng):
+    minute, minutes = _random_field(rng, 0, 59)
+    hour, hours = _random_field(rng, 0, 23)
+    dom, days = ("*", set(range(1, 32))) if rng.random() < 0.4 else _random_field(rng, 1, 31)
+    month, months = ("*", set(range(1, 13))) if rng.random() < 0.6 else _random_field(rng, 1, 12)
+    dow, weekdays = ("*", set(range(7))) if rng.random() < 0.5 else _random_field(rng, 0, 6)
+    expression = f"{minute} {hour} {dom} {month} {dow}"
+
+    def reference(moment):
+        weekday = (moment.weekday() + 1) % 7
+        if dom == "*" or dow == "*":
+            day_ok = moment.day in days and weekday in weekdays
+        else:
+            day_ok = moment.day in days or weekday in weekdays
+        return (moment.minute in minutes and moment.hour in hours
+                and moment.month in months and day_ok)
+
+    return expression, reference
+
+
+def _random_moment(rng):
+    return datetime(2024, 1, 1) + timedelta(seconds=rng.randint(0, 3 * 365 * 86400))
+
+
+def test_next_after_matches_reference_search():
+    rng = random.Random(20261016)
+    limit = 60 * 24 * 40  # minutes searched by the reference
+    for _ in range(120):
+        expression, reference = _random_expression(rng)
+        cron = CronExpression(expression)
+        after = _random_moment(rng)
+        found = cron.next_after(after)
+
+        moment = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        for _ in range(limit):
+            if reference(moment):
+                assert found == moment, expression
+                break
+            moment += timedelta(minutes=1)
+        else:
+            assert found is None or (found > moment and reference(found)), expression
+
+
+def test_next_after_properties():
+    rng = random.Random(7)
+    for _ in range(300):
+        expression, reference = _random_expression(rng)
+        cron = parse_cron(expression)
+        after = _random_moment(rng)
+        found = cron.next_after(after)
+        if found is None:
+            continue
+        # Strictly later, on a whole minute, matching, and a fixed point
+        assert found > after
+        assert found.second == 0 and found.microsecond == 0
+        assert cron.matches(found) and reference(found)
+        assert cron.next_after(found - timedelta(seconds=1)) == found
+        assert cron.next_after(found) > found
+
+
+@pytest.mark.parametrize("expression, after, expected", [
+    ("*/15 9-17 * * MON-FRI", datetime(2026, 10, 16, 17, 50), datetime(2026, 10, 19, 9, 0)),
+    ("0 0 31 * *", datetime(2026, 11, 1), datetime(2026, 12, 31)),
+    ("0 0 29 2 *", datetime(2026, 3, 1), datetime(2028, 2, 29)),
+    ("0 0 L * *", datetime(2028, 2, 1), datetime(2028, 2, 29)),
+    ("0 0 LW * *", datetime(2026, 10, 1), datetime(2026, 10, 30)),
+    ("0 0 1W * *", datetime(2026, 11, 1), datetime(2026, 11, 2)),
+    ("0 0 31W * *", datetime(2026, 5, 1), datetime(2026, 5, 29)),
+    ("30 4 * * 5L", datetime(2026, 10, 1), datetime(2026, 10, 30, 4, 30)),
+    ("0 12 1 * 1", datetime(2026, 10, 16), datetime(2026, 10, 19, 12, 0)),
+    ("0 0 * JAN,jul sun", datetime(2026, 2, 1), datetime(2026, 7, 5)),
+    ("*/20 * * * * *", datetime(2026, 10, 16, 12, 0, 45), datetime(2026, 10, 16, 12, 1, 0)),
+    ("@hourly", datetime(2026, 10, 16, 12, 0), datetime(2026, 10, 16, 13, 0)),
+])
+def test_next_after_examples(expression, after, expected):
+    assert CronExpression(expression).next_after(after) == expected
+
+
+def test_impossible_expression_never_fires():
+    assert CronExpression("0 0 30 2 *").next_after(datetime(2026, 1, 1)) is None
+
+
+@pytest.mark.parametrize("expression", [
+    "* * * *", "60 * * * *", "* 24 * * *", "* * 0 * *", "* * * 13 *",
+    "* * * * 8", "*/0 * * * *", "5-1 * * * *", "* * * * FOO", "* * 32W * *",
+])
+def test_invalid_expressions_raise(expression):
+    with pytest.raises(ValueError):
+        CronExpression(expression)
+
+
+def test_scheduled_job_cron_and_monthly_day_31():
+    job = ScheduledJob(
+        id="", name="cron", project_id=1, workflow_name="web_recon", target="example.com",
+        schedule_type=ScheduleType.CRON, schedule_config={"expression": "*/5 * * * *"}
+    )
+    assert job.next_run > datetime.now() and job.next_run.minute % 5 == 0
+
+    monthly = ScheduledJob(
+        id="", name="monthly", project_id=1, workflow_name="web_recon", target="example.com",
+        schedule_type=ScheduleType.MONTHLY, schedule_config={"day": 31, "hour": 1}
+    )
+    run = monthly.next_run
+    assert run > datetime.now()
+    assert run.day == min(31, calendar.monthrange(run.year, run.month)[1])
@@ -0,0 +1,48 @@
+import threading
+
+import pytest
+
+from core.database import session_scope
+from core.project import ProjectManager
+
+
+@pytest.fixture
+def pm(tmp_path):
+    manager = ProjectManager(db_path=str(tmp_path / "workspace.db"))
+    yield manager
+    manager.close()
+
+
+def test_sqlite_connections_use_wal_and_busy_timeout(pm):
+    with pm.db.engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+
+
+def test_sessions_are_per_thread_and_per_scope(pm):
+    main_session = pm.db.session
+    assert pm.db.session is main_session
+
+    with session_scope():
+        scoped = pm.db.session
+        assert scoped is not main_session
+        assert pm.db.session is scoped
+    assert pm.db.session is main_session
+
+    seen = []
+    thread = threading.Thread(target=lambda: seen.append(pm.db.session))
+    thread.start()
+    thread.join()
+    assert seen[0] is not main_session
+
+    # Concurrent writers each commit through their own session
+    def work(i):
+        with session_scope():
+            pm.create_project(name=f"concurrent-{i}")
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(pm.list_projects()) == 8
@@ -0,0 +1,88 @@
+import json
+import sqlite3
+
+import pytest
+
+from automation.job_store import SQLiteJobStore, migrate_json_store, open_job_store
+from automation.scheduler import ScanScheduler, ScheduleType
+
+
+def _job(job_id, next_run):
+    return {
+        "id": job_id, "name": f"job-{job_id}", "project_id": 1, "workflow_name": "web_recon",
+        "target": "example.com", "schedule_type": "daily", "schedule_config": {"hour": 2},
+        "enabled": True, "created_at": "2026-10-01T00:00:00", "last_run": None,
+        "next_run": next_run, "run_count": 0, "status": "pending", "metadata": {"tags": ["a"]}
+    }
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def store(request, tmp_path):
+    store = open_job_store(tmp_path / ("jobs.json" if request.param == "json" else "jobs.db"))
+    yield store
+    store.close()
+
+
+def test_store_upserts_deletes_and_orders_by_next_run(store):
+    store.save_many([_job("a", "2026-10-20T02:00:00"), _job("b", None), _job("c", "2026-10-17T02:00:00")])
+    updated = _job("a", "2026-10-16T02:00:00")
+    updated["run_count"] = 3
+    store.save(updated)
+    store.delete("c")
+    store.delete("missing")
+
+    jobs = store.load()
+    assert [job["id"] for job in jobs] == ["a", "b"]
+    assert jobs[0]["run_count"] == 3 and jobs[0]["metadata"] == {"tags": ["a"]}
+
+
+def test_sqlite_store_uses_wal_and_indexes_next_run(tmp_path):
+    store = SQLiteJobStore(tmp_path / "jobs.db")
+    store.save(_job("a", "2026-10-20T02:00:00"))
+    store.close()
+
+    conn = sqlite3.connect(tmp_path / "jobs.db")
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        indexes = [row[1] for row in conn.execute("PRAGMA index_list(scheduled_jobs)")]
+        columns = {column for name in indexes for column in
+                   (row[2] for row in conn.execute(f"PRAGMA index_info({name})"))}
+        assert "next_run" in columns
+        assert conn.execute("SELECT count(*) FROM scheduled_jobs").fetchone()[0] == 1
+    finally:
+        conn.close()
+
+
+def test_migration_imports_json_file_once(tmp_path):
+    legacy = tmp_path / "schedules.json"
+    legacy.write_text(json.dumps({"jobs": [_job("a", None), _job("b", None)]}))
+    store = SQLiteJobStore(tmp_path / "schedules.db")
+
+    assert migrate_json_store(legacy, store) == 2
+    assert not legacy.exists() and (tmp_path / "schedules.json.migrated").exists()
+    assert migrate_json_store(legacy, store) == 0
+    assert sorted(job["id"] for job in store.load()) == ["a", "b"]
+    store.close()
+
+
+def test_scheduler_state_survives_restart(tmp_path):
+    path = tmp_path / "schedules.db"
+    scheduler = ScanScheduler(storage_path=path)
+    kept = scheduler.add_job("kept", 1, "web_recon", "example.com", ScheduleType.CRON,
+                             {"expression": "0 3 * * *"})
+    paused = scheduler.add_job("paused", 1, "web_recon", "example.org", ScheduleType.DAILY)
+    removed = scheduler.add_job("removed", 1, "web_recon", "example.net", ScheduleType.DAILY)
+    scheduler.pause_job(paused.id)
+    scheduler.remove_job(removed.id)
+    scheduler.register_executor(lambda job: True)
+    assert scheduler.run_now(kept.id)
+    scheduler.close()
+
+    reopened = ScanScheduler(storage_path=path)
+    try:
+        assert set(reopened.jobs) == {kept.id, paused.id}
+        assert reopened.jobs[kept.id].run_count == 1
+        assert reopened.jobs[kept.id].next_run == kept.next_run
+        assert not reopened.jobs[paused.id].enabled
+    finally:
+        reopened.close()
@@ -0,0 +1,111 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine, event, inspect
+
+from core.database import Base, FindingStatus, Severity
+from core.migrations import MIGRATIONS, get_schema_version, run_migrations
+from core.project import ProjectManager
+
+
+@pytest.fixture
+def pm(tmp_path):
+    manager = ProjectManager(db_path=str(tmp_path / "workspace.db"))
+    yield manager
+    manager.close()
+
+
+def _query_plan(pm, call):
+    """Run a ProjectManager call and EXPLAIN the SELECT statements it issued."""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(pm.db.engine, "before_cursor_execute", capture)
+    try:
+        call()
+    finally:
+        event.remove(pm.db.engine, "before_cursor_execute", capture)
+
+    raw = pm.db.engine.raw_connection()
+    try:
+        plans = []
+        for statement, parameters in captured:
+            rows = raw.cursor().execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            plans.append(" | ".join(row[-1] for row in rows))
+        return plans
+    finally:
+        raw.close()
+
+
+def test_legacy_workspace_is_upgraded_in_place(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    pm = ProjectManager(db_path=str(db_path))
+    pm.create_project(name="legacy")
+    pm.close()
+
+    # Simulate a workspace created before the indexes existed
+    conn = sqlite3.connect(db_path)
+    names = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'ix_%'"
+    )]
+    for name in names:
+        conn.execute(f"DROP INDEX {name}")
+    conn.execute("DROP TABLE schema_migrations")
+    conn.commit()
+    conn.close()
+
+    pm = ProjectManager(db_path=str(db_path))
+    indexes = {ix["name"] for ix in inspect(pm.db.engine).get_indexes("findings")}
+
+    assert names
+    assert "ix_findings_scan_severity_status" in indexes
+    assert get_schema_version(pm.db.engine) == MIGRATIONS[-1].version
+    assert pm.get_project_by_name("legacy") is not None
+    pm.close()
+
+
+def test_migrations_are_versioned_and_reading_version_is_read_only(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'bare.db'}")
+    assert get_schema_version(engine) == 0
+    assert inspect(engine).get_table_names() == []
+
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        for row in conn.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'ix_%'"
+        ).all():
+            conn.exec_driver_sql(f"DROP INDEX {row[0]}")
+        MIGRATIONS[0].upgrade(conn)
+
+    scan_indexes = {ix["name"] for ix in inspect(engine).get_indexes("scans")}
+    assert "ix_scans_project_tool" in scan_indexes
+    assert "ix_scans_status" not in scan_indexes
+
+    assert run_migrations(engine) == [migration.version for migration in MIGRATIONS]
+    assert "ix_scans_status" in {ix["name"] for ix in inspect(engine).get_indexes("scans")}
+    engine.dispose()
+
+
+def test_hot_queries_use_indexes(pm):
+    project = pm.create_project(name="plans")
+    project_id = project.id
+
+    plans = _query_plan(pm, lambda: pm.get_findings(
+        scan_id=1, severity=Severity.HIGH, status=FindingStatus.OPEN
+    ))
+    assert any("ix_findings_scan_severity_status" in p for p in plans)
+
+    plans = _query_plan(pm, lambda: pm.get_scans(project_id, tool="nmap"))
+    assert any("ix_scans_project_tool" in p for p in plans)
+
+    plans = _query_plan(pm, lambda: pm.get_targets(project_id))
+    assert any("ix_targets_project_id" in p for p in plans)
+
+    plans = _query_plan(pm, lambda: pm.load_session("default"))
+    assert any("ix_sessions_name" in p for p in plans)
+
+    plans = _query_plan(pm, lambda: pm.get_finding_stats(project_id))
+    assert any("ix_findings_scan_severity_status" in p for p in plans)
@@ -0,0 +1,346 @@
+import json
+import pickle
+import struct
+import threading
+import time
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.enterprise import ParserPlugin
+from parsers.archive import ArchiveError, ScanArchive, write_archive
+from parsers.base import Finding, FindingType, Host, ScanResult, Severity
+from parsers.compact import FindingTable, HostTable
+from parsers.nmap_parser import NmapParser
+from parsers.nuclei_parser import NucleiParser
+from parsers.registry import ParserRegistry
+
+
+NMAP_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<nmaprun scanner="nmap" args="nmap -sV -oX out.xml 10.0.0.0/30" start="1700000000" version="7.94">
+<prescript><script id="broadcast-vuln" output="nothing"/></prescript>
+<host><status state="up"/><address addr="10.0.0.1" addrtype="ipv4"/>
+<hostnames><hostname name="gw.local"/></hostnames>
+<ports>
+<port protocol="tcp" portid="22"><state state="open"/><service name="ssh" product="OpenSSH" version="9.0"/></port>
+<port protocol="tcp" portid="23"><state state="open"/><service name="telnet"/>
+<script id="telnet-vuln" output="VULNERABLE: CVE-2020-0001"/></port>
+</ports></host>
+<host><status state="up"/><address addr="10.0.0.2" addrtype="ipv4"/>
+<ports><port protocol="tcp" portid="80"><state state="open"/><service name="http"/></port></ports>
+</host>
+<runstats><finished time="1700000042" elapsed="42.5"/></runstats>
+</nmaprun>
+"""
+
+
+def _write_nmap(tmp_path):
+    path = tmp_path / "scan.xml"
+    path.write_text(NMAP_XML)
+    return path
+
+
+def test_nmap_iter_hosts_yields_hosts_with_findings(tmp_path):
+    parser = NmapParser()
+    script_findings = []
+    hosts = list(parser.iter_hosts(_write_nmap(tmp_path), script_findings=script_findings))
+
+    assert [h.address for h, _ in hosts] == ["10.0.0.1", "10.0.0.2"]
+    first_host, first_findings = hosts[0]
+    assert first_host.hostname == "gw.local"
+    assert [f.type for f in first_findings] == [
+        FindingType.PORT, FindingType.PORT, FindingType.VULNERABILITY
+    ]
+    assert first_findings[1].severity == Severity.MEDIUM
+    assert [f.title for f in script_findings] == ["NSE Script: broadcast-vuln"]
+
+
+def test_nmap_streaming_matches_in_memory_parse(tmp_path):
+    path = _write_nmap(tmp_path)
+    parser = NmapParser()
+
+    expected = parser.parse(NMAP_XML)
+    streamed = parser.parse_streaming(path)
+
+    assert streamed.status == "completed"
+    assert streamed.command == expected.command
+    assert streamed.duration_seconds == 42.5
+    assert streamed.target == expected.target
+    assert [h.to_dict() for h in streamed.hosts] == [h.to_dict() for h in expected.hosts]
+    assert [f.to_dict() for f in streamed.findings] == [f.to_dict() for f in expected.findings]
+    assert streamed.raw_output == ""
+
+
+def test_nmap_parse_file_switches_to_streaming(tmp_path):
+    path = _write_nmap(tmp_path)
+    parser = NmapParser()
+    parser.STREAMING_THRESHOLD = 0
+
+    result = parser.parse_file(path)
+
+    assert result.metadata["source_file"] == str(path)
+    assert len(result.hosts) == 2
+    # Large files still come back as plain, mutable lists
+    assert isinstance(result.findings, list) and isinstance(result.hosts, list)
+    result.findings[0].severity = Severity.HIGH
+    assert result.findings[0].severity == Severity.HIGH
+
+    assert isinstance(parser.parse_streaming(path, compact=True).findings, FindingTable)
+
+
+def test_nmap_streaming_truncated_file_is_partial(tmp_path):
+    path = tmp_path / "truncated.xml"
+    path.write_text(NMAP_XML[:NMAP_XML.index("<runstats>")])
+    parser = NmapParser()
+
+    result = parser.parse_streaming(path)
+
+    assert result.status == "failed"
+    assert len(result.hosts) == 2
+    assert parser.get_errors()
+
+
+def _nuclei_line(template_id, severity="high", host="https://a.example.com"):
+    return json.dumps({
+        "template-id": template_id,
+        "info": {"name": template_id, "severity": severity, "tags": "cve,rce"},
+        "host": host,
+        "matched-at": host + "/x",
+    }) + "\n"
+
+
+def test_nuclei_iter_findings_from_path(tmp_path):
+    path = tmp_path / "nuclei.jsonl"
+    path.write_text(_nuclei_line("cve-2024-1") + "not json\n\n" + _nuclei_line("exposed-git", "low"))
+    parser = NucleiParser()
+
+    findings = list(parser.iter_findings(path))
+
+    assert [f.metadata["template_id"] for f in findings] == ["cve-2024-1", "exposed-git"]
+    assert findings[1].type == FindingType.EXPOSURE
+    assert len(parser.get_warnings()) == 1
+
+
+def test_nuclei_iter_findings_follow_mode(tmp_path):
+    path = tmp_path / "running.jsonl"
+    stop = threading.Event()
+    parser = NucleiParser()
+
+    def writer():
+        with open(path, "w") as f:
+            first = _nuclei_line("cve-2024-1")
+            f.write(first[:20])
+            f.flush()
+            time.sleep(0.05)
+            f.write(first[20:])
+            f.flush()
+            time.sleep(0.05)
+            f.write(_nuclei_line("cve-2024-2"))
+        stop.set()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    findings = list(parser.iter_findings(path, follow=True, poll_interval=0.01, stop_event=stop))
+    thread.join()
+
+    assert [f.metadata["template_id"] for f in findings] == ["cve-2024-1", "cve-2024-2"]
+    assert parser.get_warnings() == []
+
+
+def test_nuclei_follow_drains_lines_written_before_stop():
+    stop = threading.Event()
+    reads = iter(["first\n", "", "late\n", ""])
+
+    class RacingFile:
+        def readline(self):
+            line = next(reads, "")
+            if line == "" and not stop.is_set():
+                stop.set()  # "late" lands between this empty read and the stop check
+            return line
+
+    lines = list(NucleiParser._follow_lines(RacingFile(), 0.01, stop, None))
+
+    assert lines == ["first\n", "late\n"]
+
+
+def test_nuclei_parse_string_matches_stream(tmp_path):
+    data = _nuclei_line("cve-2024-1") + _nuclei_line("cve-2024-2", host="https://b.example.com")
+    path = tmp_path / "nuclei.jsonl"
+    path.write_text(data)
+    parser = NucleiParser()
+
+    result = parser.parse(data)
+
+    assert result.target == "https://a.example.com, https://b.example.com"
+    assert [f.to_dict() for f in result.findings] == [
+        f.to_dict() for f in parser.iter_findings(path)
+    ]
+
+
+def test_registry_detects_and_parses_directory(tmp_path):
+    (tmp_path / "b_scan.xml").write_text(NMAP_XML)
+    nested = tmp_path / "nested"
+    nested.mkdir()
+    (nested / "a_nuclei.jsonl").write_text(_nuclei_line("cve-2024-1"))
+    (tmp_path / "notes.txt").write_text("just some notes\n")
+
+    registry = ParserRegistry()
+    assert registry.detect(tmp_path / "b_scan.xml") is NmapParser
+
+    serial = registry.parse_directory(tmp_path, max_workers=1)
+    parallel = registry.parse_directory(tmp_path, max_workers=2)
+
+    assert [r.tool for r in serial] == ["nmap", "nuclei"]
+    assert [r.metadata["source_file"] for r in parallel] == [
+        r.metadata["source_file"] for r in serial
+    ]
+    assert [len(r.findings) for r in parallel] == [len(r.findings) for r in serial]
+    assert registry.unmatched == [str(tmp_path / "notes.txt")]
+
+
+def test_registry_uses_parser_plugins(tmp_path):
+    class CsvPlugin(ParserPlugin):
+        PLUGIN_ID = "csv_parser"
+        SUPPORTED_FORMATS = ["csv"]
+
+        def initialize(self):
+            return True
+
+        def parse(self, data):
+            return {"target": data.split(",")[0], "findings": [{"title": "row"}]}
+
+    plugin_manager = MagicMock()
+    plugin_manager.get_parsers.return_value = [CsvPlugin()]
+    (tmp_path / "out.csv").write_text("example.com,80\n")
+
+    result = ParserRegistry(plugin_manager=plugin_manager).parse_file(tmp_path / "out.csv")
+
+    assert result.tool == "csv_parser"
+    assert result.target == "example.com"
+    assert result.findings[0].title == "row"
+
+
+def test_compact_tables_round_trip():
+    expected = NmapParser().parse(NMAP_XML)
+    odd_host = Host(address="10.9.9.9", ports=[{"number": 99999, "note": "x"}], services=[{"name": "custom"}])
+    hosts = list(expected.hosts) + [odd_host]
+
+    result = ScanResult(tool="nmap", target="x", findings=list(expected.findings), hosts=hosts)
+    result.compact()
+
+    assert isinstance(result.findings, FindingTable)
+    assert isinstance(result.hosts, HostTable)
+    assert [f.to_dict() for f in result.findings] == [f.to_dict() for f in expected.findings]
+    assert [h.to_dict() for h in result.hosts] == [h.to_dict() for h in hosts]
+    assert result.hosts[-1].address == "10.9.9.9"
+    assert result.findings[1:2][0].title == expected.findings[1].title
+
+
+def test_compact_summary_and_severity_filter():
+    findings = [
+        Finding(type=FindingType.PORT, severity=Severity.INFO, title="Port 22/tcp - OPEN", tags=["a"]),
+        Finding(type=FindingType.VULNERABILITY, severity=Severity.HIGH, title="CVE", metadata={"ports": [1, 2]}),
+        Finding(type=FindingType.PORT, severity=Severity.INFO, title="Port 22/tcp - OPEN", tags=["a"]),
+    ]
+    plain = ScanResult(tool="t", target="x", findings=list(findings))
+    compact = ScanResult(tool="t", target="x", findings=list(findings)).compact()
+
+    assert compact.summary() == plain.summary()
+    assert [f.title for f in compact.get_high_findings()] == ["CVE"]
+    assert compact.findings[0].tags is not compact.findings[2].tags
+    assert compact.findings[0].title is compact.findings[2].title
+
+    restored = pickle.loads(pickle.dumps(compact))
+    assert [f.to_dict() for f in restored.findings] == [f.to_dict() for f in findings]
+
+
+def test_binary_archive_round_trip(tmp_path):
+    result = NmapParser().parse(NMAP_XML)
+    result.metadata["extra"] = {"nested": [1, 2.5, None]}
+
+    for compression in ("none", "gzip"):
+        path = tmp_path / f"scan_{compression}.ctsr"
+        assert result.save(path, binary=True, compression=compression)
+
+        loaded = ScanResult.load(path)
+        assert loaded.to_dict() == result.to_dict()
+
+
+def test_binary_archive_refuses_non_json_metadata(tmp_path):
+    result = NmapParser().parse(NMAP_XML)
+    result.findings[0].metadata["seen"] = ["2024-01-01T00:00:00", ("a", 1)]
+    path = tmp_path / "scan.ctsr"
+    assert result.save(path, binary=True)
+    assert ScanResult.load(path).findings[0].metadata["seen"] == ["2024-01-01T00:00:00", ["a", 1]]
+
+    for bad in (datetime(2024, 5, 1), {1, 2}, b"\x00", {(1, 2): 3}):
+        result.metadata["bad"] = bad
+        with pytest.raises(ArchiveError, match="Cannot store"):
+            write_archive(result, tmp_path / "bad.ctsr")
+        assert not result.save(tmp_path / "bad-save.ctsr", binary=True)
+        assert not (tmp_path / "bad-save.ctsr").exists()
+
+
+def test_binary_archive_rejects_short_file(tmp_path):
+    path = tmp_path / "scan.ctsr"
+    write_archive(NmapParser().parse(NMAP_XML), path)
+    path.write_bytes(path.read_bytes()[:10])
+
+    with pytest.raises(ArchiveError, match="Truncated"):
+        ScanArchive(path)
+
+
+def test_binary_archive_blocks_are_json(tmp_path):
+    path = tmp_path / "scan.ctsr"
+    write_archive(NmapParser().parse(NMAP_XML), path)
+    data = path.read_bytes()
+
+    (length,) = struct.unpack_from("<I", data, 8)
+    meta = json.loads(data[12:12 + length])
+    assert meta[0]["tool"] == "nmap"
+
+
+def test_failed_save_leaves_no_file(tmp_path, monkeypatch):
+    import parsers.archive as archive
+
+    encode = archive._encode
+    calls = []
+
+    def failing_encode(value):
+        calls.append(value)
+        if len(calls) > 1:
+            raise ValueError("boom")
+        return encode(value)
+
+    monkeypatch.setattr(archive, "_encode", failing_encode)
+    path = tmp_path / "scan.ctsr"
+    assert not NmapParser().parse(NMAP_XML).save(path, binary=True)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_binary_archive_partial_reads(tmp_path):
+    hosts = [Host(address=f"10.0.{i // 256}.{i % 256}", ports=[{"number": i}]) for i in range(500)]
+    findings = [Finding(type=FindingType.PORT, severity=Severity.LOW, title=f"f{i}") for i in range(500)]
+    result = ScanResult(tool="nmap", target="10.0.0.0/16", findings=findings, hosts=hosts)
+    path = tmp_path / "scan.ctsr"
+    write_archive(result, path, compression="gzip", block_records=64)
+
+    with ScanArchive(path) as archive:
+        assert archive.read_metadata()["target"] == "10.0.0.0/16"
+        assert archive.finding_count == 500
+        assert archive.host_count == 500
+        assert [f.title for f in archive.iter_findings()][-1] == "f499"
+        assert archive.get_host("10.0.1.44").ports == [{"number": 300}]
+        assert archive.get_host("192.0.2.1") is None
+        assert isinstance(archive.load(compact=True).findings, FindingTable)
+
+
+def test_json_load_keeps_hosts(tmp_path):
+    result = NmapParser().parse(NMAP_XML)
+    path = tmp_path / "scan.json"
+    assert result.save(path)
+
+    loaded = ScanResult.load(path)
+
+    assert [h.to_dict() for h in loaded.hosts] == [h.to_dict() for h in result.hosts]
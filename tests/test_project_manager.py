@@ -2,8 +2,12 @@ import tempfile
 from pathlib import Path
 
 import pytest
+from sqlalchemy import event
 
+from core.database import FindingStatus, Severity
 from core.project import ProjectManager
+from parsers.base import Finding as ParserFinding, FindingType, ScanResult
+from parsers.base import Severity as ParserSeverity
 
 
 @pytest.fixture
@@ -28,3 +32,177 @@ def test_project_and_target_crud(temp_db):
 
     assert pm.delete_target(target.id)
     assert pm.delete_project(project.id)
+
+
+def test_ingest_scan_result_in_batches(temp_db):
+    pm = ProjectManager(db_path=temp_db)
+    project = pm.create_project(name="ingest-test")
+    scan = pm.create_scan(project.id, tool="nuclei", command="nuclei -u example.com")
+
+    severities = [ParserSeverity.HIGH, ParserSeverity.UNKNOWN, ParserSeverity.LOW]
+    result = ScanResult(tool="nuclei", target="example.com", findings=[
+        ParserFinding(
+            type=FindingType.VULNERABILITY,
+            severity=severities[i % 3],
+            title=f"finding-{i}",
+            tags=["cve"],
+            metadata={"template_id": f"t-{i}"}
+        )
+        for i in range(25)
+    ])
+    progress = []
+
+    inserted = pm.ingest_scan_result(
+        scan.id, result, batch_size=10,
+        progress_callback=lambda done, total: progress.append((done, total))
+    )
+
+    assert inserted == 25
+    assert progress == [(10, 25), (20, 25), (25, 25)]
+    findings = pm.get_findings(scan_id=scan.id)
+    assert len(findings) == 25
+    assert findings[0].extra_data == {"template_id": "t-0"}
+    assert findings[1].severity == Severity.INFO
+    assert pm.get_finding_stats(project.id)["by_severity"]["high"] == 9
+
+
+def test_stats_use_aggregates_and_invalidate(temp_db):
+    pm = ProjectManager(db_path=temp_db)
+    project = pm.create_project(name="stats-test")
+    pm.add_target(project.id, "example.com")
+    scan = pm.create_scan(project.id, tool="nmap", command="nmap example.com")
+    finding = pm.add_finding(scan.id, "port", "high", "Port 22/tcp - OPEN")
+    pm.add_finding(scan.id, "vulnerability", "critical", "CVE-2024-0001")
+
+    stats = pm.get_finding_stats(project.id)
+    assert stats["total"] == 2
+    assert stats["by_severity"]["critical"] == 1
+    assert stats["by_status"]["open"] == 2
+    assert stats["by_type"] == {"port": 1, "vulnerability": 1}
+
+    pm.update_finding_status(finding.id, FindingStatus.FIXED)
+    assert pm.get_finding_stats(project.id)["by_status"]["fixed"] == 1
+
+    assert pm.get_workspace_stats() == {
+        "total_projects": 1,
+        "total_targets": 1,
+        "total_scans": 1,
+        "total_findings": 2
+    }
+    pm.add_finding(scan.id, "path", "low", "/admin")
+    assert pm.get_workspace_stats()["total_findings"] == 3
+
+
+def test_stats_cache_is_per_project_and_copied(temp_db):
+    pm = ProjectManager(db_path=temp_db)
+    first = pm.create_project(name="first")
+    second = pm.create_project(name="second")
+    scan = pm.create_scan(first.id, tool="nmap", command="nmap example.com")
+    pm.add_finding(scan.id, "port", "high", "Port 22/tcp - OPEN")
+
+    second_stats = pm.get_finding_stats(second.id)
+    second_stats["by_type"]["port"] = 99
+    assert pm.get_finding_stats(second.id)["by_type"] == {}
+
+    pm.add_finding(scan.id, "port", "high", "Port 80/tcp - OPEN")
+    assert ("project", second.id) in pm.stats._cache
+    assert pm.get_finding_stats(first.id)["total"] == 2
+
+
+def test_serializing_lists_uses_constant_queries(temp_db):
+    pm = ProjectManager(db_path=temp_db)
+    project = pm.create_project(name="query-count")
+    for i in range(5):
+        scan = pm.create_scan(project.id, tool="nmap", command=f"nmap host{i}")
+        for j in range(i):
+            pm.add_finding(scan.id, "port", "info", f"Port {j}")
+    project_id = project.id
+    pm.db.session.expire_all()
+
+    statements = []
+    event.listen(pm.db.engine, "before_cursor_execute",
+                 lambda *args: statements.append(args[2]))
+
+    scans = [s.to_dict() for s in pm.get_scans(project_id)]
+    projects = [p.to_dict() for p in pm.list_projects()]
+
+    assert len(statements) == 2
+    assert sorted(s["finding_count"] for s in scans) == [0, 1, 2, 3, 4]
+    assert projects[0]["scan_count"] == 5
+    assert projects[0]["target_count"] == 0
+
+
+def test_page_findings_walks_keyset_pages(temp_db):
+    pm = ProjectManager(db_path=temp_db)
+    project = pm.create_project(name="paging")
+    other = pm.create_project(name="other")
+    scan = pm.create_scan(project.id, tool="nuclei", command="nuclei")
+    pm.ingest_scan_result(scan.id, ScanResult(tool="nuclei", target="example.com", findings=[
+        ParserFinding(
+            type=FindingType.VULNERABILITY,
+            severity=ParserSeverity.HIGH if i % 2 else ParserSeverity.LOW,
+            title=f"finding-{i}"
+        )
+        for i in range(23)
+    ]))
+    pm.add_finding(pm.create_scan(other.id, tool="nuclei", command="nuclei").id, "vulnerability", "high", "elsewhere")
+
+    # Batched rows share created_at, so the id tiebreaker must keep pages disjoint
+    seen, cursor = [], None
+    while True:
+        page = pm.page_findings(project_id=project.id, sort="created_at", limit=10, cursor=cursor)
+        seen.extend(f.title for f in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == [f"finding-{i}" for i in reversed(range(23))]
+
+    page = pm.page_findings(project_id=project.id, severity=Severity.HIGH, descending=False, limit=5)
+    assert [f.title for f in page.items] == ["finding-1", "finding-3", "finding-5", "finding-7", "finding-9"]
+    page = pm.page_findings(project_id=project.id, severity=Severity.HIGH, descending=False, cursor=page.next_cursor)
+    assert len(page.items) == 6 and page.next_cursor is None
+
+    assert [f.title for f in pm.page_findings(project_id=project.id, search="ING-2").items] == [
+        "finding-22", "finding-21", "finding-20", "finding-2"
+    ]
+
+    with pytest.raises(ValueError):
+        pm.page_findings(project_id=project.id, sort="severity")
+    with pytest.raises(ValueError):
+        pm.page_findings(project_id=project.id, cursor="not-a-cursor")
+
+
+def test_export_findings_streams_rows(temp_db, tmp_path):
+    import csv
+    import json
+    from core.reports import ReportGenerator
+
+    pm = ProjectManager(db_path=temp_db)
+    project = pm.create_project(name="export")
+    scan = pm.create_scan(project.id, tool="nuclei", command="nuclei")
+    pm.add_finding(scan.id, "vulnerability", "high", "=HYPERLINK(\"x\")", tags=["cve"])
+    pm.add_finding(scan.id, "port", "info", "Port 22/tcp")
+
+    rows = pm.iter_finding_rows(project_id=project.id, batch_size=1)
+    assert next(rows)["severity"] == "high"
+    assert next(rows)["title"] == "Port 22/tcp"
+    rows.close()
+
+    rg = ReportGenerator(pm)
+    path = rg.export_findings(project.id, format="ndjson", output_path=str(tmp_path / "f.ndjson"))
+    lines = [json.loads(line) for line in open(path)]
+    assert [l["title"] for l in lines] == ["=HYPERLINK(\"x\")", "Port 22/tcp"]
+    assert lines[0] == pm.get_findings(project_id=project.id)[0].to_dict()
+
+    path = rg.export_findings(project.id, format="csv", output_path=str(tmp_path / "f.csv"),
+                              severity=Severity.HIGH)
+    with open(path, newline="") as f:
+        records = list(csv.DictReader(f))
+    assert len(records) == 1
+    assert records[0]["title"].startswith("'=")
+    assert records[0]["tags"] == '["cve"]'
+
+    with pytest.raises(ValueError):
+        rg.stream_findings(project.id, format="xml")
+    with pytest.raises(ValueError):
+        rg.stream_findings(9999)
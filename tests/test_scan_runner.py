@@ -0,0 +1,148 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from core.database import Scan, ScanStatus
+from core.project import ProjectManager
+from core.scan_runner import ScanRunner, ToolPolicy
+
+
+# Lets the tests drive the fake tool's behaviour from the scan command
+TEST_POLICIES = {
+    "nuclei": ToolPolicy(options={"-u": True, "--fail": False, "--wait": True}, output_args=("-jsonl",))
+}
+
+
+@pytest.fixture
+def pm(tmp_path):
+    manager = ProjectManager(db_path=str(tmp_path / "workspace.db"))
+    yield manager
+    manager.close()
+
+
+def _wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def _statuses(pm, scan_ids):
+    pm.db.session.expire_all()
+    return [pm.get_scan(scan_id).status for scan_id in scan_ids]
+
+
+def test_runner_executes_parses_and_ingests(pm, tmp_path, fake_nuclei):
+    project = pm.create_project(name="runner")
+    updates = []
+    runner = ScanRunner(pm, max_workers=2, results_dir=tmp_path / "results", poll_interval=0.05,
+                        on_update=lambda *update: updates.append(update), policies=TEST_POLICIES)
+    # Queued before the runner started, so it must survive the restart
+    ok = pm.create_scan(project.id, tool="nuclei", command="nuclei -u https://example.com,https://example.org", queue=True)
+    ok_id = ok.id
+    # Only recorded, never queued for the runner
+    manual = pm.create_scan(project.id, tool="nuclei", command="nuclei -u https://old.example.com")
+    manual_id = manual.id
+
+    runner.start()
+    try:
+        failing = pm.create_scan(project.id, tool="nuclei", command="nuclei --fail", queue=True)
+        failing_id = failing.id
+        runner.notify()
+        assert _wait_for(lambda: ScanStatus.PENDING not in _statuses(pm, [ok_id, failing_id])
+                         and not runner.running)
+    finally:
+        runner.stop()
+
+    assert _statuses(pm, [ok_id, failing_id]) == [ScanStatus.COMPLETED, ScanStatus.FAILED]
+    findings = pm.get_findings(scan_id=ok_id)
+    assert [f.extra_data["template_id"] for f in findings] == ["tmpl-0", "tmpl-1"]
+    assert "boom" in pm.get_scan(failing_id).error_message
+    assert (ok_id, "completed", 100) in updates
+    assert (failing_id, "failed", 100) in updates
+    assert _statuses(pm, [manual_id]) == [ScanStatus.PENDING]
+
+
+def test_runner_respects_tool_limits_and_recovers(pm, tmp_path, fake_nuclei):
+    project = pm.create_project(name="limits")
+    release = tmp_path / "release"
+    scan_ids = [
+        pm.create_scan(project.id, tool="nuclei", command=f"nuclei --wait {release}", queue=True).id
+        for _ in range(3)
+    ]
+    # Left running by a crashed process whose lease has since expired
+    pm.claim_scan(scan_ids[0])
+    pm.db.session.execute(update(Scan).where(Scan.id == scan_ids[0])
+                          .values(heartbeat_at=datetime.utcnow() - timedelta(minutes=5)))
+    pm.db.commit()
+
+    runner = ScanRunner(pm, max_workers=3, tool_limits={"nuclei": 1}, results_dir=tmp_path / "results",
+                        poll_interval=0.05, policies=TEST_POLICIES)
+    runner.start()
+    try:
+        assert _wait_for(lambda: len(runner.running) == 1)
+        time.sleep(0.2)
+        assert list(runner.running) == [scan_ids[0]]
+        assert _statuses(pm, scan_ids).count(ScanStatus.PENDING) == 2
+
+        release.touch()
+        assert _wait_for(lambda: _statuses(pm, scan_ids) == [ScanStatus.COMPLETED] * 3)
+    finally:
+        runner.stop()
+
+
+def test_build_command_rejects_unsafe_commands(tmp_path, pm, fake_nuclei):
+    runner = ScanRunner(pm, results_dir=tmp_path / "results")
+
+    assert runner.build_command("nuclei", "nuclei -u 'https://a b' -s high")[1:] == [
+        "-u", "https://a b", "-s", "high", "-jsonl"
+    ]
+    with pytest.raises(ValueError, match="must start"):
+        runner.build_command("nuclei", "rm -rf / ; nuclei")
+    with pytest.raises(ValueError, match="not allowed"):
+        runner.build_command("bash", "bash -c id")
+    with pytest.raises(ValueError, match="must start"):
+        runner.build_command("nuclei", "/tmp/evil/notnuclei -u x")
+    for command in ("nuclei -t https://evil.example/t.yaml", "nuclei -l /etc/shadow", "nuclei -jsonl"):
+        with pytest.raises(ValueError, match="not allowed"):
+            runner.build_command("nuclei", command)
+    with pytest.raises(ValueError, match="needs a value"):
+        runner.build_command("nuclei", "nuclei -u")
+
+
+def test_nmap_policy_allows_scan_options_only(tmp_path, pm, install_tool):
+    install_tool("nmap", "")
+    runner = ScanRunner(pm, results_dir=tmp_path / "results")
+
+    assert runner.build_command("nmap", "nmap -sV -p22,80 -T4 --top-ports=100 10.0.0.1")[1:] == [
+        "-sV", "-p22,80", "-T4", "--top-ports=100", "10.0.0.1", "-oX", "-"
+    ]
+    for command in ("nmap --script=exploit.lua 10.0.0.1", "nmap -iL /etc/shadow",
+                    "nmap -oN /tmp/out 10.0.0.1", "nmap --datadir /tmp 10.0.0.1"):
+        with pytest.raises(ValueError, match="not allowed"):
+            runner.build_command("nmap", command)
+
+
+def test_requeue_leaves_scans_with_a_live_heartbeat(pm, tmp_path):
+    project = pm.create_project(name="lease")
+    owned = pm.create_scan(project.id, tool="nuclei", command="nuclei -u https://a.example.com", queue=True)
+    stale = pm.create_scan(project.id, tool="nuclei", command="nuclei -u https://b.example.com", queue=True)
+    manual = pm.create_scan(project.id, tool="nuclei", command="nuclei -u https://c.example.com")
+    scan_ids = [owned.id, stale.id, manual.id]
+    for scan_id in scan_ids:
+        assert pm.claim_scan(scan_id)
+    pm.db.session.execute(update(Scan).where(Scan.id.in_(scan_ids[1:]))
+                          .values(heartbeat_at=datetime.utcnow() - timedelta(minutes=5)))
+    pm.db.commit()
+
+    # Another runner still renews the first scan; the manual scan was never the runner's
+    pm.touch_scans([scan_ids[0]])
+    assert pm.requeue_interrupted_scans(stale_after=60) == 1
+    assert _statuses(pm, scan_ids) == [ScanStatus.RUNNING, ScanStatus.PENDING, ScanStatus.RUNNING]
+
+    with pytest.raises(ValueError, match="lease_seconds"):
+        ScanRunner(pm, results_dir=tmp_path / "results", poll_interval=5, lease_seconds=5)
@@ -1,4 +1,9 @@
-from automation.scheduler import ScheduleType, SmartScheduler
+import threading
+import time
+from datetime import datetime, timedelta
+
+from automation.admission import AdmissionController
+from automation.scheduler import ScanScheduler, ScheduleType, SmartScheduler
 
 
 def test_scheduler_jobs_and_stats(tmp_path):
@@ -22,3 +27,106 @@ def test_scheduler_jobs_and_stats(tmp_path):
 
     result = scheduler.run_now(job.id)
     assert isinstance(result, bool)
+
+
+def _once_at(scheduler, name, delay, target="example.com"):
+    return scheduler.add_job(
+        name=name,
+        project_id=1,
+        workflow_name="web_recon",
+        target=target,
+        schedule_type=ScheduleType.ONCE,
+        schedule_config={"datetime": (datetime.now() + timedelta(seconds=delay)).isoformat()}
+    )
+
+
+def test_scheduler_fires_due_jobs_without_blocking(tmp_path):
+    scheduler = ScanScheduler(storage_path=tmp_path / "scheduler.json", max_workers=2)
+    release = threading.Event()
+    fired = {}
+
+    def executor(job):
+        fired[job.name] = time.monotonic()
+        if job.name == "slow":
+            release.wait(5)
+        return True
+
+    scheduler.register_executor(executor)
+    scheduler.start()
+    try:
+        started = time.monotonic()
+        _once_at(scheduler, "slow", 0.1)
+        fast = _once_at(scheduler, "fast", 0.3)
+        removed = _once_at(scheduler, "removed", 0.2)
+        assert scheduler.remove_job(removed.id)
+
+        deadline = time.monotonic() + 3
+        while "fast" not in fired and time.monotonic() < deadline:
+            time.sleep(0.02)
+        # The slow job is still running; neither the fast job nor add_job waited for it
+        assert fired["fast"] - started < 1.0
+        assert scheduler.add_job(
+            name="later", project_id=1, workflow_name="web_recon", target="example.com",
+            schedule_type=ScheduleType.DAILY
+        )
+    finally:
+        release.set()
+        scheduler.stop()
+
+    assert "removed" not in fired
+    assert fast.run_count == 1 and fast.next_run is None
+
+
+def test_due_job_without_executor_is_not_dispatched_in_a_loop(tmp_path):
+    scheduler = ScanScheduler(storage_path=tmp_path / "scheduler.json")
+    job = _once_at(scheduler, "orphan", -1)
+    dispatches = []
+    execute = scheduler._execute_job
+    scheduler._execute_job = lambda j: dispatches.append(j.id) or execute(j)
+
+    scheduler.start()
+    try:
+        time.sleep(0.5)
+    finally:
+        scheduler.stop()
+
+    assert dispatches == [job.id]
+    assert job.next_run > datetime.now()
+
+
+def test_smart_scheduler_defers_jobs_over_target_limit(tmp_path):
+    admission = AdmissionController(max_global=4, per_target=1, spacing=0.2)
+    scheduler = SmartScheduler(storage_path=tmp_path / "scheduler.json", admission=admission)
+    lock = threading.Lock()
+    running = []
+    peak = {}
+    finished = []
+
+    def executor(job):
+        with lock:
+            running.append(job.target)
+            same_net = sum(1 for target in running if target.startswith("10.0.0."))
+            peak[job.name] = (same_net, len(running))
+        time.sleep(0.3)
+        with lock:
+            running.remove(job.target)
+            finished.append(job.name)
+        return True
+
+    scheduler.register_executor(executor)
+    scheduler.start()
+    try:
+        for name, target in [("a", "10.0.0.1"), ("b", "10.0.0.2"), ("c", "10.0.1.1")]:
+            _once_at(scheduler, name, 0.05, target)
+        deadline = time.monotonic() + 5
+        while len(finished) < 3 and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        scheduler.stop()
+
+    assert sorted(finished) == ["a", "b", "c"]
+    # a and b share 10.0.0.0/24 and never overlapped; c ran alongside one of them
+    assert max(same_net for same_net, _ in peak.values()) == 1
+    assert max(total for _, total in peak.values()) == 2
+    deferred = {job.name: job.metadata.get("deferred", 0) for job in scheduler.jobs.values()}
+    assert deferred["a"] + deferred["b"] >= 1 and deferred["c"] == 0
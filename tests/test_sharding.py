@@ -0,0 +1,79 @@
+import asyncio
+import itertools
+
+from core.sharding import execute_sharded, iter_shards, run_sharded, shard_lines, shard_network
+from core.workflow import Workflow, WorkflowEngine, WorkflowStep
+
+
+def test_shard_network_is_lazy_and_balanced():
+    shards = shard_network("10.0.0.0/12", 65536)
+    assert next(shards) == "10.0.0.0/16"
+    assert len(list(shards)) == 15
+
+    # A /8 in single addresses is generated on demand, not materialised
+    assert list(itertools.islice(shard_network("10.0.0.0/8", 1), 2)) == ["10.0.0.0/32", "10.0.0.1/32"]
+    # Shard sizes round up to a power of two; small networks stay whole
+    assert list(shard_network("192.168.0.0/24", 100)) == ["192.168.0.0/25", "192.168.0.128/25"]
+    assert list(shard_network("192.168.0.0/30", 256)) == ["192.168.0.0/30"]
+
+
+def test_target_file_is_split_into_chunks(tmp_path):
+    targets = tmp_path / "targets.txt"
+    targets.write_text("# scope\n" + "\n".join(f"host{i}.example.com" for i in range(10)) + "\n\n")
+
+    shards = list(iter_shards(targets, 4, tmp_path / "shards"))
+
+    assert [len(open(path).read().split()) for path in shards] == [4, 4, 2]
+    assert open(shards[2]).read() == "host8.example.com\nhost9.example.com\n"
+    assert list(iter_shards("example.com", 4)) == ["example.com"]
+
+    # Chunks are written only as they are consumed
+    lazy = shard_lines(iter(["a", "b", "c"]), 1, tmp_path / "lazy")
+    next(lazy)
+    assert sorted(p.name for p in (tmp_path / "lazy").iterdir()) == ["shard_000000.txt"]
+
+
+def test_execute_sharded_merges_results_with_bounded_concurrency(tmp_path, fake_nuclei):
+    wf = Workflow(name="sweep", steps=[
+        WorkflowStep(name="scan", tool="nuclei", flags="-u ${TARGET} --sleep 0.3",
+                     output_file="${RESULTS}/scan.jsonl")
+    ])
+    engine = WorkflowEngine(results_dir=tmp_path / "results")
+
+    merged = asyncio.run(execute_sharded(engine, wf, "10.0.0.0/28", shard_size=4, concurrency=2))
+
+    assert merged.status == "completed"
+    assert [s['target'] for s in merged.metadata['shards']] == [
+        "10.0.0.0/30", "10.0.0.4/30", "10.0.0.8/30", "10.0.0.12/30"
+    ]
+    assert len(merged.findings) == 4
+    assert [s['findings'] for s in merged.metadata['shards']] == [1, 1, 1, 1]
+
+    events = sorted(
+        (float(stamp), 1 if kind == "start" else -1)
+        for kind, stamp in (line.split() for line in fake_nuclei.read_text().splitlines())
+    )
+    running = peak = 0
+    for _, delta in events:
+        running += delta
+        peak = max(peak, running)
+    assert peak == 2
+
+
+def test_run_sharded_passes_target_files_as_targets_file(tmp_path, fake_nuclei):
+    targets = tmp_path / "targets.txt"
+    targets.write_text("\n".join(f"host{i}.example.com" for i in range(5)) + "\n")
+    wf = Workflow(name="sweep", steps=[
+        WorkflowStep(name="scan", tool="nuclei", flags="-l ${TARGETS_FILE}", output_file="${RESULTS}/scan.jsonl")
+    ])
+    engine = WorkflowEngine(results_dir=tmp_path / "results")
+
+    merged = run_sharded(engine, wf, targets, shard_size=2)
+
+    assert merged.status == "completed"
+    assert [s['findings'] for s in merged.metadata['shards']] == [2, 2, 1]
+    assert sorted(f.metadata["host"] for f in merged.findings) == [f"host{i}.example.com" for i in range(5)]
+
+    # Subnets and single targets get a one-line targets file
+    merged = run_sharded(engine, wf, "10.0.0.0/30", shard_size=2)
+    assert [f.metadata["host"] for f in merged.findings] == ["10.0.0.0/31", "10.0.0.2/31"]
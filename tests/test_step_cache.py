@@ -0,0 +1,90 @@
+import time
+
+from core.step_cache import StepCache
+from core.workflow import Workflow, WorkflowEngine, WorkflowStep
+
+
+COUNTING_TOOL = """#!{python}
+import sys
+args = sys.argv[1:]
+with open({calls!r}, "a") as f:
+    f.write("call\\n")
+out = args[args.index("-o") + 1]
+data = open(args[args.index("-iL") + 1]).read() if "-iL" in args else ""
+with open(out, "w") as f:
+    f.write("result for " + " ".join(args[:args.index("-o")]) + " " + data)
+"""
+
+
+def _install(tmp_path, install_tool):
+    calls = tmp_path / "calls.log"
+    install_tool("countool", COUNTING_TOOL, calls=str(calls))
+    return calls
+
+
+def _workflow(input_file):
+    return Workflow(name="cached", steps=[
+        WorkflowStep(name="scan", tool="countool", flags="-x ${TARGET}",
+                     input_source=str(input_file), output_file="${RESULTS}/scan.txt")
+    ])
+
+
+def test_identical_step_reuses_cached_output(tmp_path, install_tool):
+    calls = _install(tmp_path, install_tool)
+    hosts = tmp_path / "hosts.txt"
+    hosts.write_text("a.example.com\n")
+    results_dir = tmp_path / "results"
+    engine = WorkflowEngine(results_dir=results_dir, cache=StepCache(results_dir / ".step_cache"))
+
+    first = engine.execute(_workflow(hosts), "example.com")
+    second = engine.execute(_workflow(hosts), "example.com")
+
+    assert calls.read_text().count("call") == 1
+    assert second['status'] == 'completed'
+    assert second['steps'][0]['metrics']['cache_hit'] is True
+    assert (results_dir / "scan.txt").read_text() == "result for -x example.com a.example.com\n"
+    assert first['steps'][0]['output'] == second['steps'][0]['output']
+
+    # Different input contents or flags miss, and re-running must not clobber the cached copy
+    hosts.write_text("b.example.com\n")
+    engine.execute(_workflow(hosts), "example.com")
+    engine.execute(_workflow(hosts), "other.com")
+    assert calls.read_text().count("call") == 3
+
+    hosts.write_text("a.example.com\n")
+    engine.execute(_workflow(hosts), "example.com")
+    assert calls.read_text().count("call") == 3
+    assert (results_dir / "scan.txt").read_text() == "result for -x example.com a.example.com\n"
+
+
+def test_expired_results_are_rerun(tmp_path, install_tool):
+    calls = _install(tmp_path, install_tool)
+    hosts = tmp_path / "hosts.txt"
+    hosts.write_text("a.example.com\n")
+    results_dir = tmp_path / "results"
+    cache = StepCache(results_dir / ".step_cache", ttls={"countool": 0})
+    engine = WorkflowEngine(results_dir=results_dir, cache=cache)
+
+    engine.execute(_workflow(hosts), "example.com")
+    time.sleep(0.01)
+    engine.execute(_workflow(hosts), "example.com")
+
+    assert calls.read_text().count("call") == 2
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = StepCache(tmp_path / "cache", max_bytes=10)
+    for name in ("one", "two", "three"):
+        output = tmp_path / f"{name}.txt"
+        output.write_text("x" * 5)
+        cache.store(name, "tool", output)
+        if name == "two":
+            # Touch "one" so "two" becomes the oldest
+            assert cache.fetch("one", tmp_path / "restored.txt")
+
+    assert sorted(cache._index) == ["one", "three"]
+    assert cache.size == 10
+    assert not (cache.objects_dir / "two").exists()
+
+    # The index survives a restart
+    assert sorted(StepCache(tmp_path / "cache", max_bytes=10)._index) == ["one", "three"]
@@ -1,11 +1,14 @@
+import asyncio
+import sys
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, patch
 from pathlib import Path
 import tempfile
 import yaml
 import json
 
-from core.workflow import Workflow, WorkflowEngine, StepStatus, WorkflowStep
+from core.process import LinePipe, ProcessResult, run_process
+from core.workflow import Workflow, WorkflowEngine, StepStatus, WorkflowStep, get_workflow
 
 @pytest.fixture
 def sample_workflow_data():
@@ -41,14 +44,14 @@ def test_workflow_load_from_yaml(sample_workflow_data):
     finally:
         Path(f_path).unlink()
 
-@patch("core.workflow.subprocess.run")
+@patch("core.workflow.run_process", new_callable=AsyncMock)
 def test_workflow_execute_step_success(mock_run, sample_workflow_data):
     engine = WorkflowEngine(results_dir=Path("/tmp/results"))
     wf = Workflow.from_dict(sample_workflow_data)
     step = wf.steps[0]
     variables = {"TARGET": "localhost", "RESULTS": "/tmp/results"}
     
-    mock_run.return_value = MagicMock(returncode=0)
+    mock_run.return_value = ProcessResult(returncode=0)
     
     success = engine.execute_step(step, variables)
     
@@ -61,7 +64,7 @@ def test_workflow_execute_step_success(mock_run, sample_workflow_data):
     assert "hello" in cmd_list
     assert "localhost" in cmd_list
 
-@patch("core.workflow.subprocess.run")
+@patch("core.workflow.run_process", new_callable=AsyncMock)
 def test_workflow_execute_step_failure(mock_run, sample_workflow_data):
     engine = WorkflowEngine(results_dir=Path("/tmp/results"))
     wf = Workflow.from_dict(sample_workflow_data)
@@ -75,3 +78,297 @@ def test_workflow_execute_step_failure(mock_run, sample_workflow_data):
     assert success is False
     assert step.status == StepStatus.FAILED
     assert "Command failed" in step.error
+
+
+FAKE_TOOL = """#!{python}
+import sys
+for i in range(3):
+    print("line-%d" % i, flush=True)
+print(sys.argv[sys.argv.index("-o") + 1], flush=True)
+"""
+
+
+def test_workflow_streams_output_and_records_metrics(tmp_path, install_tool):
+    install_tool("faketool", FAKE_TOOL)
+
+    engine = WorkflowEngine(results_dir=tmp_path / "results")
+    lines = []
+    engine.register_callback('step_output', lines.append)
+    wf = Workflow(name="stream", steps=[
+        WorkflowStep(name="one", tool="faketool", output_file="${RESULTS}/out.txt")
+    ])
+
+    results = engine.execute(wf, "example.com")
+
+    assert results['status'] == 'completed'
+    assert [entry['line'] for entry in lines] == [
+        "line-0", "line-1", "line-2", str(tmp_path / "results" / "out.txt")
+    ]
+    assert all(entry['step'] == "one" for entry in lines)
+    metrics = results['steps'][0]['metrics']
+    assert metrics['returncode'] == 0
+    assert metrics['output_lines'] == 4
+    if sys.platform.startswith("linux"):
+        assert metrics['peak_rss_kb'] > 0
+        assert metrics['cpu_user_seconds'] is not None
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="process groups are POSIX only")
+def test_run_process_timeout_kills_process_group(tmp_path):
+    pid_file = tmp_path / "child.pid"
+    script = f"sleep 30 & echo $! > {pid_file}; echo started; wait"
+    seen = []
+
+    result = asyncio.run(run_process(["sh", "-c", script], timeout=0.5, on_line=seen.append))
+
+    assert result.timed_out
+    assert seen == ["started"]
+    assert result.duration_seconds < 10
+    child = int(pid_file.read_text())
+    # The grandchild is gone (or a zombie awaiting reaping by init)
+    status = Path(f"/proc/{child}/status")
+    if status.exists():
+        assert "\tZ" in status.read_text().split("State:", 1)[1].splitlines()[0]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="process groups are POSIX only")
+def test_run_process_timeout_covers_process_that_closed_its_output():
+    script = "echo started; exec >&- 2>&-; sleep 30"
+
+    result = asyncio.run(run_process(["sh", "-c", script], timeout=0.5, kill_grace=1))
+
+    assert result.timed_out
+    assert result.duration_seconds < 10
+
+
+# Coordinates through marker files so a test only passes if steps overlap
+SYNC_TOOL = """#!{python}
+import os, sys, time
+args = sys.argv[1:]
+if "--fail" in args:
+    sys.exit(1)
+if "--touch" in args:
+    open(args[args.index("--touch") + 1], "w").close()
+if "--wait" in args:
+    marker = args[args.index("--wait") + 1]
+    deadline = time.time() + 5
+    while not os.path.exists(marker):
+        if time.time() > deadline:
+            sys.exit(1)
+        time.sleep(0.01)
+"""
+
+
+def test_dependency_graph():
+    wf = Workflow.from_dict({
+        "name": "graph",
+        "steps": [
+            {"name": "a", "tool": "x"},
+            {"name": "b", "tool": "x"},
+            {"name": "c", "tool": "x", "parallel": True},
+            {"name": "d", "tool": "x", "parallel": True, "input_source": "$a", "depends_on": "c"},
+            {"name": "e", "tool": "x", "parallel": True, "input_source": "${RESULTS}/hosts.txt"}
+        ]
+    })
+    assert wf.dependency_graph() == {"a": [], "b": ["a"], "c": [], "d": ["c", "a"], "e": []}
+
+    wf.steps[0].depends_on = ["d"]
+    with pytest.raises(ValueError, match="cycle"):
+        wf.dependency_graph()
+
+    wf.steps[0].depends_on = ["missing"]
+    with pytest.raises(ValueError, match="unknown step"):
+        wf.dependency_graph()
+
+    full_scan = get_workflow("full_scan").dependency_graph()
+    assert [name for name, deps in full_scan.items() if not deps] == ["subdomains", "portscan"]
+
+
+def test_independent_branches_run_concurrently(tmp_path, install_tool):
+    install_tool("synctool", SYNC_TOOL)
+    marker = tmp_path / "portscan-started"
+    wf = Workflow(name="branches", steps=[
+        WorkflowStep(name="recon", tool="synctool", flags=f"--wait {marker}"),
+        WorkflowStep(name="probe", tool="synctool", input_source="$recon"),
+        WorkflowStep(name="portscan", tool="synctool", flags=f"--touch {marker}", parallel=True)
+    ])
+
+    results = WorkflowEngine(results_dir=tmp_path / "results", max_parallel=2).execute(wf, "example.com")
+
+    assert results['status'] == 'completed'
+    assert [s['status'] for s in results['steps']] == ["completed"] * 3
+
+
+def test_failure_only_stops_its_own_branch(tmp_path, install_tool):
+    install_tool("synctool", SYNC_TOOL)
+    wf = Workflow(name="branches", steps=[
+        WorkflowStep(name="recon", tool="synctool", flags="--fail"),
+        WorkflowStep(name="probe", tool="synctool", input_source="$recon"),
+        WorkflowStep(name="portscan", tool="synctool", parallel=True),
+        WorkflowStep(name="tolerant", tool="synctool", flags="--fail", parallel=True, on_failure="continue"),
+        WorkflowStep(name="after", tool="synctool", depends_on=["tolerant"], parallel=True)
+    ])
+    results = WorkflowEngine(results_dir=tmp_path / "results").execute(wf, "example.com")
+
+    statuses = {s['name']: s['status'] for s in results['steps']}
+    assert statuses == {
+        "recon": "failed", "probe": "skipped", "portscan": "completed",
+        "tolerant": "failed", "after": "completed"
+    }
+    assert results['status'] == 'failed'
+    assert "recon" in results['steps'][1]['error']
+
+
+PRODUCER_TOOL = """#!{python}
+import os, sys, time
+marker = sys.argv[sys.argv.index("--marker") + 1]
+print("a.example.com", flush=True)
+if "--fail" in sys.argv:
+    sys.exit(1)
+deadline = time.time() + 5
+while not os.path.exists(marker):
+    if time.time() > deadline:
+        sys.exit(1)
+    time.sleep(0.01)
+print("b.example.com", flush=True)
+"""
+
+CONSUMER_TOOL = """#!{python}
+import sys
+marker = sys.argv[sys.argv.index("--marker") + 1]
+for line in sys.stdin:
+    open(marker, "w").close()
+    print("probed " + line.strip(), flush=True)
+"""
+
+
+def test_streaming_step_overlaps_its_input_step(tmp_path, install_tool):
+    install_tool("producer", PRODUCER_TOOL)
+    install_tool("httpx", CONSUMER_TOOL)
+    marker = tmp_path / "consumer-read"
+    engine = WorkflowEngine(results_dir=tmp_path / "results", max_parallel=1)
+    lines = []
+    engine.register_callback('step_output', lambda data: lines.append((data['step'], data['line'])))
+    wf = Workflow(name="pipeline", steps=[
+        WorkflowStep(name="enum", tool="producer", flags=f"--marker {marker}"),
+        WorkflowStep(name="probe", tool="httpx", flags=f"--marker {marker}",
+                     input_source="$enum", stream=True)
+    ])
+
+    # The producer only finishes once the consumer has seen its first line
+    results = engine.execute(wf, "example.com")
+
+    assert results['status'] == 'completed'
+    assert [line for step, line in lines if step == "probe"] == [
+        "probed a.example.com", "probed b.example.com"
+    ]
+
+
+def test_streaming_step_stops_when_its_input_step_fails(tmp_path, install_tool):
+    install_tool("producer", PRODUCER_TOOL)
+    install_tool("httpx", CONSUMER_TOOL)
+    marker = tmp_path / "consumer-read"
+    wf = Workflow(name="pipeline", steps=[
+        WorkflowStep(name="enum", tool="producer", flags=f"--marker {marker} --fail"),
+        WorkflowStep(name="probe", tool="httpx", flags=f"--marker {marker}",
+                     input_source="$enum", stream=True),
+        WorkflowStep(name="report", tool="httpx", flags=f"--marker {marker}", input_source="$probe")
+    ])
+
+    results = WorkflowEngine(results_dir=tmp_path / "results").execute(wf, "example.com")
+
+    assert [(s['status'], s['error']) for s in results['steps'][1:]] == [
+        ("skipped", "Upstream step failed: enum"),
+        ("skipped", "Upstream step failed: probe")
+    ]
+
+
+def test_line_pipe_applies_backpressure():
+    async def scenario():
+        pipe = LinePipe(maxsize=2)
+        await pipe.write("a")
+        await pipe.write("b")
+        blocked = asyncio.create_task(pipe.write("c"))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+
+        pipe.close_reader()
+        await asyncio.wait_for(blocked, 1)
+        await pipe.write("dropped")
+
+        pipe = LinePipe(maxsize=2)
+        await pipe.write("a")
+        await pipe.write("b")
+        pipe.finish()
+        return [line async for line in pipe]
+
+    assert asyncio.run(scenario()) == ["a", "b"]
+
+
+RECORDING_TOOL = """#!{python}
+import os, sys
+args = sys.argv[1:]
+with open(os.path.join(os.path.dirname(sys.argv[0]), "calls.log"), "a") as f:
+    f.write(os.path.basename(sys.argv[0]) + " " + " ".join(args) + "\\n")
+if "--needs" in args and not os.path.exists(args[args.index("--needs") + 1]):
+    sys.exit(1)
+if "-o" in args:
+    with open(args[args.index("-o") + 1], "w") as f:
+        f.write("output of " + args[0] + "\\n")
+"""
+
+
+def _calls(tmp_path):
+    log = tmp_path / "bin" / "calls.log"
+    return log.read_text().splitlines() if log.exists() else []
+
+
+def test_resume_skips_steps_with_valid_outputs(tmp_path, install_tool):
+    install_tool("rectool", RECORDING_TOOL)
+    ready = tmp_path / "ready"
+    wf = Workflow(name="resumable", steps=[
+        WorkflowStep(name="one", tool="rectool", flags="one", output_file="${RESULTS}/one.txt"),
+        WorkflowStep(name="two", tool="rectool", flags=f"two --needs {ready}", output_file="${RESULTS}/two.txt"),
+        WorkflowStep(name="three", tool="rectool", flags="three", output_file="${RESULTS}/three.txt")
+    ])
+    engine = WorkflowEngine(results_dir=tmp_path / "results")
+
+    first = engine.execute(wf, "example.com")
+    assert [s['status'] for s in first['steps']] == ["completed", "failed", "skipped"]
+
+    ready.touch()
+    second = WorkflowEngine(results_dir=tmp_path / "results").resume(first['run_id'])
+
+    assert second['status'] == 'completed'
+    assert second['run_id'] == first['run_id']
+    assert second['steps'][0]['metrics']['checkpoint'] is True
+    assert [call.split()[1] for call in _calls(tmp_path)] == ["one", "two", "two", "three"]
+
+    # A changed output invalidates that step and everything after it
+    (tmp_path / "results" / "two.txt").write_text("tampered\n")
+    engine.resume(first['run_id'])
+    assert [call.split()[1] for call in _calls(tmp_path)][4:] == ["two", "three"]
+
+
+def test_resume_uses_native_nmap_resume(tmp_path, install_tool):
+    from core.run_journal import RunJournal
+
+    install_tool("nmap", RECORDING_TOOL)
+    log = tmp_path / "scan.gnmap"
+    wf = Workflow(name="ports", steps=[
+        WorkflowStep(name="portscan", tool="nmap", flags=f"-F -oG {log} ${{TARGET}}",
+                     output_file="${RESULTS}/nmap.txt")
+    ])
+    engine = WorkflowEngine(results_dir=tmp_path / "results")
+    # A run that died while nmap was writing its log
+    journal = RunJournal.create(engine.runs_dir, wf.to_dict(), "10.0.0.0/24")
+    journal.step_started("portscan")
+    log.write_text("# Nmap partial log\n")
+
+    results = engine.resume(journal.run_id)
+
+    assert results['status'] == 'completed'
+    assert _calls(tmp_path) == [f"nmap --resume {log}"]
+
+    with pytest.raises(FileNotFoundError):
+        engine.resume("../../etc/passwd")